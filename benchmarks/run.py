@@ -0,0 +1,134 @@
+"""Run the benchmark suite, write JSON results and check them against a baseline."""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.suite import (
+    DEFAULT_LOAD_ITERATIONS,
+    DEFAULT_MAX_SLOWDOWN,
+    DEFAULT_REPEAT,
+    DEFAULT_SIZES,
+    compare,
+    run_suite,
+)
+
+DEFAULT_OUT = Path("data/processed/benchmarks/latest.json")
+DEFAULT_BASELINE = Path("benchmarks/baseline.json")
+
+
+def _override(value: str) -> tuple:
+    name, _, fraction = value.partition("=")
+    try:
+        return name, float(fraction)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"Expected NAME=FRACTION, got {value!r}") from exc
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser."""
+    parser = argparse.ArgumentParser(description="Run offline judgment throughput benchmarks.")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="Synthetic record counts for the judgment path (e.g. 1000 100000 1000000)",
+    )
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Runs per case; the fastest is kept")
+    parser.add_argument(
+        "--load-iterations",
+        type=int,
+        default=DEFAULT_LOAD_ITERATIONS,
+        help="Loads per run for the mandate/scenario/thresholds cases",
+    )
+    parser.add_argument("--skip-publish", action="store_true", help="Skip the publish_pages_data cases")
+    parser.add_argument(
+        "--work-dir",
+        default=None,
+        help="Directory for temporary records (defaults to the system temp dir)",
+    )
+    parser.add_argument("--out", default=str(DEFAULT_OUT), help="Where to write the JSON results")
+    parser.add_argument(
+        "--baseline",
+        default=None,
+        help=f"Baseline JSON to compare against (e.g. {DEFAULT_BASELINE})",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        default=None,
+        help="Also write these results as a new baseline at the given path",
+    )
+    parser.add_argument(
+        "--max-slowdown",
+        type=float,
+        default=DEFAULT_MAX_SLOWDOWN,
+        help="Allowed slowdown per case as a fraction of the baseline (0.25 = 25%%)",
+    )
+    parser.add_argument(
+        "--max-slowdown-for",
+        type=_override,
+        action="append",
+        default=[],
+        metavar="NAME=FRACTION",
+        help="Per-case allowance; NAME is a case (judge/1000) or a case family (judge)",
+    )
+    return parser
+
+
+def _write_json(path: Path, payload: Dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2, sort_keys=True)
+        handle.write("\n")
+
+
+def main(argv: List[str] | None = None) -> int:
+    """Run the suite; exit 1 when any case regressed past its allowance."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.baseline:
+        baseline_path = Path(args.baseline)
+        if not baseline_path.exists():
+            print(f"No baseline at {baseline_path}; create one with --save-baseline {baseline_path}")
+            return 1
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+
+    results = run_suite(
+        sizes=args.sizes,
+        repeat=args.repeat,
+        load_iterations=args.load_iterations,
+        work_dir=Path(args.work_dir) if args.work_dir else None,
+        publish=not args.skip_publish,
+    )
+    _write_json(Path(args.out), results)
+    if args.save_baseline:
+        _write_json(Path(args.save_baseline), results)
+
+    print(f"{'case':<36}{'ops':>10}{'ns/op':>14}{'ops/s':>14}")
+    for name, row in results["results"].items():
+        ops_per_second = row["operations"] / row["seconds"] if row["seconds"] else float("inf")
+        print(f"{name:<36}{row['operations']:>10}{row['ns_per_op']:>14.0f}{ops_per_second:>14.0f}")
+    print(f"Results written to {args.out}")
+
+    if baseline is None:
+        return 0
+    regressions = compare(results, baseline, args.max_slowdown, dict(args.max_slowdown_for))
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression.name}: {regression.baseline_ns:.0f} -> {regression.current_ns:.0f} ns/op "
+            f"(+{regression.slowdown:.0%}, allowed +{regression.allowed:.0%})"
+        )
+    if regressions:
+        return 1
+    print(f"No case slowed down beyond the allowed threshold versus {args.baseline}.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,264 @@
+"""Benchmark cases and baseline comparison.
+
+Two groups of cases run without a network:
+
+- load paths (mandate, scenario and thresholds YAML), timed both with the
+  process-wide parse cache cleared before every load (``cold``) and with it
+  warm;
+- the judgment path at each requested record count: ``judge``,
+  ``JudgmentRecord.to_dict``, ``JudgmentRecord.validate_fields``,
+  ``judgment_fingerprint``, ``write_judgment_record`` and, over the records
+  just written, ``publish_pages_data``.
+
+Records are judged from seeded synthetic scenarios, so every run at the same
+size does the same work. Per-record phases are timed in chunks to keep memory
+flat at 10^6 records. Each case keeps the fastest of ``repeat`` runs and is
+reported as nanoseconds per operation; ``compare`` flags cases slower than a
+baseline by more than a configurable fraction.
+"""
+
+from __future__ import annotations
+
+import platform
+import random
+import shutil
+import tempfile
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence
+
+import yaml
+
+from buffet.contracts.fingerprint import judgment_fingerprint
+from buffet.contracts.judgment_record import JudgmentRecord
+from buffet.execution.memory import write_judgment_record
+from buffet.mandates.loader import Mandate, load_mandate
+from buffet.procedures.rate_regime_adjustment import RateRegimeAdjustmentProcedure, load_thresholds
+from buffet.sensing.scenario import ScenarioInput, load_scenario, parse_scenario
+from buffet.utils.yaml_cache import default_yaml_cache
+
+RESULTS_VERSION = 1
+DEFAULT_SIZES = (1_000,)
+DEFAULT_LOAD_ITERATIONS = 200
+DEFAULT_REPEAT = 3
+DEFAULT_MAX_SLOWDOWN = 0.25
+CHUNK_SIZE = 10_000
+SEED = 20_240_101
+
+MANDATE_PATHS = (
+    Path("mandates/liability_driven/db_pension_v1/mandate.yaml"),
+    Path("mandates/perpetual_capital/endowment_v1/mandate.yaml"),
+)
+SCENARIO_PATH = Path("judgment_loops/rate_regime_adjustment/scenarios/rising_rates_2022.yaml")
+THRESHOLDS_PATH = Path("judgment_loops/rate_regime_adjustment/thresholds.yaml")
+RATE_REGIMES = ("stable", "rising_rates", "falling_rates")
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    """Fastest observed run of one benchmark case."""
+
+    operations: int
+    seconds: float
+    ns_per_op: float
+
+
+@dataclass(frozen=True)
+class Regression:
+    """A case that got slower than the baseline allows."""
+
+    name: str
+    baseline_ns: float
+    current_ns: float
+    allowed: float
+
+    @property
+    def slowdown(self) -> float:
+        """Return the relative slowdown (0.30 means 30% slower)."""
+        return self.current_ns / self.baseline_ns - 1.0
+
+
+def _result(operations: int, elapsed_ns: int) -> BenchmarkResult:
+    operations = max(operations, 1)
+    return BenchmarkResult(operations, elapsed_ns / 1e9, elapsed_ns / operations)
+
+
+def _fastest(runs: Sequence[BenchmarkResult]) -> BenchmarkResult:
+    return min(runs, key=lambda run: run.ns_per_op)
+
+
+def synthetic_scenarios(count: int, seed: int = SEED) -> Iterator[ScenarioInput]:
+    """Yield ``count`` seeded synthetic scenarios spanning every outcome type."""
+    rng = random.Random(seed)
+    for index in range(count):
+        yield parse_scenario(
+            {
+                "scenario_id": f"bench_{index}",
+                "as_of": "2024-01-01T00:00:00Z",
+                "environment": {
+                    "rate_regime": RATE_REGIMES[index % len(RATE_REGIMES)],
+                    "inflation_regime": "elevated",
+                    "uncertainty": round(rng.uniform(0.0, 0.7), 4),
+                },
+                "portfolio": {
+                    "gross_exposure": round(rng.uniform(0.8, 1.6), 4),
+                    "liquidity_buffer_months": rng.randint(3, 24),
+                    "funding_ratio": round(rng.uniform(0.7, 1.2), 4),
+                },
+            },
+            default_id=f"bench_{index}",
+        )
+
+
+def _time_loads(load: Callable[[Path], Any], path: Path, iterations: int, cold: bool) -> BenchmarkResult:
+    cache = default_yaml_cache()
+    elapsed = 0
+    for _ in range(iterations):
+        if cold:
+            cache.clear()
+        start = perf_counter_ns()
+        load(path)
+        elapsed += perf_counter_ns() - start
+    return _result(iterations, elapsed)
+
+
+def benchmark_loads(
+    iterations: int = DEFAULT_LOAD_ITERATIONS,
+    repeat: int = DEFAULT_REPEAT,
+) -> Dict[str, BenchmarkResult]:
+    """Time mandate, scenario and thresholds loading with a cold and a warm parse cache."""
+    cases: Dict[str, tuple] = {
+        "load_mandate": (load_mandate, MANDATE_PATHS[0]),
+        "load_scenario": (load_scenario, SCENARIO_PATH),
+        "load_thresholds": (load_thresholds, THRESHOLDS_PATH),
+    }
+    results: Dict[str, BenchmarkResult] = {}
+    for name, (load, path) in cases.items():
+        for cold in (True, False):
+            load(path)
+            runs = [_time_loads(load, path, iterations, cold) for _ in range(repeat)]
+            results[f"{name}/{'cold' if cold else 'warm'}"] = _fastest(runs)
+    default_yaml_cache().clear()
+    return results
+
+
+def _judgment_pass(mandates: Sequence[Mandate], count: int, records_dir: Path) -> Dict[str, BenchmarkResult]:
+    """Judge, serialize, validate, fingerprint and write ``count`` records chunk by chunk."""
+    procedure = RateRegimeAdjustmentProcedure()
+    thresholds = load_thresholds(THRESHOLDS_PATH)
+    elapsed = {"judge": 0, "to_dict": 0, "validate": 0, "fingerprint": 0, "write_judgment_record": 0}
+    scenarios = synthetic_scenarios(count)
+    done = 0
+    while done < count:
+        chunk = [next(scenarios) for _ in range(min(CHUNK_SIZE, count - done))]
+        pairs = [(mandates[(done + offset) % len(mandates)], scenario) for offset, scenario in enumerate(chunk)]
+
+        start = perf_counter_ns()
+        records: List[JudgmentRecord] = [
+            procedure.judge(mandate, scenario, thresholds, decision_latency_ms=0) for mandate, scenario in pairs
+        ]
+        elapsed["judge"] += perf_counter_ns() - start
+
+        start = perf_counter_ns()
+        payloads = [record.to_dict() for record in records]
+        elapsed["to_dict"] += perf_counter_ns() - start
+
+        start = perf_counter_ns()
+        for payload in payloads:
+            JudgmentRecord.validate_fields(payload)
+        elapsed["validate"] += perf_counter_ns() - start
+
+        start = perf_counter_ns()
+        for payload in payloads:
+            judgment_fingerprint(payload)
+        elapsed["fingerprint"] += perf_counter_ns() - start
+
+        start = perf_counter_ns()
+        for record in records:
+            write_judgment_record(record, records_dir)
+        elapsed["write_judgment_record"] += perf_counter_ns() - start
+        done += len(chunk)
+    return {name: _result(count, total) for name, total in elapsed.items()}
+
+
+def _publish_pass(records_dir: Path, out_dir: Path, count: int) -> BenchmarkResult:
+    from scripts.publish_pages_data import publish_pages_data
+
+    start = perf_counter_ns()
+    publish_pages_data(in_dir=records_dir, out_dir=out_dir, clean=True)
+    return _result(count, perf_counter_ns() - start)
+
+
+def benchmark_records(
+    count: int,
+    repeat: int = DEFAULT_REPEAT,
+    work_dir: Optional[Path] = None,
+    publish: bool = True,
+) -> Dict[str, BenchmarkResult]:
+    """Time the judgment path over ``count`` synthetic records; names carry the size."""
+    mandates = [load_mandate(path) for path in MANDATE_PATHS]
+    runs: Dict[str, List[BenchmarkResult]] = {}
+    for _ in range(repeat):
+        root = Path(tempfile.mkdtemp(prefix="buffet-bench-", dir=work_dir))
+        try:
+            records_dir = root / "judgment_records"
+            phases = _judgment_pass(mandates, count, records_dir)
+            if publish:
+                phases["publish_pages_data"] = _publish_pass(records_dir, root / "docs" / "data", count)
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+        for name, result in phases.items():
+            runs.setdefault(f"{name}/{count}", []).append(result)
+    return {name: _fastest(results) for name, results in runs.items()}
+
+
+def run_suite(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    repeat: int = DEFAULT_REPEAT,
+    load_iterations: int = DEFAULT_LOAD_ITERATIONS,
+    work_dir: Optional[Path] = None,
+    publish: bool = True,
+) -> Dict[str, Any]:
+    """Run every case and return the JSON-serializable results document."""
+    if repeat < 1:
+        raise ValueError("repeat must be at least 1")
+    if any(size < 1 for size in sizes):
+        raise ValueError("sizes must be positive")
+    results = benchmark_loads(load_iterations, repeat)
+    for size in sizes:
+        results.update(benchmark_records(size, repeat, work_dir, publish))
+    return {
+        "version": RESULTS_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "libyaml": hasattr(yaml, "CSafeLoader"),
+        },
+        "sizes": list(sizes),
+        "repeat": repeat,
+        "results": {name: asdict(result) for name, result in results.items()},
+    }
+
+
+def compare(
+    current: Mapping[str, Any],
+    baseline: Mapping[str, Any],
+    max_slowdown: float = DEFAULT_MAX_SLOWDOWN,
+    overrides: Optional[Mapping[str, float]] = None,
+) -> List[Regression]:
+    """Return cases present in both documents that slowed down beyond the allowed fraction."""
+    overrides = overrides or {}
+    regressions = []
+    baseline_results = baseline.get("results", {})
+    for name, result in current.get("results", {}).items():
+        reference = baseline_results.get(name)
+        if reference is None or reference["ns_per_op"] <= 0:
+            continue
+        allowed = overrides.get(name, overrides.get(name.split("/", 1)[0], max_slowdown))
+        if result["ns_per_op"] > reference["ns_per_op"] * (1.0 + allowed):
+            regressions.append(Regression(name, reference["ns_per_op"], result["ns_per_op"], allowed))
+    return regressions
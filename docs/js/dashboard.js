@@ -1,5 +1,5 @@
-import { debounce, groupBy, uniq } from "./core.js";
-import { getActiveDataset, loadIndex, writeShowAllEmissions } from "./data.js";
+import { debounce } from "./core.js";
+import { getActiveDataset, loadAggregates, loadIndex, readShowAllEmissions, writeShowAllEmissions } from "./data.js";
 import { outcomeLabel } from "./governance.js";
 import { setActiveNav, wireOnboarding } from "./page.js";
 import { openMandateViewer } from "../mandate_viewer.js";
@@ -20,7 +20,7 @@ const els = {
   tableProceduresFallback: document.getElementById("table-procedures-fallback"),
 };
 
-let indexRecords = [];
+let summary = null;
 let showAllEmissions = false;
 let chartEscMandate = null;
 let chartTrend = null;
@@ -52,11 +52,43 @@ function renderUnitLabels() {
   }
 }
 
-function renderTiles(records) {
-  const total = records.length;
-  const escalations = records.filter((r) => r.outcome_type === "escalate").length;
-  const mandates = uniq(records.map((r) => r.mandate_id)).length;
-  const procedures = uniq(records.map((r) => r.procedure_id)).length;
+function parseTimestamp(ts) {
+  const d = new Date(ts);
+  return Number.isNaN(d.getTime()) ? null : d;
+}
+
+// Same shape as the published aggregates, computed from index entries for
+// snapshots published before aggregates existed.
+function summarizeRecords(records) {
+  const empty = () => ({ count: 0, escalations: 0, outcomes: {} });
+  const add = (bucket, record) => {
+    bucket.count += 1;
+    bucket.outcomes[record.outcome_type] = (bucket.outcomes[record.outcome_type] || 0) + 1;
+    if (record.outcome_type === "escalate") {
+      bucket.escalations += 1;
+    }
+  };
+  const result = { overall: empty(), by_mandate: {}, by_procedure: {}, by_week: {} };
+  records.forEach((r) => {
+    add(result.overall, r);
+    [
+      ["by_mandate", r.mandate_id],
+      ["by_procedure", r.procedure_id],
+      ["by_week", weekBucket(r.timestamp)],
+    ].forEach(([dimension, key]) => {
+      if (!key) return;
+      result[dimension][key] = result[dimension][key] || empty();
+      add(result[dimension][key], r);
+    });
+  });
+  return result;
+}
+
+function renderTiles(totals) {
+  const total = totals.overall?.count || 0;
+  const escalations = totals.overall?.escalations || 0;
+  const mandates = Object.keys(totals.by_mandate || {}).length;
+  const procedures = Object.keys(totals.by_procedure || {}).length;
 
   els.tileTotal.textContent = String(total);
   els.tileEscalations.textContent = String(escalations);
@@ -64,13 +96,10 @@ function renderTiles(records) {
   els.tileProcedures.textContent = String(procedures);
 }
 
-function renderEscalationsByMandate(records) {
-  const escalations = records.filter((r) => r.outcome_type === "escalate");
-  const byMandate = groupBy(escalations, (r) => r.mandate_id);
-  const rows = Array.from(byMandate.entries()).map(([mandateId, items]) => ({
-    mandateId,
-    count: items.length,
-  }));
+function renderEscalationsByMandate(totals) {
+  const rows = Object.entries(totals.by_mandate || {})
+    .map(([mandateId, bucket]) => ({ mandateId, count: bucket.escalations || 0 }))
+    .filter((row) => row.count > 0);
   rows.sort((a, b) => b.count - a.count || a.mandateId.localeCompare(b.mandateId));
   const maxCount = rows.length ? rows[0].count : 0;
   const stepSize = integerStep(maxCount);
@@ -144,19 +173,17 @@ function weekBucket(isoTimestamp) {
   return utc.toISOString().slice(0, 10);
 }
 
-function renderTrend(records) {
-  const buckets = new Map();
-  records.forEach((r) => {
-    const bucket = weekBucket(r.timestamp);
-    if (!bucket) return;
-    if (!buckets.has(bucket)) {
-      buckets.set(bucket, { affirm_alignment: 0, recommend_adjustment: 0, escalate: 0 });
-    }
-    const row = buckets.get(bucket);
-    if (row[r.outcome_type] !== undefined) {
-      row[r.outcome_type] += 1;
-    }
-  });
+function renderTrend(totals) {
+  const buckets = new Map(
+    Object.entries(totals.by_week || {}).map(([week, bucket]) => [
+      week,
+      {
+        affirm_alignment: bucket.outcomes?.affirm_alignment || 0,
+        recommend_adjustment: bucket.outcomes?.recommend_adjustment || 0,
+        escalate: bucket.outcomes?.escalate || 0,
+      },
+    ])
+  );
 
   const labels = Array.from(buckets.keys()).sort();
   const series = (outcomeType) => labels.map((label) => buckets.get(label)?.[outcomeType] || 0);
@@ -240,13 +267,12 @@ function renderTrend(records) {
   });
 }
 
-function renderProceduresTable(records) {
+function renderProceduresTable(totals) {
   els.tableProcedures.replaceChildren();
-  const byProcedure = groupBy(records, (r) => r.procedure_id);
-  const rows = Array.from(byProcedure.entries()).map(([procedureId, items]) => ({
+  const rows = Object.entries(totals.by_procedure || {}).map(([procedureId, bucket]) => ({
     procedureId,
-    total: items.length,
-    escalations: items.filter((r) => r.outcome_type === "escalate").length,
+    total: bucket.count || 0,
+    escalations: bucket.escalations || 0,
   }));
   rows.sort((a, b) => b.total - a.total || b.escalations - a.escalations || a.procedureId.localeCompare(b.procedureId));
 
@@ -270,20 +296,25 @@ function renderProceduresTable(records) {
 function renderAll() {
   destroyCharts();
   renderUnitLabels();
-  renderTiles(indexRecords);
-  renderEscalationsByMandate(indexRecords);
-  renderTrend(indexRecords);
-  renderProceduresTable(indexRecords);
+  renderTiles(summary);
+  renderEscalationsByMandate(summary);
+  renderTrend(summary);
+  renderProceduresTable(summary);
 }
 
 async function init() {
   setActiveNav();
   wireOnboarding({ autoOpen: false });
 
-  const index = await loadIndex();
-  const dataset = getActiveDataset(index);
-  indexRecords = dataset.records || [];
-  showAllEmissions = dataset.showAllEmissions;
+  // Publish-time rollups are a few kilobytes; fall back to the index otherwise.
+  showAllEmissions = readShowAllEmissions({ defaultValue: false });
+  summary = await loadAggregates(showAllEmissions ? "emissions" : "judgments");
+  if (!summary) {
+    const index = await loadIndex();
+    const dataset = getActiveDataset(index);
+    showAllEmissions = dataset.showAllEmissions;
+    summary = summarizeRecords(dataset.records || []);
+  }
 
   if (els.toggleEmissions) {
     els.toggleEmissions.checked = showAllEmissions;
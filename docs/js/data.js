@@ -3,26 +3,108 @@ import { sortByTimestampDesc } from "./core.js";
 const INDEX_URL = "data/index.json";
 export const SHOW_ALL_EMISSIONS_STORAGE_KEY = "mandateos.viewer.showAllEmissions";
 
-let cachedIndex = null;
+let cachedManifest = null;
+const shardCache = new Map();
 const recordCache = new Map();
 
-export async function loadIndex() {
-  if (cachedIndex) {
-    return cachedIndex;
-  }
-  const response = await fetch(INDEX_URL, { cache: "no-store" });
+async function fetchJson(url, label) {
+  const response = await fetch(url, { cache: "no-store" });
   if (!response.ok) {
-    throw new Error(`Failed to load ${INDEX_URL}: ${response.status}`);
+    throw new Error(`Failed to load ${label || url}: ${response.status}`);
+  }
+  return response.json();
+}
+
+export async function loadIndexManifest() {
+  if (cachedManifest) {
+    return cachedManifest;
+  }
+  const data = await fetchJson(INDEX_URL);
+  if (!Array.isArray(data.shards)) {
+    // Pre-sharding snapshot: records and groups are embedded in the root.
+    const records = Array.isArray(data.records) ? data.records : [];
+    const groups = Array.isArray(data.groups) ? data.groups : [];
+    cachedManifest = {
+      generated_at: data.generated_at,
+      record_count: records.length,
+      group_count: groups.length,
+      mandates: [...new Set(records.map((r) => r.mandate_id).filter(Boolean))].sort(),
+      periods: [],
+      shards: [],
+      legacy: { records, groups },
+    };
+    return cachedManifest;
+  }
+  cachedManifest = data;
+  return cachedManifest;
+}
+
+// Shards are written oldest-first so publishes only touch the newest shard of a
+// partition; reverse them back to newest-first.
+async function fetchShard(shard) {
+  if (!shardCache.has(shard.path)) {
+    const pending = fetchJson(shard.path, `index shard ${shard.path}`).then((data) =>
+      Array.isArray(data?.[shard.kind]) ? [...data[shard.kind]].reverse() : []
+    );
+    pending.catch(() => shardCache.delete(shard.path));
+    shardCache.set(shard.path, pending);
+  }
+  return shardCache.get(shard.path);
+}
+
+function shardMatches(shard, { mandateId, from, to }) {
+  if (mandateId && shard.mandate_id !== mandateId) {
+    return false;
   }
-  const data = await response.json();
-  const records = Array.isArray(data.records) ? data.records : [];
-  const groups = Array.isArray(data.groups) ? data.groups : [];
-  cachedIndex = {
-    generated_at: data.generated_at,
+  if (from && shard.last_timestamp && String(shard.last_timestamp).slice(0, 10) < from) {
+    return false;
+  }
+  if (to && shard.first_timestamp && String(shard.first_timestamp).slice(0, 10) > to) {
+    return false;
+  }
+  return true;
+}
+
+// Load index entries, fetching only the shards needed.
+// Shards are partitioned by month and mandate; with `limit`, whole months are
+// fetched newest-first until at least `limit` records are available, so the
+// result is always a complete newest-first prefix of the matching history.
+export async function loadIndex({ mandateId = "", from = "", to = "", limit = 0 } = {}) {
+  const manifest = await loadIndexManifest();
+  if (manifest.legacy) {
+    return {
+      generated_at: manifest.generated_at,
+      records: sortByTimestampDesc(manifest.legacy.records),
+      groups: manifest.legacy.groups,
+      manifest,
+      complete: true,
+    };
+  }
+
+  const filters = { mandateId, from, to };
+  const matching = manifest.shards.filter((shard) => shardMatches(shard, filters));
+  const periods = [...new Set(matching.map((shard) => shard.period))].sort().reverse();
+  const records = [];
+  const groups = [];
+  let loadedPeriods = 0;
+  for (const period of periods) {
+    if (limit && records.length >= limit) {
+      break;
+    }
+    const shards = matching.filter((shard) => shard.period === period);
+    const payloads = await Promise.all(shards.map(fetchShard));
+    shards.forEach((shard, i) => (shard.kind === "groups" ? groups : records).push(...payloads[i]));
+    loadedPeriods += 1;
+  }
+
+  groups.sort((a, b) => String(b.last_timestamp ?? "").localeCompare(String(a.last_timestamp ?? "")));
+  return {
+    generated_at: manifest.generated_at,
     records: sortByTimestampDesc(records),
     groups,
+    manifest,
+    complete: loadedPeriods === periods.length && !mandateId && !from && !to,
   };
-  return cachedIndex;
 }
 
 export async function fetchRecordByPath(path) {
@@ -32,11 +114,7 @@ export async function fetchRecordByPath(path) {
   if (recordCache.has(path)) {
     return recordCache.get(path);
   }
-  const response = await fetch(path, { cache: "no-store" });
-  if (!response.ok) {
-    throw new Error(`Failed to load record ${path}: ${response.status}`);
-  }
-  const data = await response.json();
+  const data = await fetchJson(path, `record ${path}`);
   recordCache.set(path, data);
   return data;
 }
@@ -54,13 +132,137 @@ async function withConcurrencyLimit(items, limit, fn) {
   return results;
 }
 
+const packTableCache = new Map();
+
+function periodOf(timestamp) {
+  const text = String(timestamp ?? "");
+  return /^\d{4}-\d{2}/.test(text) ? text.slice(0, 7) : "undated";
+}
+
+async function loadPackTable(pack) {
+  if (!packTableCache.has(pack.offsets_path)) {
+    const pending = fetchJson(pack.offsets_path, `record pack table ${pack.offsets_path}`);
+    pending.catch(() => packTableCache.delete(pack.offsets_path));
+    packTableCache.set(pack.offsets_path, pending);
+  }
+  return packTableCache.get(pack.offsets_path);
+}
+
+async function gunzipText(bytes) {
+  const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream("gzip"));
+  return new Response(stream).text();
+}
+
+async function fetchPackBytes(path, start, end) {
+  const headers = start === undefined ? {} : { Range: `bytes=${start}-${end - 1}` };
+  const response = await fetch(path, { cache: "no-store", headers });
+  if (!response.ok) {
+    throw new Error(`Failed to load record pack ${path}: ${response.status}`);
+  }
+  const buffer = await response.arrayBuffer();
+  // Servers that ignore Range answer 200 with the whole pack.
+  return start !== undefined && response.status === 200 ? buffer.slice(start, end) : buffer;
+}
+
+// Merge sorted block indexes into contiguous [first, last] runs.
+function blockRuns(blockIndexes) {
+  const runs = [];
+  blockIndexes.forEach((index) => {
+    const last = runs[runs.length - 1];
+    if (last && last[1] === index - 1) {
+      last[1] = index;
+    } else {
+      runs.push([index, index]);
+    }
+  });
+  return runs;
+}
+
+// Fill recordCache from one pack: whole pack when most blocks are wanted,
+// otherwise byte ranges covering only the wanted blocks.
+async function loadFromPack(pack, wantedPaths) {
+  const table = await loadPackTable(pack);
+  const recordIds = Array.isArray(table.record_ids) ? table.record_ids : [];
+  const blocks = Array.isArray(table.blocks) ? table.blocks : [];
+  const lineById = new Map(recordIds.map((id, line) => [String(id), line]));
+  const wantedBlocks = new Set();
+  wantedPaths.forEach((path, recordId) => {
+    if (lineById.has(recordId)) {
+      wantedBlocks.add(Math.floor(lineById.get(recordId) / table.block_records));
+    }
+  });
+  if (!wantedBlocks.size) {
+    return;
+  }
+
+  const sorted = [...wantedBlocks].sort((a, b) => a - b);
+  const runs = sorted.length * 2 > blocks.length ? [[0, blocks.length - 1]] : blockRuns(sorted);
+  for (const [first, last] of runs) {
+    const start = blocks[first].offset;
+    const end = blocks[last].offset + blocks[last].length;
+    const wholePack = first === 0 && last === blocks.length - 1;
+    const buffer = wholePack ? await fetchPackBytes(pack.path) : await fetchPackBytes(pack.path, start, end);
+    for (let index = first; index <= last; index += 1) {
+      if (!wantedBlocks.has(index)) {
+        continue;
+      }
+      const block = blocks[index];
+      const text = await gunzipText(buffer.slice(block.offset - start, block.offset - start + block.length));
+      text.split("\n").forEach((line) => {
+        if (!line) {
+          return;
+        }
+        const data = JSON.parse(line);
+        const path = wantedPaths.get(String(data.record_id));
+        if (path) {
+          recordCache.set(path, data);
+        }
+      });
+    }
+  }
+}
+
+// Load full records for index entries. Records are read from the month/mandate
+// record packs when the snapshot has them; anything not found in a pack falls
+// back to per-record JSON fetches.
 export async function loadAllRecords(recordMetas, { concurrency = 8 } = {}) {
+  const manifest = await loadIndexManifest().catch(() => null);
+  const packs = Array.isArray(manifest?.packs) ? manifest.packs : [];
+  const missing = recordMetas.filter((meta) => meta?.path && !recordCache.has(meta.path));
+
+  if (packs.length && missing.length && typeof DecompressionStream !== "undefined") {
+    const wantedByPartition = new Map();
+    missing.forEach((meta) => {
+      const key = `${periodOf(meta.timestamp)}|${meta.mandate_id ?? ""}`;
+      if (!wantedByPartition.has(key)) {
+        wantedByPartition.set(key, new Map());
+      }
+      wantedByPartition.get(key).set(String(meta.record_id), meta.path);
+    });
+    const candidates = packs.filter((pack) =>
+      wantedByPartition.has(`${pack.period}|${pack.mandate_id ?? ""}`)
+    );
+    await withConcurrencyLimit(candidates, concurrency, (pack) =>
+      loadFromPack(pack, wantedByPartition.get(`${pack.period}|${pack.mandate_id ?? ""}`)).catch(() => null)
+    );
+  }
+
   return withConcurrencyLimit(recordMetas, concurrency, async (meta) => {
     const data = await fetchRecordByPath(meta.path);
     return { meta, data };
   });
 }
 
+// Precomputed dashboard rollups ("emissions" or "judgments"); null when the
+// snapshot predates aggregates.
+export async function loadAggregates(unit) {
+  try {
+    return await fetchJson(`data/aggregates/${unit}.json`, `${unit} aggregates`);
+  } catch {
+    return null;
+  }
+}
+
 export function readShowAllEmissions({ defaultValue = false } = {}) {
   try {
     return window.localStorage.getItem(SHOW_ALL_EMISSIONS_STORAGE_KEY) === "1";
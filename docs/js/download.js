@@ -1,5 +1,5 @@
 import { debounce, downloadBlob, formatShortDate, toCsv, uniq } from "./core.js";
-import { fetchRecordByPath, getActiveDataset, loadIndex, writeShowAllEmissions } from "./data.js";
+import { fetchRecordByPath, getActiveDataset, loadAllRecords, loadIndex, writeShowAllEmissions } from "./data.js";
 import { buildGovernanceSummary, outcomeLabel } from "./governance.js";
 import { setActiveNav, wireOnboarding } from "./page.js";
 
@@ -263,6 +263,7 @@ async function exportSelectedPdf() {
   writeLine(`Generated: ${new Date().toISOString()}`, { size: 10 });
   y += 12;
 
+  await loadAllRecords(metas);
   for (const meta of metas) {
     const data = await fetchRecordByPath(meta.path);
     const summary = buildGovernanceSummary(meta, data);
@@ -363,6 +364,7 @@ async function downloadAuditPackage() {
   zip.file("manifest.json", JSON.stringify(manifest, null, 2));
 
   const recordsFolder = zip.folder("records");
+  await loadAllRecords(metas);
   for (const meta of metas) {
     const data = await fetchRecordByPath(meta.path);
     recordsFolder.file(`${meta.record_id}.json`, JSON.stringify(data, null, 2));
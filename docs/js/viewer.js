@@ -1,9 +1,11 @@
 import { debounce, formatShortDate, truncate, uniq } from "./core.js";
-import { fetchRecordByPath, getActiveDataset, loadIndex } from "./data.js";
+import { fetchRecordByPath, getActiveDataset, loadAllRecords, loadIndex } from "./data.js";
 import { buildGovernanceSummary, outcomeLabel, OUTCOME_CONTEXT } from "./governance.js";
 import { setActiveNav, wireOnboarding } from "./page.js";
 import { openMandateViewer } from "../mandate_viewer.js";
 
+const INITIAL_PAGE_SIZE = 200;
+
 let showAllEmissions = false;
 let representativeByEmissionId = new Map();
 
@@ -652,6 +654,7 @@ async function exportPdfSummaries() {
   writeLine(`Generated: ${new Date().toISOString()}`, { size: 10 });
   y += 12;
 
+  await loadAllRecords(metas);
   for (const meta of metas) {
     const data = await fetchRecordByPath(meta.path);
     const summary = buildGovernanceSummary(meta, data);
@@ -710,6 +713,7 @@ async function downloadAuditPackage() {
     mandates: new Map(),
     procedures: new Map(),
   };
+  await loadAllRecords(metas);
   for (const meta of metas) {
     const data = await fetchRecordByPath(meta.path);
     recordsFolder.file(`${meta.record_id}.json`, JSON.stringify(data, null, 2));
@@ -883,12 +887,16 @@ export async function initViewer({ showAllEmissions: initialShowAllEmissions } =
   setActiveNav();
   wireOnboarding();
 
-  const index = await loadIndex();
-  const dataset = getActiveDataset(index, { showAllEmissions: initialShowAllEmissions });
-  showAllEmissions = dataset.showAllEmissions;
-  indexRecords = dataset.records || [];
-  representativeByEmissionId = dataset.representativeByEmissionId || new Map();
-  renderExecutivePanels(indexRecords);
+  // Render the newest months first; the rest of the history streams in behind.
+  const index = await loadIndex({ limit: INITIAL_PAGE_SIZE });
+  const applyIndex = (loaded) => {
+    const dataset = getActiveDataset(loaded, { showAllEmissions: initialShowAllEmissions });
+    showAllEmissions = dataset.showAllEmissions;
+    indexRecords = dataset.records || [];
+    representativeByEmissionId = dataset.representativeByEmissionId || new Map();
+    renderExecutivePanels(indexRecords);
+  };
+  applyIndex(index);
 
   buildFilters();
   renderCompareOptions();
@@ -902,6 +910,21 @@ export async function initViewer({ showAllEmissions: initialShowAllEmissions } =
     updateCompare();
   });
 
+  if (!index.complete) {
+    loadIndex().then((full) => {
+      const filterValues = [els.filterMandate.value, els.filterProcedure.value, els.filterOutcome.value];
+      applyIndex(full);
+      buildFilters();
+      [els.filterMandate.value, els.filterProcedure.value, els.filterOutcome.value] = filterValues;
+      renderCompareOptions();
+      renderList();
+      updateCounts();
+      if (!selectedMeta) {
+        applyRecordFromUrl();
+      }
+    });
+  }
+
   if (applyRecordFromUrl()) {
     return;
   }
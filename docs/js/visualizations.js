@@ -1,5 +1,5 @@
 import { debounce, formatShortDate, groupBy, sum, uniq } from "./core.js";
-import { fetchRecordByPath, getActiveDataset, loadIndex, writeShowAllEmissions } from "./data.js";
+import { fetchRecordByPath, getActiveDataset, loadAllRecords, loadIndex, writeShowAllEmissions } from "./data.js";
 import { outcomeLabel, OUTCOME_CONTEXT } from "./governance.js";
 import { setActiveNav, wireOnboarding } from "./page.js";
 import { openMandateViewer } from "../mandate_viewer.js";
@@ -334,6 +334,7 @@ async function computeHeatmapMatrix(records, metric) {
 
   if (metric === "severity") {
     const escalationRecords = records.filter((r) => r.outcome_type === "escalate");
+    await loadAllRecords(escalationRecords.filter((r) => !escalationSeverityCache.has(r.path)));
     const severities = await Promise.all(escalationRecords.map((r) => escalationSeverity(r)));
     escalationRecords.forEach((r, idx) => {
       const key = cellKey(r.mandate_id, r.procedure_id);
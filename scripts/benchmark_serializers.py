@@ -0,0 +1,101 @@
+"""Compare judgment record serializers by size and per-record encode/decode time."""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Dict, List, Optional
+
+import yaml
+
+from buffet.contracts.judgment_record import JudgmentRecord
+from buffet.contracts.serialization import RECORD_FORMATS, get_serializer
+from buffet.mandates.loader import load_mandate
+from buffet.procedures.rate_regime_adjustment import RateRegimeAdjustmentProcedure, load_thresholds
+from buffet.sensing.scenario import load_scenario
+
+MANDATES = [
+    Path("mandates/liability_driven/db_pension_v1/mandate.yaml"),
+    Path("mandates/perpetual_capital/endowment_v1/mandate.yaml"),
+]
+SCENARIOS_DIR = Path("judgment_loops/rate_regime_adjustment/scenarios")
+THRESHOLDS = Path("judgment_loops/rate_regime_adjustment/thresholds.yaml")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse CLI arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark judgment record serializers.")
+    parser.add_argument("--count", type=int, default=2000, help="Records to encode and decode per format")
+    return parser.parse_args()
+
+
+def sample_records(count: int) -> List[JudgmentRecord]:
+    """Judge every mandate/scenario pair and cycle the results up to ``count`` records."""
+    procedure = RateRegimeAdjustmentProcedure()
+    thresholds = load_thresholds(THRESHOLDS)
+    base = [
+        procedure.judge(load_mandate(mandate), load_scenario(scenario), thresholds, decision_latency_ms=0)
+        for mandate in MANDATES
+        for scenario in sorted(SCENARIOS_DIR.glob("*.yaml"))
+    ]
+    return [base[index % len(base)] for index in range(count)]
+
+
+def _time_per_record(fn: Callable[[], object], count: int) -> float:
+    start = perf_counter()
+    fn()
+    return (perf_counter() - start) / count * 1e6
+
+
+def benchmark(records: List[JudgmentRecord]) -> Dict[str, Optional[Dict[str, float]]]:
+    """Return bytes and microseconds per record for each format; None when unavailable."""
+    count = len(records)
+    results: Dict[str, Optional[Dict[str, float]]] = {}
+
+    encoded_python: List[bytes] = []
+    results["yaml (pure Python baseline)"] = {
+        "encode_us": _time_per_record(
+            lambda: encoded_python.extend(
+                yaml.safe_dump(record.to_dict(), sort_keys=True).encode("utf-8") for record in records
+            ),
+            count,
+        ),
+        "decode_us": _time_per_record(
+            lambda: [JudgmentRecord.validate_fields(yaml.safe_load(payload)) for payload in encoded_python], count
+        ),
+        "bytes": sum(len(payload) for payload in encoded_python) / count,
+    }
+
+    for name in RECORD_FORMATS:
+        serializer = get_serializer(name)
+        try:
+            serializer.dumps(records[0])
+        except ImportError:
+            results[name] = None
+            continue
+        encoded: List[bytes] = []
+        results[name] = {
+            "encode_us": _time_per_record(lambda: encoded.extend(serializer.dumps(r) for r in records), count),
+            "decode_us": _time_per_record(lambda: [serializer.loads(payload) for payload in encoded], count),
+            "bytes": sum(len(payload) for payload in encoded) / count,
+        }
+    return results
+
+
+def main() -> int:
+    """Run the serializer benchmark and print a table."""
+    args = parse_args()
+    records = sample_records(max(1, args.count))
+    results = benchmark(records)
+    print(f"{'format':<30}{'bytes/rec':>12}{'encode µs':>12}{'decode µs':>12}")
+    for name, row in results.items():
+        if row is None:
+            print(f"{name:<30}{'(not installed)':>36}")
+            continue
+        print(f"{name:<30}{row['bytes']:>12.0f}{row['encode_us']:>12.1f}{row['decode_us']:>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
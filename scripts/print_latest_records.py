@@ -3,38 +3,53 @@
 from __future__ import annotations
 
 import argparse
+from itertools import islice
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
-import yaml
+from buffet.execution.memory import RecordView, iter_record_views
 
 
 def parse_args() -> argparse.Namespace:
     """Parse CLI arguments."""
     parser = argparse.ArgumentParser(description="Print latest judgment records.")
     parser.add_argument("count", nargs="?", type=int, default=2)
+    parser.add_argument("--mandate", help="Only records for this mandate_id")
+    parser.add_argument("--outcome", help="Only records with this outcome type")
+    parser.add_argument("--since", help="Earliest timestamp or date (inclusive)")
+    parser.add_argument("--until", help="Latest timestamp or date (exclusive)")
     return parser.parse_args()
 
 
-def get_latest_records(records_dir: Path, count: int) -> List[Path]:
-    """Return the newest record paths by filename timestamp."""
-    records = sorted(records_dir.glob("*.yaml"))
-    if not records:
-        return []
-    records = records[-count:]
-    return list(reversed(records))
-
-
-def print_summary(path: Path) -> None:
+def get_latest_records(
+    records_dir: Path,
+    count: int,
+    mandate_id: Optional[str] = None,
+    outcome_type: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+) -> List[RecordView]:
+    """Return the newest matching records by filename timestamp."""
+    views = iter_record_views(
+        records_dir,
+        mandate_id=mandate_id,
+        outcome_type=outcome_type,
+        since=since,
+        until=until,
+        newest_first=True,
+    )
+    return list(islice(views, count))
+
+
+def print_summary(record: RecordView) -> None:
     """Print a short summary for a single record."""
-    data = yaml.safe_load(path.read_text())
-    authority = data.get("authority", {})
-    outcome = data.get("outcome", {})
-    confidence = data.get("confidence", {})
-    constraints = data.get("constraints", {})
-    behavior = data.get("behavior", {})
-
-    print(str(path))
+    authority = record.get("authority", {})
+    outcome = record.get("outcome", {})
+    confidence = record.get("confidence", {})
+    constraints = record.get("constraints", {})
+    behavior = record.get("behavior", {})
+
+    print(str(record.path))
     print(f"  authority.mandate_id: {authority.get('mandate_id')}")
     print(f"  authority.procedure_id: {authority.get('procedure_id')}")
     print(f"  outcome.type: {outcome.get('type')}")
@@ -52,13 +67,24 @@ def main() -> int:
         print(f"No records directory found at {records_dir}")
         return 1
 
-    latest = get_latest_records(records_dir, max(1, args.count))
+    try:
+        latest = get_latest_records(
+            records_dir,
+            max(1, args.count),
+            mandate_id=args.mandate,
+            outcome_type=args.outcome,
+            since=args.since,
+            until=args.until,
+        )
+    except ValueError as exc:
+        print(exc)
+        return 1
     if not latest:
         print("No judgment records found.")
         return 1
 
-    for path in latest:
-        print_summary(path)
+    for record in latest:
+        print_summary(record)
 
     return 0
 
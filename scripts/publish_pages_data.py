@@ -3,14 +3,18 @@
 from __future__ import annotations
 
 import argparse
+import gzip
 import hashlib
 import json
+import re
 import shutil
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-import yaml
+from buffet.contracts.fingerprint import judgment_fingerprint
+from buffet.execution.memory import RecordView
+from buffet.utils.yaml_cache import load_yaml
 
 REQUIRED_KEYS = {
     "authority",
@@ -24,6 +28,15 @@ REQUIRED_KEYS = {
     "audit",
 }
 
+MANIFEST_NAME = "publish_manifest.json"
+MANIFEST_VERSION = 2
+INDEX_FORMAT_VERSION = 2
+DEFAULT_INDEX_SHARD_SIZE = 2000
+DEFAULT_PACK_SIZE = 2000
+DEFAULT_PACK_BLOCK_RECORDS = 64
+CONFIDENCE_HISTOGRAM_BINS = 10
+LATENCY_PERCENTILES = (50, 90, 99)
+
 
 def parse_args() -> argparse.Namespace:
     """Parse CLI arguments for publishing."""
@@ -48,6 +61,23 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Include examples/ judgment records in the published index",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only convert records that are new or changed since the last publish",
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        default=DEFAULT_INDEX_SHARD_SIZE,
+        help="Maximum entries per index shard",
+    )
+    parser.add_argument(
+        "--pack-size",
+        type=int,
+        default=DEFAULT_PACK_SIZE,
+        help="Maximum records per gzip'd NDJSON record pack",
+    )
     return parser.parse_args()
 
 
@@ -58,17 +88,26 @@ def _validate_record(data: Dict[str, Any], source: Path) -> None:
         raise ValueError(f"Record {source} missing keys: {sorted(missing)}")
 
 
-def _load_records(paths: Iterable[Path]) -> List[Dict[str, Any]]:
-    """Load and validate records from YAML files."""
-    records: List[Dict[str, Any]] = []
-    for path in paths:
-        data = yaml.safe_load(path.read_text())
-        if not isinstance(data, dict):
-            raise ValueError(f"Record {path} is invalid")
-        _validate_record(data, path)
-        data["_source_path"] = path
-        records.append(data)
-    return records
+def _load_record(path: Path, content: bytes) -> Dict[str, Any]:
+    """Load and validate one record from YAML content."""
+    view = RecordView(path, content.decode("utf-8"))
+    _validate_record(dict.fromkeys(view.keys()), path)
+    return view.to_dict()
+
+
+def _load_manifest(out_dir: Path) -> Dict[str, Dict[str, Any]]:
+    """Return source entries from the previous publish manifest, if usable."""
+    manifest_path = out_dir / MANIFEST_NAME
+    if not manifest_path.exists():
+        return {}
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except ValueError:
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    sources = manifest.get("sources")
+    return sources if isinstance(sources, dict) else {}
 
 
 def _record_json_path(out_dir: Path, source_path: Path) -> Path:
@@ -77,59 +116,9 @@ def _record_json_path(out_dir: Path, source_path: Path) -> Path:
     return out_dir / "records" / filename
 
 
-def _canonical_json_bytes(payload: Dict[str, Any]) -> bytes:
-    """Return a deterministic JSON byte representation for hashing."""
-    return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
-
-
-def _judgment_identity_payload(record: Dict[str, Any]) -> Dict[str, Any]:
-    """Build the semantic identity payload for a judgment fingerprint."""
-    authority = record.get("authority") if isinstance(record.get("authority"), dict) else {}
-    invocation = record.get("invocation") if isinstance(record.get("invocation"), dict) else {}
-    confidence = record.get("confidence") if isinstance(record.get("confidence"), dict) else {}
-
-    scenario_id = invocation.get("scenario_id") or invocation.get("scenario")
-    trigger_description = invocation.get("trigger_description") if scenario_id is None else None
-
-    identity: Dict[str, Any] = {
-        "authority": {
-            "mandate_id": authority.get("mandate_id"),
-            "mandate_version": authority.get("mandate_version"),
-            "procedure_id": authority.get("procedure_id"),
-            "procedure_version": authority.get("procedure_version"),
-        },
-        "invocation": {
-            "trigger_type": invocation.get("trigger_type"),
-            "trigger_description": trigger_description,
-            "scenario_id": scenario_id,
-            "persistence_evidence": invocation.get("persistence_evidence"),
-        },
-        "state": record.get("state"),
-        "outcome": record.get("outcome"),
-        "confidence": {
-            "level": confidence.get("level"),
-            "trend": confidence.get("trend"),
-        },
-        "constraints": record.get("constraints"),
-    }
-
-    if "attribution" in confidence:
-        identity["confidence"]["attribution"] = confidence.get("attribution")
-
-    if record.get("adjustment") is not None:
-        identity["adjustment"] = record.get("adjustment")
-    if record.get("inaction") is not None:
-        identity["inaction"] = record.get("inaction")
-    if record.get("escalation") is not None:
-        identity["escalation"] = record.get("escalation")
-
-    return identity
-
-
-def _judgment_fingerprint(record: Dict[str, Any]) -> str:
-    """Compute a deterministic SHA-256 fingerprint of a judgment's semantic identity."""
-    identity = _judgment_identity_payload(record)
-    return hashlib.sha256(_canonical_json_bytes(identity)).hexdigest()
+def _staged_path(json_path: Path) -> Path:
+    """Return the hidden temporary path a record is converted to before the publish commits."""
+    return json_path.with_name(f".{json_path.name}.tmp")
 
 
 def _index_entry(record: Dict[str, Any], json_path: Path, out_dir: Path) -> Dict[str, Any]:
@@ -158,7 +147,7 @@ def _load_mandate_sources() -> Dict[Tuple[str, str], Path]:
     sources: Dict[Tuple[str, str], Path] = {}
     for path in Path("mandates").glob("**/mandate.yaml"):
         try:
-            data = yaml.safe_load(path.read_text())
+            data = load_yaml(path)
         except Exception:
             continue
         if not isinstance(data, dict):
@@ -332,7 +321,7 @@ def publish_mandates(
 
     for path in sorted(mandates_root.glob("**/mandate.yaml")):
         try:
-            mandate = yaml.safe_load(path.read_text())
+            mandate = load_yaml(path)
         except Exception:
             continue
         if not isinstance(mandate, dict):
@@ -397,55 +386,33 @@ def publish_mandates(
     return index
 
 
-def publish_pages_data(
-    in_dir: Path,
-    out_dir: Path,
-    clean: bool = False,
-    include_examples: bool = False,
-) -> Dict[str, Any]:
-    """Publish YAML records into a JSON snapshot for Pages."""
-    input_paths = sorted(in_dir.glob("*.yaml"))
-    if include_examples:
-        examples_dir = Path("examples/judgment_records")
-        if examples_dir.exists():
-            input_paths.extend(sorted(examples_dir.glob("*.yaml")))
-
-    records = _load_records(input_paths)
-    published_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+def _record_facts(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the behavior fields aggregates need beyond the index entry."""
+    behavior = record.get("behavior") if isinstance(record.get("behavior"), dict) else {}
+    branches = behavior.get("procedure_branches_taken")
+    latency = behavior.get("decision_latency_ms")
+    return {
+        "branches": [str(branch) for branch in branches] if isinstance(branches, list) else [],
+        "latency_ms": latency if isinstance(latency, (int, float)) and not isinstance(latency, bool) else None,
+    }
 
-    records_dir = out_dir / "records"
-    records_dir.mkdir(parents=True, exist_ok=True)
-    if clean:
-        shutil.rmtree(records_dir)
-        records_dir.mkdir(parents=True, exist_ok=True)
 
-    index_entries: List[Dict[str, Any]] = []
-    mandate_keys: List[Tuple[str, str]] = []
-    procedure_keys: List[Tuple[str, str]] = []
-    for record in records:
-        source_path = record.pop("_source_path")
-        json_path = _record_json_path(out_dir, source_path)
-        payload = dict(record)
-        payload["judgment_fingerprint"] = _judgment_fingerprint(payload)
-        payload["_published_from"] = source_path.name
-        payload["_published_at"] = published_at
-        with json_path.open("w", encoding="utf-8") as handle:
-            json.dump(payload, handle, sort_keys=True, indent=2)
-        index_entries.append(_index_entry(payload, json_path, out_dir))
-        authority = payload.get("authority")
-        if isinstance(authority, dict):
-            mandate_id = authority.get("mandate_id")
-            mandate_version = authority.get("mandate_version")
-            procedure_id = authority.get("procedure_id")
-            procedure_version = authority.get("procedure_version")
-            if mandate_id and mandate_version is not None:
-                mandate_keys.append((str(mandate_id), str(mandate_version)))
-            if procedure_id and procedure_version:
-                procedure_keys.append((str(procedure_id), str(procedure_version)))
+def _publish_record(
+    path: Path, content: bytes, out_dir: Path, published_at: str
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Convert one YAML record to staged JSON and return its index entry and aggregate facts."""
+    payload = _load_record(path, content)
+    json_path = _record_json_path(out_dir, path)
+    payload["judgment_fingerprint"] = payload.get("judgment_fingerprint") or judgment_fingerprint(payload)
+    payload["_published_from"] = path.name
+    payload["_published_at"] = published_at
+    with _staged_path(json_path).open("w", encoding="utf-8") as handle:
+        json.dump(payload, handle, sort_keys=True, indent=2)
+    return _index_entry(payload, json_path, out_dir), _record_facts(payload)
 
-    index_entries.sort(key=lambda entry: entry.get("record_id") or "")
-    index_entries.sort(key=lambda entry: entry.get("timestamp") or "", reverse=True)
 
+def _build_groups(index_entries: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Group index entries that share a judgment fingerprint."""
     groups_by_fp: Dict[str, List[Dict[str, Any]]] = {}
     for entry in index_entries:
         fp = entry.get("judgment_fingerprint")
@@ -483,16 +450,453 @@ def publish_pages_data(
 
     groups.sort(key=lambda group: group.get("fingerprint") or "")
     groups.sort(key=lambda group: group.get("last_timestamp") or "", reverse=True)
+    return groups
+
+
+def _shard_segment(value: Any, fallback: str) -> str:
+    """Return a filesystem-safe shard path segment."""
+    text = re.sub(r"[^A-Za-z0-9_.-]+", "_", str(value or "")).strip("._")
+    return text or fallback
+
+
+def _shard_period(timestamp: Any) -> str:
+    """Return the YYYY-MM partition for a timestamp."""
+    text = str(timestamp or "")
+    return text[:7] if re.match(r"\d{4}-\d{2}", text) else "undated"
+
+
+def _write_json_if_changed(path: Path, payload: Any) -> None:
+    """Write JSON only when the serialized content differs from disk."""
+    text = json.dumps(payload, sort_keys=True, indent=2)
+    if path.exists() and path.read_text(encoding="utf-8") == text:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def _prune_outputs(root: Path, keep: Iterable[Path]) -> None:
+    """Remove files under ``root`` that are not in ``keep``, then empty directories."""
+    if not root.exists():
+        return
+    keep_set = set(keep)
+    for stale in [path for path in root.glob("**/*") if path.is_file() and path not in keep_set]:
+        stale.unlink()
+    for directory in sorted(root.glob("**/"), key=lambda path: len(path.parts), reverse=True):
+        if directory != root and not any(directory.iterdir()):
+            directory.rmdir()
+
+
+def _write_index_shards(
+    out_dir: Path,
+    kind: str,
+    items: List[Dict[str, Any]],
+    timestamp_key: str,
+    shard_size: int,
+) -> List[Dict[str, Any]]:
+    """Partition newest-first items by month and mandate into bounded shards.
+
+    Each partition is chunked oldest-first, so new items only touch its last
+    shard and earlier shards stay byte-identical (readers reverse each shard
+    to restore newest-first order).
+    """
+    partitions: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    for item in reversed(items):
+        key = (_shard_period(item.get(timestamp_key)), _shard_segment(item.get("mandate_id"), "unknown"))
+        partitions.setdefault(key, []).append(item)
+
+    descriptors: List[Dict[str, Any]] = []
+    for (period, mandate_segment), members in partitions.items():
+        for part, start in enumerate(range(0, len(members), shard_size)):
+            chunk = members[start : start + shard_size]
+            shard_path = out_dir / "index" / period / mandate_segment / f"{kind}-{part:03d}.json"
+            _write_json_if_changed(shard_path, {kind: chunk})
+            timestamps = [str(item[timestamp_key]) for item in chunk if item.get(timestamp_key)]
+            descriptors.append(
+                {
+                    "kind": kind,
+                    "path": shard_path.relative_to(out_dir.parent).as_posix(),
+                    "period": period,
+                    "mandate_id": chunk[0].get("mandate_id"),
+                    "count": len(chunk),
+                    "first_timestamp": min(timestamps) if timestamps else None,
+                    "last_timestamp": max(timestamps) if timestamps else None,
+                }
+            )
+    return descriptors
+
+
+def _write_record_pack(
+    out_dir: Path,
+    pack_path: Path,
+    table_path: Path,
+    members: List[Dict[str, Any]],
+    block_records: int,
+) -> Dict[str, Any]:
+    """Write one pack of published records, reusing it when its members are unchanged.
+
+    The pack is a sequence of independently gzip'd blocks of NDJSON, so a
+    reader can fetch and inflate one block by byte range. The offset table
+    lists record ids in line order plus each block's byte offset and length.
+    """
+    signature_hash = hashlib.sha256(f"{block_records}\n".encode("utf-8"))
+    for entry in members:
+        stat = (out_dir.parent / str(entry["path"])).stat()
+        signature_hash.update(f"{entry['path']}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode("utf-8"))
+    signature = signature_hash.hexdigest()
+    if pack_path.exists() and table_path.exists():
+        try:
+            table = json.loads(table_path.read_text(encoding="utf-8"))
+        except ValueError:
+            table = {}
+        if table.get("signature") == signature:
+            return table
+
+    blocks: List[Dict[str, int]] = []
+    offset = 0
+    pack_path.parent.mkdir(parents=True, exist_ok=True)
+    with pack_path.open("wb") as handle:
+        for start in range(0, len(members), block_records):
+            lines = []
+            for entry in members[start : start + block_records]:
+                payload = json.loads((out_dir.parent / str(entry["path"])).read_text(encoding="utf-8"))
+                lines.append(json.dumps(payload, sort_keys=True, separators=(",", ":")) + "\n")
+            block = gzip.compress("".join(lines).encode("utf-8"), mtime=0)
+            handle.write(block)
+            blocks.append({"offset": offset, "length": len(block)})
+            offset += len(block)
+
+    timestamps = [str(entry["timestamp"]) for entry in members if entry.get("timestamp")]
+    table = {
+        "signature": signature,
+        "path": pack_path.relative_to(out_dir.parent).as_posix(),
+        "offsets_path": table_path.relative_to(out_dir.parent).as_posix(),
+        "mandate_id": members[0].get("mandate_id"),
+        "count": len(members),
+        "bytes": offset,
+        "first_timestamp": min(timestamps) if timestamps else None,
+        "last_timestamp": max(timestamps) if timestamps else None,
+        "block_records": block_records,
+        "blocks": blocks,
+        "record_ids": [entry.get("record_id") for entry in members],
+    }
+    _write_json_if_changed(table_path, table)
+    return table
+
+
+def _write_record_packs(
+    out_dir: Path,
+    index_entries: List[Dict[str, Any]],
+    pack_size: int,
+    block_records: int = DEFAULT_PACK_BLOCK_RECORDS,
+) -> List[Dict[str, Any]]:
+    """Bundle newest-first published records into month/mandate gzip'd NDJSON packs.
+
+    Partitions are packed oldest-first, so new records are appended to the
+    last pack and the existing blocks of that pack keep their bytes and
+    offsets (range reads cached by the viewer stay valid).
+    """
+    partitions: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    for entry in reversed(index_entries):
+        key = (_shard_period(entry.get("timestamp")), _shard_segment(entry.get("mandate_id"), "unknown"))
+        partitions.setdefault(key, []).append(entry)
+
+    descriptors: List[Dict[str, Any]] = []
+    written: List[Path] = []
+    for (period, mandate_segment), partition in partitions.items():
+        for part, start in enumerate(range(0, len(partition), pack_size)):
+            pack_dir = out_dir / "packs" / period / mandate_segment
+            pack_path = pack_dir / f"pack-{part:03d}.ndjson.gz"
+            table_path = pack_dir / f"pack-{part:03d}.offsets.json"
+            table = _write_record_pack(
+                out_dir, pack_path, table_path, partition[start : start + pack_size], block_records
+            )
+            written.extend([pack_path, table_path])
+            descriptor = {
+                key: table[key]
+                for key in ("path", "offsets_path", "mandate_id", "count", "bytes", "first_timestamp", "last_timestamp")
+            }
+            descriptor["period"] = period
+            descriptors.append(descriptor)
+
+    _prune_outputs(out_dir / "packs", written)
+    descriptors.sort(key=lambda pack: pack["path"])
+    descriptors.sort(key=lambda pack: pack["period"], reverse=True)
+    return descriptors
+
+
+def _week_bucket(timestamp: Any) -> Optional[str]:
+    """Return the Monday (UTC) starting the week of a timestamp."""
+    day = _day_bucket(timestamp)
+    if day is None:
+        return None
+    start = date.fromisoformat(day)
+    return (start - timedelta(days=start.weekday())).isoformat()
+
+
+def _day_bucket(timestamp: Any) -> Optional[str]:
+    """Return the UTC calendar day of an ISO-8601 timestamp."""
+    try:
+        parsed = datetime.fromisoformat(str(timestamp).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.date().isoformat()
+
+
+def _percentile(ordered: List[float], percent: int) -> float:
+    """Nearest-rank percentile of a sorted, non-empty list."""
+    rank = max(1, -(-percent * len(ordered) // 100))
+    return ordered[rank - 1]
+
+
+class _Rollup:
+    """Running outcome, confidence, branch and latency totals for one bucket."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.outcomes: Dict[str, int] = {}
+        self.confidence = [0] * CONFIDENCE_HISTOGRAM_BINS
+        self.branches: Dict[str, int] = {}
+        self.latencies: List[float] = []
+
+    def add(self, entry: Dict[str, Any], facts: Dict[str, Any]) -> None:
+        self.count += 1
+        outcome = str(entry.get("outcome_type"))
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        level = entry.get("confidence_level")
+        if isinstance(level, (int, float)):
+            bin_index = int(min(max(float(level), 0.0), 1.0) * CONFIDENCE_HISTOGRAM_BINS)
+            self.confidence[min(bin_index, CONFIDENCE_HISTOGRAM_BINS - 1)] += 1
+        for branch in facts.get("branches", []):
+            self.branches[branch] = self.branches.get(branch, 0) + 1
+        if facts.get("latency_ms") is not None:
+            self.latencies.append(float(facts["latency_ms"]))
+
+    def to_dict(self) -> Dict[str, Any]:
+        escalations = self.outcomes.get("escalate", 0)
+        ordered = sorted(self.latencies)
+        latency = None
+        if ordered:
+            latency = {f"p{percent}": _percentile(ordered, percent) for percent in LATENCY_PERCENTILES}
+            latency["max"] = ordered[-1]
+        return {
+            "count": self.count,
+            "outcomes": dict(sorted(self.outcomes.items())),
+            "escalations": escalations,
+            "escalation_rate": escalations / self.count if self.count else 0.0,
+            "confidence_histogram": self.confidence,
+            "branches": dict(sorted(self.branches.items())),
+            "latency_ms": latency,
+        }
+
+
+def _rollups(rows: Iterable[Tuple[Dict[str, Any], Dict[str, Any]]]) -> Dict[str, Any]:
+    """Roll up index entries overall and per mandate, procedure, version, day and week."""
+    overall = _Rollup()
+    dimensions: Dict[str, Dict[str, _Rollup]] = {
+        "by_mandate": {},
+        "by_procedure": {},
+        "by_procedure_version": {},
+        "by_day": {},
+        "by_week": {},
+    }
+    for entry, facts in rows:
+        overall.add(entry, facts)
+        procedure_id = entry.get("procedure_id")
+        keys = {
+            "by_mandate": entry.get("mandate_id"),
+            "by_procedure": procedure_id,
+            "by_procedure_version": f"{procedure_id}@{entry.get('procedure_version')}" if procedure_id else None,
+            "by_day": _day_bucket(entry.get("timestamp")),
+            "by_week": _week_bucket(entry.get("timestamp")),
+        }
+        for dimension, key in keys.items():
+            if key is None:
+                continue
+            dimensions[dimension].setdefault(str(key), _Rollup()).add(entry, facts)
+
+    result: Dict[str, Any] = {"overall": overall.to_dict()}
+    for dimension, buckets in dimensions.items():
+        result[dimension] = {key: buckets[key].to_dict() for key in sorted(buckets)}
+    return result
+
+
+def _write_aggregates(
+    out_dir: Path,
+    generated_at: str,
+    index_entries: List[Dict[str, Any]],
+    groups: List[Dict[str, Any]],
+    facts_by_path: Dict[str, Dict[str, Any]],
+) -> None:
+    """Write dashboard rollups for every emission and for distinct judgments.
+
+    A distinct judgment is counted once, as its newest emission, at the
+    group's last timestamp (the same view the viewer's grouped mode shows).
+    """
+    empty: Dict[str, Any] = {}
+    emissions = [(entry, facts_by_path.get(str(entry.get("path")), empty)) for entry in index_entries]
+    entry_by_id = {str(entry.get("record_id")): entry for entry in index_entries}
+    judgments = []
+    for group in groups:
+        newest = entry_by_id.get(str(group["emissions"][0].get("record_id")))
+        if newest is None:
+            continue
+        representative = dict(newest, timestamp=group.get("last_timestamp") or newest.get("timestamp"))
+        judgments.append((representative, facts_by_path.get(str(newest.get("path")), empty)))
+
+    aggregates_dir = out_dir / "aggregates"
+    for unit, rows in (("emissions", emissions), ("judgments", judgments)):
+        payload = {"generated_at": generated_at, "unit": unit, **_rollups(rows)}
+        _write_json_if_changed(aggregates_dir / f"{unit}.json", payload)
+
+
+def _write_sharded_index(
+    out_dir: Path,
+    generated_at: str,
+    index_entries: List[Dict[str, Any]],
+    groups: List[Dict[str, Any]],
+    shard_size: int,
+    packs: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Write index shards plus the small root ``index.json`` that lists them."""
+    shards = _write_index_shards(out_dir, "records", index_entries, "timestamp", shard_size)
+    shards.extend(_write_index_shards(out_dir, "groups", groups, "last_timestamp", shard_size))
+    shards.sort(key=lambda shard: shard["path"])
+    shards.sort(key=lambda shard: shard["period"], reverse=True)
+
+    _prune_outputs(out_dir / "index", {out_dir.parent / shard["path"] for shard in shards})
+
+    root = {
+        "format_version": INDEX_FORMAT_VERSION,
+        "generated_at": generated_at,
+        "shard_size": shard_size,
+        "record_count": len(index_entries),
+        "group_count": len(groups),
+        "mandates": sorted({str(e["mandate_id"]) for e in index_entries if e.get("mandate_id")}),
+        "periods": sorted({shard["period"] for shard in shards}, reverse=True),
+        "shards": shards,
+        "packs": packs,
+    }
+    with (out_dir / "index.json").open("w", encoding="utf-8") as handle:
+        json.dump(root, handle, sort_keys=True, indent=2)
+    return root
+
+
+def publish_pages_data(
+    in_dir: Path,
+    out_dir: Path,
+    clean: bool = False,
+    include_examples: bool = False,
+    incremental: bool = False,
+    shard_size: int = DEFAULT_INDEX_SHARD_SIZE,
+    pack_size: int = DEFAULT_PACK_SIZE,
+) -> Dict[str, Any]:
+    """Publish YAML records into a JSON snapshot for Pages.
+
+    Records are converted to hidden staging files first and only moved into
+    ``records/`` once every source has loaded and validated, so a malformed
+    record raises without touching the published snapshot.
+
+    Every publish writes ``publish_manifest.json`` mapping each source path to
+    its stat signature, content hash and index entry. With ``incremental``,
+    sources whose stat or content hash match the manifest keep their existing
+    JSON output and only new or changed records are converted.
+
+    ``index.json`` is a small root manifest listing month/mandate index shards
+    under ``index/`` and gzip'd NDJSON record packs under ``packs/``; the
+    returned dict is the full merged index.
+    """
+    if shard_size < 1:
+        raise ValueError("shard_size must be at least 1")
+    if pack_size < 1:
+        raise ValueError("pack_size must be at least 1")
+    input_paths = sorted(in_dir.glob("*.yaml"))
+    if include_examples:
+        examples_dir = Path("examples/judgment_records")
+        if examples_dir.exists():
+            input_paths.extend(sorted(examples_dir.glob("*.yaml")))
+
+    published_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+    records_dir = out_dir / "records"
+    records_dir.mkdir(parents=True, exist_ok=True)
+
+    previous = _load_manifest(out_dir) if incremental and not clean else {}
+    sources: Dict[str, Dict[str, Any]] = {}
+    index_entries: List[Dict[str, Any]] = []
+    converted: List[Path] = []
+    try:
+        for path in input_paths:
+            stat = path.stat()
+            cached = previous.get(path.as_posix())
+            if cached is not None and not (out_dir.parent / str(cached["entry"].get("path"))).exists():
+                cached = None
+
+            if (
+                cached is not None
+                and cached.get("mtime_ns") == stat.st_mtime_ns
+                and cached.get("size") == stat.st_size
+            ):
+                digest = cached["sha256"]
+                entry, facts = cached["entry"], cached["facts"]
+            else:
+                content = path.read_bytes()
+                digest = hashlib.sha256(content).hexdigest()
+                if cached is not None and cached.get("sha256") == digest:
+                    entry, facts = cached["entry"], cached["facts"]
+                else:
+                    converted.append(_record_json_path(out_dir, path))
+                    entry, facts = _publish_record(path, content, out_dir, published_at)
+
+            sources[path.as_posix()] = {
+                "sha256": digest,
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "entry": entry,
+                "facts": facts,
+            }
+            index_entries.append(entry)
+    except BaseException:
+        for json_path in converted:
+            _staged_path(json_path).unlink(missing_ok=True)
+        raise
+
+    # Every source converted cleanly, so move the staged JSON into place.
+    if clean:
+        _prune_outputs(records_dir, [_staged_path(json_path) for json_path in converted])
+    for json_path in converted:
+        _staged_path(json_path).replace(json_path)
+
+    mandate_keys: List[Tuple[str, str]] = []
+    procedure_keys: List[Tuple[str, str]] = []
+    for entry in index_entries:
+        mandate_id = entry.get("mandate_id")
+        mandate_version = entry.get("mandate_version")
+        procedure_id = entry.get("procedure_id")
+        procedure_version = entry.get("procedure_version")
+        if mandate_id and mandate_version is not None:
+            mandate_keys.append((str(mandate_id), str(mandate_version)))
+        if procedure_id and procedure_version:
+            procedure_keys.append((str(procedure_id), str(procedure_version)))
+
+    index_entries.sort(key=lambda entry: entry.get("record_id") or "")
+    index_entries.sort(key=lambda entry: entry.get("timestamp") or "", reverse=True)
     index = {
         "generated_at": published_at,
         "records": index_entries,
-        "groups": groups,
+        "groups": _build_groups(index_entries),
     }
 
     out_dir.mkdir(parents=True, exist_ok=True)
-    index_path = out_dir / "index.json"
-    with index_path.open("w", encoding="utf-8") as handle:
-        json.dump(index, handle, sort_keys=True, indent=2)
+    packs = _write_record_packs(out_dir, index_entries, pack_size)
+    facts_by_path = {str(source["entry"].get("path")): source["facts"] for source in sources.values()}
+    _write_aggregates(out_dir, published_at, index_entries, index["groups"], facts_by_path)
+    _write_sharded_index(out_dir, published_at, index_entries, index["groups"], shard_size, packs)
+
+    manifest_path = out_dir / MANIFEST_NAME
+    with manifest_path.open("w", encoding="utf-8") as handle:
+        json.dump({"version": MANIFEST_VERSION, "sources": sources}, handle, sort_keys=True, indent=2)
 
     authority_sources = _publish_authority_attachments(
         out_dir=out_dir, mandate_keys=mandate_keys, procedure_keys=procedure_keys, clean=clean
@@ -514,6 +918,9 @@ def main() -> int:
         out_dir=out_dir,
         clean=args.clean,
         include_examples=args.include_examples,
+        incremental=args.incremental,
+        shard_size=args.shard_size,
+        pack_size=args.pack_size,
     )
     publish_mandates(site_root=site_root, clean=args.clean)
     print("Published docs/data snapshot + docs/mandates index.")
@@ -0,0 +1,6 @@
+"""Replay an ordered scenario series; see ``buffet.simulation.replay``."""
+
+from buffet.simulation.replay import main
+
+if __name__ == "__main__":
+    raise SystemExit(main())
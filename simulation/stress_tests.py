@@ -0,0 +1,6 @@
+"""Run a stress grid spec; see ``buffet.simulation.stress_tests``."""
+
+from buffet.simulation.stress_tests import main
+
+if __name__ == "__main__":
+    raise SystemExit(main())
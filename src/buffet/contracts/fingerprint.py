@@ -0,0 +1,62 @@
+"""Semantic fingerprints for judgment records."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Dict
+
+
+def canonical_json_bytes(payload: Dict[str, Any]) -> bytes:
+    """Return a deterministic JSON byte representation for hashing."""
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def judgment_identity_payload(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the semantic identity payload for a judgment fingerprint."""
+    authority = record.get("authority") if isinstance(record.get("authority"), dict) else {}
+    invocation = record.get("invocation") if isinstance(record.get("invocation"), dict) else {}
+    confidence = record.get("confidence") if isinstance(record.get("confidence"), dict) else {}
+
+    scenario_id = invocation.get("scenario_id") or invocation.get("scenario")
+    trigger_description = invocation.get("trigger_description") if scenario_id is None else None
+
+    identity: Dict[str, Any] = {
+        "authority": {
+            "mandate_id": authority.get("mandate_id"),
+            "mandate_version": authority.get("mandate_version"),
+            "procedure_id": authority.get("procedure_id"),
+            "procedure_version": authority.get("procedure_version"),
+        },
+        "invocation": {
+            "trigger_type": invocation.get("trigger_type"),
+            "trigger_description": trigger_description,
+            "scenario_id": scenario_id,
+            "persistence_evidence": invocation.get("persistence_evidence"),
+        },
+        "state": record.get("state"),
+        "outcome": record.get("outcome"),
+        "confidence": {
+            "level": confidence.get("level"),
+            "trend": confidence.get("trend"),
+        },
+        "constraints": record.get("constraints"),
+    }
+
+    if "attribution" in confidence:
+        identity["confidence"]["attribution"] = confidence.get("attribution")
+
+    if record.get("adjustment") is not None:
+        identity["adjustment"] = record.get("adjustment")
+    if record.get("inaction") is not None:
+        identity["inaction"] = record.get("inaction")
+    if record.get("escalation") is not None:
+        identity["escalation"] = record.get("escalation")
+
+    return identity
+
+
+def judgment_fingerprint(record: Dict[str, Any]) -> str:
+    """Compute a deterministic SHA-256 fingerprint of a judgment's semantic identity."""
+    identity = judgment_identity_payload(record)
+    return hashlib.sha256(canonical_json_bytes(identity)).hexdigest()
@@ -27,6 +27,7 @@ class JudgmentRecord:
     adjustment: Optional[Dict[str, Any]] = None
     inaction: Optional[Dict[str, Any]] = None
     escalation: Optional[Dict[str, Any]] = None
+    judgment_fingerprint: Optional[str] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Return a serialized dictionary with required fields."""
@@ -49,6 +50,8 @@ class JudgmentRecord:
             data["inaction"] = self.inaction
         if self.escalation is not None:
             data["escalation"] = self.escalation
+        if self.judgment_fingerprint is not None:
+            data["judgment_fingerprint"] = self.judgment_fingerprint
         return data
 
     @staticmethod
@@ -0,0 +1,108 @@
+"""Pluggable byte serializers for judgment records."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
+
+from buffet.contracts.fingerprint import canonical_json_bytes
+from buffet.contracts.judgment_record import JudgmentRecord
+from buffet.utils.yaml_cache import safe_dump_text, safe_load_text
+
+RECORD_FORMATS = ("yaml", "json", "msgpack")
+DEFAULT_RECORD_FORMAT = "yaml"
+
+# Top-level keys in sorted order, computed once rather than sorted per record.
+_SORTED_FIELDS: Tuple[str, ...] = tuple(sorted(field.name for field in fields(JudgmentRecord)))
+
+
+def record_payload(record: JudgmentRecord) -> Dict[str, Any]:
+    """Return the serialized mapping with top-level keys already in sorted order.
+
+    Optional sections that are unset are omitted, as in ``JudgmentRecord.to_dict``.
+    """
+    payload: Dict[str, Any] = {}
+    for name in _SORTED_FIELDS:
+        value = getattr(record, name)
+        if value is not None:
+            payload[name] = value
+    return payload
+
+
+@dataclass(frozen=True)
+class RecordSerializer:
+    """Encode/decode pair for one storage format."""
+
+    name: str
+    suffix: str
+    encode: Callable[[Dict[str, Any]], bytes]
+    decode: Callable[[bytes], Any]
+
+    def dumps(self, record: JudgmentRecord) -> bytes:
+        """Serialize a record to bytes."""
+        return self.encode(record_payload(record))
+
+    def loads(self, payload: bytes) -> JudgmentRecord:
+        """Deserialize and validate a record."""
+        data = self.decode(payload)
+        if not isinstance(data, dict):
+            raise ValueError(f"Serialized {self.name} judgment record is not a mapping")
+        JudgmentRecord.validate_fields(data)
+        return JudgmentRecord(**data)
+
+
+def _yaml_encode(payload: Dict[str, Any]) -> bytes:
+    return safe_dump_text(payload).encode("utf-8")
+
+
+def _yaml_decode(payload: bytes) -> Any:
+    return safe_load_text(payload.decode("utf-8"))
+
+
+def _json_decode(payload: bytes) -> Any:
+    return json.loads(payload)
+
+
+def _msgpack_module() -> Any:
+    try:
+        import msgpack
+    except ImportError as exc:
+        raise ImportError(
+            "The msgpack record format requires the 'msgpack' package (install buffet[msgpack])"
+        ) from exc
+    return msgpack
+
+
+def _msgpack_encode(payload: Dict[str, Any]) -> bytes:
+    return _msgpack_module().packb(payload, use_bin_type=True)
+
+
+def _msgpack_decode(payload: bytes) -> Any:
+    return _msgpack_module().unpackb(payload, raw=False)
+
+
+_SERIALIZERS: Dict[str, RecordSerializer] = {
+    "yaml": RecordSerializer("yaml", ".yaml", _yaml_encode, _yaml_decode),
+    "json": RecordSerializer("json", ".json", canonical_json_bytes, _json_decode),
+    "msgpack": RecordSerializer("msgpack", ".msgpack", _msgpack_encode, _msgpack_decode),
+}
+
+RECORD_SUFFIXES = tuple(serializer.suffix for serializer in _SERIALIZERS.values())
+
+
+def get_serializer(name: str = DEFAULT_RECORD_FORMAT) -> RecordSerializer:
+    """Return the serializer for a format name."""
+    try:
+        return _SERIALIZERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown record format: {name}") from None
+
+
+def serializer_for_path(path: Path) -> RecordSerializer:
+    """Return the serializer matching a record file's suffix."""
+    for serializer in _SERIALIZERS.values():
+        if path.suffix == serializer.suffix:
+            return serializer
+    raise ValueError(f"Unrecognized record file type: {path}")
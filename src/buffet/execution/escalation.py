@@ -9,10 +9,25 @@ from typing import Dict
 import yaml
 
 from buffet.contracts.judgment_record import JudgmentRecord
+from buffet.utils.metrics import observe_escalation, observe_write_failure
+from buffet.utils.timing import stage
 
 
 def route_escalation(record: JudgmentRecord, output_dir: Path) -> Path:
     """Write an escalation stub record for human review."""
+    mandate_id = record.authority.get("mandate_id", "")
+    procedure_id = record.authority.get("procedure_id", "")
+    try:
+        with stage("escalation_routing"):
+            path = _write_escalation(record, output_dir)
+    except OSError as exc:
+        observe_write_failure(mandate_id, procedure_id, "escalation", exc)
+        raise
+    observe_escalation(mandate_id, procedure_id)
+    return path
+
+
+def _write_escalation(record: JudgmentRecord, output_dir: Path) -> Path:
     output_dir.mkdir(parents=True, exist_ok=True)
     timestamp = datetime.fromisoformat(record.timestamp.replace("Z", "+00:00"))
     filename = f"{timestamp.strftime('%Y%m%dT%H%M%SZ')}_{record.record_id}.yaml"
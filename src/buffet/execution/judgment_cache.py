@@ -0,0 +1,227 @@
+"""Memoized judgments keyed by the content of their inputs.
+
+Judging is deterministic: the same mandate, scenario, thresholds and
+procedure version produce the same semantic record. The cache stores that
+payload once and re-issues it on later runs with a fresh ``record_id``,
+``timestamp`` and ``audit.retained_until``, marking ``behavior.cache_hit``.
+
+Entries live in an in-memory LRU, optionally backed by a SQLite file so a
+nightly grid can reuse the previous night's judgments. Both tiers are bounded
+by ``max_entries`` and evict least recently used entries first. Procedure
+logic changes must bump ``procedure_version`` to invalidate cached payloads.
+Records served from memory share their unchanged sections with each other and
+must not be mutated.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from uuid import uuid4
+
+from buffet.contracts.judgment_record import JudgmentRecord
+from buffet.mandates.loader import Mandate
+from buffet.procedures.rate_regime_adjustment import ProcedureThresholds, RateRegimeAdjustmentProcedure
+from buffet.sensing.batch import ScenarioRow
+from buffet.sensing.scenario import ScenarioInput
+from buffet.utils.time import retained_until_date, utc_now_iso
+
+DEFAULT_MAX_ENTRIES = 100_000
+_VOLATILE_FIELDS = ("record_id", "timestamp")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS judgments (
+    cache_key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    last_used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_judgments_last_used ON judgments(last_used);
+"""
+
+
+@dataclass
+class JudgmentCacheStats:
+    """Hit/miss/eviction counters for a judgment cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+def _content_digest(payload: Any) -> str:
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class JudgmentCache:
+    """Size-bounded LRU of judgment payloads with an optional SQLite tier."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, db_path: Optional[Path] = None) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.stats = JudgmentCacheStats()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Digests are memoized by object identity; the tuple keeps the object
+        # alive so its id cannot be reused by a different input.
+        self._digests: Dict[int, Tuple[Any, str]] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._clock = 0
+        self._stored = 0
+        if db_path is not None:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(db_path), timeout=30.0)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            self._clock, self._stored = self._conn.execute(
+                "SELECT COALESCE(MAX(last_used), 0), COUNT(*) FROM judgments"
+            ).fetchone()
+
+    def _digest(self, value: Any) -> str:
+        cached = self._digests.get(id(value))
+        if cached is not None and cached[0] is value:
+            return cached[1]
+        if isinstance(value, Mandate):
+            payload = value.raw
+        elif isinstance(value, ScenarioRow):
+            payload = asdict(value.to_scenario())
+        else:
+            payload = asdict(value)
+        digest = _content_digest(payload)
+        if len(self._digests) >= self.max_entries:
+            self._digests.clear()
+        self._digests[id(value)] = (value, digest)
+        return digest
+
+    def key(
+        self,
+        procedure: RateRegimeAdjustmentProcedure,
+        mandate: Mandate,
+        scenario: ScenarioInput,
+        thresholds: ProcedureThresholds,
+    ) -> str:
+        """Return the content-addressed cache key for one judgment's inputs."""
+        parts = "\0".join(
+            (
+                procedure.procedure_id,
+                procedure.procedure_version,
+                self._digest(mandate),
+                self._digest(scenario),
+                self._digest(thresholds),
+            )
+        )
+        return hashlib.sha256(parts.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, mandate: Mandate) -> Optional[JudgmentRecord]:
+        """Return a freshly stamped record for a cached key, or None on a miss."""
+        payload = self._entries.get(key)
+        if payload is not None:
+            self._entries.move_to_end(key)
+        elif self._conn is not None:
+            row = self._conn.execute("SELECT payload FROM judgments WHERE cache_key = ?", (key,)).fetchone()
+            if row is not None:
+                payload = json.loads(row[0])
+                self._remember(key, payload)
+        if payload is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        if self._conn is not None:
+            self._clock += 1
+            self._conn.execute("UPDATE judgments SET last_used = ? WHERE cache_key = ?", (self._clock, key))
+
+        data = dict(payload)
+        data["behavior"] = dict(payload["behavior"], cache_hit=True)
+        data["audit"] = dict(payload["audit"], retained_until=retained_until_date(mandate.retention_years))
+        return JudgmentRecord(record_id=str(uuid4()), timestamp=utc_now_iso(), **data)
+
+    def put(self, key: str, record: JudgmentRecord) -> None:
+        """Store the semantic payload of a freshly judged record."""
+        data = record.to_dict()
+        for name in _VOLATILE_FIELDS:
+            data.pop(name, None)
+        data["behavior"] = dict(data["behavior"], decision_latency_ms=0)
+        data["behavior"].pop("cache_hit", None)
+        data["behavior"].pop("timings_ns", None)
+        encoded = json.dumps(data, sort_keys=True, separators=(",", ":"))
+        # Round-trip so the cached payload shares nothing with the caller's record.
+        self._remember(key, json.loads(encoded))
+        if self._conn is None:
+            return
+        self._clock += 1
+        inserted = self._conn.execute(
+            "INSERT OR IGNORE INTO judgments (cache_key, payload, last_used) VALUES (?, ?, ?)",
+            (key, encoded, self._clock),
+        ).rowcount
+        if not inserted:
+            # Re-storing a key (e.g. duplicate-content pairs) replaces the row without growing the table.
+            self._conn.execute(
+                "UPDATE judgments SET payload = ?, last_used = ? WHERE cache_key = ?",
+                (encoded, self._clock, key),
+            )
+            return
+        self._stored += 1
+        overflow = self._stored - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM judgments WHERE cache_key IN "
+                "(SELECT cache_key FROM judgments ORDER BY last_used LIMIT ?)",
+                (overflow,),
+            )
+            self._stored -= overflow
+            self.stats.evictions += overflow
+
+    def _remember(self, key: str, payload: Dict[str, Any]) -> None:
+        self._entries[key] = payload
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            if self._conn is None:
+                self.stats.evictions += 1
+
+    def judge(
+        self,
+        procedure: RateRegimeAdjustmentProcedure,
+        mandate: Mandate,
+        scenario: ScenarioInput,
+        thresholds: ProcedureThresholds,
+    ) -> JudgmentRecord:
+        """Return the cached judgment for these inputs, judging and storing it on a miss."""
+        key = self.key(procedure, mandate, scenario, thresholds)
+        record = self.get(key, mandate)
+        if record is not None:
+            return record
+        record = mark_cache_miss(procedure.judge(mandate, scenario, thresholds, decision_latency_ms=0))
+        self.put(key, record)
+        return record
+
+    def commit(self) -> None:
+        """Flush pending SQLite writes."""
+        if self._conn is not None:
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Commit and close the SQLite tier, if any."""
+        if self._conn is None:
+            return
+        self._conn.commit()
+        self._conn.close()
+        self._conn = None
+
+    def __enter__(self) -> "JudgmentCache":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def mark_cache_miss(record: JudgmentRecord) -> JudgmentRecord:
+    """Return a copy of a freshly judged record flagged ``behavior.cache_hit = False``."""
+    return replace(record, behavior=dict(record.behavior, cache_hit=False))
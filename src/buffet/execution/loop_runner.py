@@ -4,18 +4,69 @@ from __future__ import annotations
 
 from dataclasses import replace
 from pathlib import Path
-from time import perf_counter
-from typing import Tuple
+from time import perf_counter_ns
+from typing import Optional, Tuple
 
 from buffet.contracts.judgment_record import JudgmentRecord
 from buffet.execution.escalation import route_escalation
+from buffet.execution.judgment_cache import JudgmentCache
 from buffet.execution.memory import write_judgment_record
-from buffet.mandates.loader import load_mandate
+from buffet.execution.record_index import RecordIndex
+from buffet.mandates.loader import Mandate, load_mandate
 from buffet.procedures.rate_regime_adjustment import (
+    ProcedureThresholds,
     RateRegimeAdjustmentProcedure,
     load_thresholds,
 )
-from buffet.sensing.scenario import load_scenario
+from buffet.sensing.scenario import ScenarioInput, load_scenario
+from buffet.utils.metrics import observe_judgment
+from buffet.utils.timing import add_timing, collect_timings
+
+
+def judge_with_latency(
+    procedure: RateRegimeAdjustmentProcedure,
+    mandate: Mandate,
+    scenario: ScenarioInput,
+    thresholds: ProcedureThresholds,
+    cache: Optional[JudgmentCache] = None,
+) -> JudgmentRecord:
+    """Run the procedure and stamp the measured decision latency on the record.
+
+    With a ``cache``, unchanged inputs reuse the memoized judgment. When stage
+    timings are enabled the record also gets ``behavior.timings_ns``. Every
+    call updates the runtime metrics in ``buffet.utils.metrics``.
+    """
+    with collect_timings() as timings:
+        start = perf_counter_ns()
+        if cache is not None:
+            record = cache.judge(procedure, mandate, scenario, thresholds)
+        else:
+            record = procedure.judge(
+                mandate,
+                scenario,
+                thresholds,
+                decision_latency_ms=0,
+            )
+        elapsed_ns = perf_counter_ns() - start
+        add_timing("judge", elapsed_ns)
+    behavior = dict(record.behavior)
+    behavior["decision_latency_ms"] = elapsed_ns // 1_000_000
+    if timings is not None:
+        behavior["timings_ns"] = dict(timings)
+    record = replace(record, behavior=behavior)
+    observe_record(record, elapsed_ns)
+    return record
+
+
+def observe_record(record: JudgmentRecord, latency_ns: int) -> None:
+    """Count a finished judgment in the runtime metrics, labelled from its authority block."""
+    observe_judgment(
+        record.authority.get("mandate_id", ""),
+        record.authority.get("procedure_id", ""),
+        str(record.outcome.get("type")),
+        latency_ns,
+        record.behavior.get("cache_hit"),
+    )
 
 
 def run_judgment_loop(
@@ -24,26 +75,29 @@ def run_judgment_loop(
     thresholds_path: Path,
     records_dir: Path,
     escalations_dir: Path,
+    index: Optional[RecordIndex] = None,
+    cache: Optional[JudgmentCache] = None,
 ) -> Tuple[JudgmentRecord, Path]:
-    """Run a single judgment loop and persist its record."""
-    mandate = load_mandate(mandate_path)
-    scenario = load_scenario(scenario_path)
-    thresholds = load_thresholds(thresholds_path)
-
-    procedure = RateRegimeAdjustmentProcedure()
-    start = perf_counter()
-    record = procedure.judge(
-        mandate,
-        scenario,
-        thresholds,
-        decision_latency_ms=0,
-    )
-    elapsed_ms = int((perf_counter() - start) * 1000)
-    behavior = dict(record.behavior)
-    behavior["decision_latency_ms"] = elapsed_ms
-    record = replace(record, behavior=behavior)
+    """Run a single judgment loop and persist its record.
+
+    With stage timings enabled, the record's ``timings_ns`` also covers loading
+    the mandate and scenario; serialization, write and escalation routing
+    happen after the record is final and only reach the histograms.
+    """
+    with collect_timings():
+        mandate = load_mandate(mandate_path)
+        scenario = load_scenario(scenario_path)
+        thresholds = load_thresholds(thresholds_path)
+
+        procedure = RateRegimeAdjustmentProcedure()
+        record = judge_with_latency(procedure, mandate, scenario, thresholds, cache=cache)
+    if cache is not None:
+        cache.commit()
 
     record_path = write_judgment_record(record, records_dir)
+    if index is not None:
+        index.add(record, str(record_path))
+        index.commit()
     if record.escalation is not None:
         route_escalation(record, escalations_dir)
 
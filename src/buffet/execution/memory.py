@@ -2,30 +2,276 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+import re
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict
-
-import yaml
+from typing import Any, Dict, Iterator, KeysView, List, Optional, Protocol, Tuple
 
 from buffet.contracts.judgment_record import JudgmentRecord
+from buffet.contracts.serialization import RECORD_FORMATS, RECORD_SUFFIXES, RecordSerializer, get_serializer
+from buffet.utils.metrics import observe_write_failure
+from buffet.utils.timing import stage
+from buffet.utils.yaml_cache import safe_load_text
+
+_SECTION_START = re.compile(r"^([A-Za-z_][A-Za-z0-9_]*):(?:[ \t]|$)", re.MULTILINE)
+_RECORD_FILENAME = re.compile(r"^(\d{8}T\d{6}Z)_")
+
+
+def _parse_utc(iso_timestamp: str) -> datetime:
+    """Parse an ISO-8601 timestamp or date as an aware UTC datetime (naive values are taken as UTC)."""
+    parsed = datetime.fromisoformat(iso_timestamp.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
 
 
 def _compact_timestamp(iso_timestamp: str) -> str:
-    """Convert ISO-8601 timestamp to compact form for filenames."""
-    normalized = iso_timestamp.replace("Z", "+00:00")
-    parsed = datetime.fromisoformat(normalized)
-    return parsed.strftime("%Y%m%dT%H%M%SZ")
+    """Convert ISO-8601 timestamp to compact UTC form for filenames."""
+    return _parse_utc(iso_timestamp).strftime("%Y%m%dT%H%M%SZ")
 
 
-def write_judgment_record(record: JudgmentRecord, output_dir: Path) -> Path:
-    """Write a judgment record in append-only mode."""
+def write_judgment_record(
+    record: JudgmentRecord,
+    output_dir: Path,
+    serializer: Optional[RecordSerializer] = None,
+) -> Path:
+    """Write a judgment record in append-only mode (YAML unless another serializer is given)."""
+    serializer = serializer or get_serializer()
     output_dir.mkdir(parents=True, exist_ok=True)
-    filename = f"{_compact_timestamp(record.timestamp)}_{record.record_id}.yaml"
+    filename = f"{_compact_timestamp(record.timestamp)}_{record.record_id}{serializer.suffix}"
     path = output_dir / filename
-    if path.exists():
-        raise FileExistsError(f"Judgment record already exists: {path}")
-    payload: Dict[str, object] = record.to_dict()
-    with path.open("w", encoding="utf-8") as handle:
-        yaml.safe_dump(payload, handle, sort_keys=True)
+    try:
+        if path.exists():
+            raise FileExistsError(f"Judgment record already exists: {path}")
+        with stage("serialization"):
+            payload = serializer.dumps(record)
+        with stage("write"), path.open("wb") as handle:
+            handle.write(payload)
+    except OSError as exc:
+        observe_write_failure(
+            record.authority.get("mandate_id", ""), record.authority.get("procedure_id", ""), "record", exc
+        )
+        raise
     return path
+
+
+class RecordView:
+    """Read-only view of a YAML judgment record that decodes sections on access.
+
+    Records are written with sorted top-level keys, one block per key, so the
+    text is split into per-key slices up front and each slice is parsed only
+    when that key is first read. Header lookups (timestamp, authority, outcome)
+    therefore never touch the much larger ``state`` and ``behavior`` blocks.
+    """
+
+    __slots__ = ("path", "_text", "_spans", "_decoded")
+
+    def __init__(self, path: Path, text: str) -> None:
+        self.path = path
+        self._text = text
+        self._spans: Dict[str, Tuple[int, int]] = {}
+        self._decoded: Dict[str, Any] = {}
+        starts = [(match.group(1), match.start()) for match in _SECTION_START.finditer(text)]
+        for index, (key, start) in enumerate(starts):
+            end = starts[index + 1][1] if index + 1 < len(starts) else len(text)
+            self._spans[key] = (start, end)
+
+    def keys(self) -> KeysView[str]:
+        """Return top-level keys without decoding any section."""
+        return self._spans.keys()
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._spans
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._decoded:
+            start, end = self._spans[key]
+            section = safe_load_text(self._text[start:end])
+            if not isinstance(section, dict) or key not in section:
+                raise ValueError(f"Record {self.path} has an unreadable {key!r} section")
+            self._decoded[key] = section[key]
+        return self._decoded[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a decoded section, or ``default`` when the record lacks it."""
+        return self[key] if key in self._spans else default
+
+    def _header(self, section: str, field: str) -> Any:
+        value = self.get(section)
+        return value.get(field) if isinstance(value, dict) else None
+
+    @property
+    def record_id(self) -> Optional[str]:
+        return self.get("record_id")
+
+    @property
+    def timestamp(self) -> Optional[str]:
+        value = self.get("timestamp")
+        return None if value is None else str(value)
+
+    @property
+    def mandate_id(self) -> Optional[str]:
+        return self._header("authority", "mandate_id")
+
+    @property
+    def procedure_id(self) -> Optional[str]:
+        return self._header("authority", "procedure_id")
+
+    @property
+    def outcome_type(self) -> Optional[str]:
+        return self._header("outcome", "type")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Decode the whole record."""
+        if not self._decoded:
+            data = safe_load_text(self._text)
+            if not isinstance(data, dict):
+                raise ValueError(f"Record {self.path} is invalid")
+            return data
+        return {key: self[key] for key in self._spans}
+
+
+def load_record_view(path: Path) -> RecordView:
+    """Open a lazily decoded view of one YAML judgment record."""
+    return RecordView(path, path.read_text(encoding="utf-8"))
+
+
+def _parse_bound(name: str, value: Optional[str]) -> Optional[datetime]:
+    """Parse a ``since``/``until`` bound, rejecting values that are not ISO-8601."""
+    if value is None:
+        return None
+    try:
+        return _parse_utc(value)
+    except ValueError:
+        raise ValueError(f"Invalid {name} bound (expected an ISO-8601 timestamp or date): {value!r}") from None
+
+
+def _view_time(view: RecordView) -> Optional[datetime]:
+    timestamp = view.timestamp
+    if timestamp is None:
+        return None
+    try:
+        return _parse_utc(timestamp)
+    except ValueError:
+        return None
+
+
+def _reject_other_layouts(records_dir: Path) -> None:
+    """Raise if ``records_dir`` holds records that the YAML view reader would silently skip."""
+    from buffet.execution.record_log import list_segments
+
+    if list_segments(records_dir):
+        raise ValueError(
+            f"{records_dir} holds a segmented record log; export it to YAML with "
+            "`python -m buffet.execution.record_log` before reading record views"
+        )
+    for suffix in RECORD_SUFFIXES:
+        if suffix != ".yaml" and next(records_dir.glob(f"*{suffix}"), None) is not None:
+            raise ValueError(f"{records_dir} holds {suffix} records; record views only read the YAML layout")
+
+
+def iter_record_views(
+    records_dir: Path,
+    mandate_id: Optional[str] = None,
+    outcome_type: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    newest_first: bool = False,
+) -> Iterator[RecordView]:
+    """Stream matching records from a YAML record directory one view at a time.
+
+    Predicates are applied as early as possible: the time range against the
+    timestamp in each filename before the file is opened, then mandate,
+    outcome and exact timestamp against the cheap header sections.
+    ``since``/``until`` are ISO-8601 timestamps or dates (inclusive/exclusive);
+    both bounds and record timestamps are compared as UTC instants, with
+    values lacking an offset taken as UTC. Records without a parseable
+    timestamp never match a time bound. Nothing is retained between views, so
+    memory stays flat.
+
+    Only the YAML layout is supported: a directory holding JSON, msgpack or
+    segmented-log records raises ValueError rather than yielding nothing.
+    """
+    since_time = _parse_bound("since", since)
+    until_time = _parse_bound("until", until)
+    since_compact = None if since_time is None else since_time.strftime("%Y%m%dT%H%M%SZ")
+    until_compact = None if until_time is None else until_time.strftime("%Y%m%dT%H%M%SZ")
+    _reject_other_layouts(records_dir)
+    paths: List[Path] = sorted(records_dir.glob("*.yaml"), reverse=newest_first)
+    for path in paths:
+        match = _RECORD_FILENAME.match(path.name)
+        if match is not None:
+            stamp = match.group(1)
+            if since_compact is not None and stamp < since_compact:
+                continue
+            if until_compact is not None and stamp > until_compact:
+                continue
+
+        view = load_record_view(path)
+        if mandate_id is not None and view.mandate_id != mandate_id:
+            continue
+        if outcome_type is not None and view.outcome_type != outcome_type:
+            continue
+        if since_time is not None or until_time is not None:
+            moment = _view_time(view)
+            if moment is None:
+                continue
+            if since_time is not None and moment < since_time:
+                continue
+            if until_time is not None and moment >= until_time:
+                continue
+        yield view
+
+
+class RecordStore(Protocol):
+    """Append-only destination for judgment records."""
+
+    def append(self, record: JudgmentRecord) -> str:
+        """Persist a record and return a location string for it."""
+        ...
+
+    def close(self) -> None:
+        """Flush and release any resources held by the store."""
+        ...
+
+
+class DirectoryRecordStore:
+    """Record store writing one file per record in a configurable format."""
+
+    def __init__(self, output_dir: Path, record_format: str = "yaml") -> None:
+        self.output_dir = output_dir
+        self.serializer = get_serializer(record_format)
+
+    def append(self, record: JudgmentRecord) -> str:
+        """Write the record as its own file."""
+        return str(write_judgment_record(record, self.output_dir, self.serializer))
+
+    def close(self) -> None:
+        """Nothing to release; each record is written and closed immediately."""
+
+    def __enter__(self) -> "DirectoryRecordStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class YamlDirectoryStore(DirectoryRecordStore):
+    """Record store writing one YAML file per record (the default layout)."""
+
+    def __init__(self, output_dir: Path) -> None:
+        super().__init__(output_dir, "yaml")
+
+
+RECORD_STORE_KINDS = RECORD_FORMATS + ("segments",)
+
+
+def open_record_store(kind: str, output_dir: Path) -> RecordStore:
+    """Open a record store backend by name: a per-record file format or ``segments``."""
+    if kind in RECORD_FORMATS:
+        return DirectoryRecordStore(output_dir, kind)
+    if kind == "segments":
+        from buffet.execution.record_log import SegmentedRecordLog
+
+        return SegmentedRecordLog(output_dir)
+    raise ValueError(f"Unknown record store: {kind}")
@@ -0,0 +1,215 @@
+"""Asyncio judgment pipeline with bounded queues between stages.
+
+Stages run concurrently and hand work over through bounded queues, so a slow
+stage applies backpressure upstream instead of buffering without limit:
+
+1. ingestion pulls scenarios from a sync or async source;
+2. judge workers cross each scenario with every mandate, offloading the
+   procedure to an executor;
+3. a single writer appends records to the store (keeping its single-writer
+   guarantee) and tallies outcomes;
+4. the escalation router writes escalation notices.
+
+A slow escalation filesystem only stalls judging once the escalation queue is
+full. ``stop()`` ends ingestion; everything already queued is drained before
+``run`` returns. A failing stage cancels the others and its error propagates.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from concurrent.futures import Executor
+from pathlib import Path
+from time import perf_counter
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, Optional, Sequence, Union
+
+from buffet.contracts.judgment_record import JudgmentRecord
+from buffet.execution.escalation import route_escalation
+from buffet.execution.loop_runner import judge_with_latency
+from buffet.execution.memory import RecordStore
+from buffet.execution.run_batch import BatchSummary
+from buffet.mandates.loader import Mandate
+from buffet.procedures.rate_regime_adjustment import ProcedureThresholds, RateRegimeAdjustmentProcedure
+from buffet.sensing.scenario import ScenarioInput, load_scenario, parse_scenario
+
+DEFAULT_QUEUE_SIZE = 256
+DEFAULT_JUDGE_WORKERS = 4
+
+ScenarioSource = Union[Iterable[ScenarioInput], AsyncIterable[ScenarioInput]]
+
+# Marks the end of a stream on every queue.
+_DONE = None
+
+
+async def aiter_scenario_files(paths: Iterable[Path]) -> AsyncIterator[ScenarioInput]:
+    """Yield scenarios from YAML files, reading each off the event loop."""
+    loop = asyncio.get_running_loop()
+    for path in paths:
+        yield await loop.run_in_executor(None, load_scenario, path)
+
+
+async def aiter_ndjson_scenarios(reader: asyncio.StreamReader) -> AsyncIterator[ScenarioInput]:
+    """Yield scenarios from a live NDJSON stream, one JSON object per line."""
+    line_number = 0
+    while True:
+        line = await reader.readline()
+        if not line:
+            return
+        line_number += 1
+        if line.strip():
+            yield parse_scenario(json.loads(line), default_id=f"line_{line_number}")
+
+
+class JudgmentPipeline:
+    """Ingest → judge → write → route escalations, connected by bounded queues."""
+
+    def __init__(
+        self,
+        mandates: Sequence[Mandate],
+        thresholds: ProcedureThresholds,
+        store: RecordStore,
+        escalations_dir: Path,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        judge_workers: int = DEFAULT_JUDGE_WORKERS,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        if queue_size < 1:
+            raise ValueError("queue_size must be at least 1")
+        if judge_workers < 1:
+            raise ValueError("judge_workers must be at least 1")
+        self.mandates = list(mandates)
+        self.thresholds = thresholds
+        self.store = store
+        self.escalations_dir = escalations_dir
+        self.queue_size = queue_size
+        self.judge_workers = judge_workers
+        self.executor = executor
+        self._stopping = asyncio.Event()
+        self._scenarios = 0
+        self._judgments = 0
+        self._escalations = 0
+        self._outcome_counts: Dict[str, int] = {}
+
+    def stop(self) -> None:
+        """Stop ingesting new scenarios; queued work still drains.
+
+        Call from the event loop thread (e.g. via ``loop.add_signal_handler``).
+        """
+        self._stopping.set()
+
+    async def run(self, source: ScenarioSource) -> BatchSummary:
+        """Run every stage to completion and return counts for the run."""
+        start = perf_counter()
+        scenario_queue: asyncio.Queue[Optional[ScenarioInput]] = asyncio.Queue(self.queue_size)
+        record_queue: asyncio.Queue[Optional[JudgmentRecord]] = asyncio.Queue(self.queue_size)
+        escalation_queue: asyncio.Queue[Optional[JudgmentRecord]] = asyncio.Queue(self.queue_size)
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(self._ingest(source, scenario_queue))
+                group.create_task(self._judge_stage(scenario_queue, record_queue))
+                group.create_task(self._write(record_queue, escalation_queue))
+                group.create_task(self._route(escalation_queue))
+        except ExceptionGroup as errors:
+            # Surface a lone stage failure as itself rather than as a group.
+            if len(errors.exceptions) == 1:
+                raise errors.exceptions[0] from None
+            raise
+
+        return BatchSummary(
+            mandates=len(self.mandates),
+            scenarios=self._scenarios,
+            judgments=self._judgments,
+            escalations=self._escalations,
+            elapsed_seconds=perf_counter() - start,
+            outcome_counts=dict(self._outcome_counts),
+        )
+
+    async def _ingest(self, source: ScenarioSource, out: asyncio.Queue) -> None:
+        if isinstance(source, AsyncIterable):
+            await self._ingest_async(source, out)
+        else:
+            # Plain iterables are pulled on the event loop; wrap blocking
+            # sources with aiter_scenario_files or an async generator.
+            for scenario in source:
+                if self._stopping.is_set():
+                    break
+                await self._put_scenario(scenario, out)
+        for _ in range(self.judge_workers):
+            await out.put(_DONE)
+
+    async def _ingest_async(self, source: AsyncIterable[ScenarioInput], out: asyncio.Queue) -> None:
+        # Race each pull against stop() so an idle live source cannot block shutdown.
+        iterator = source.__aiter__()
+        stopped = asyncio.ensure_future(self._stopping.wait())
+        try:
+            while not stopped.done():
+                pulled = asyncio.ensure_future(iterator.__anext__())
+                await asyncio.wait({pulled, stopped}, return_when=asyncio.FIRST_COMPLETED)
+                if not pulled.done():
+                    pulled.cancel()
+                    return
+                try:
+                    scenario = pulled.result()
+                except StopAsyncIteration:
+                    return
+                await self._put_scenario(scenario, out)
+        finally:
+            stopped.cancel()
+
+    async def _put_scenario(self, scenario: ScenarioInput, out: asyncio.Queue) -> None:
+        self._scenarios += 1
+        await out.put(scenario)
+
+    async def _judge_stage(self, scenarios: asyncio.Queue, out: asyncio.Queue) -> None:
+        await asyncio.gather(*(self._judge(scenarios, out) for _ in range(self.judge_workers)))
+        await out.put(_DONE)
+
+    async def _judge(self, scenarios: asyncio.Queue, out: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        procedure = RateRegimeAdjustmentProcedure()
+        while (scenario := await scenarios.get()) is not _DONE:
+            for mandate in self.mandates:
+                record = await loop.run_in_executor(
+                    self.executor, judge_with_latency, procedure, mandate, scenario, self.thresholds
+                )
+                await out.put(record)
+
+    async def _write(self, records: asyncio.Queue, out: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while (record := await records.get()) is not _DONE:
+            await loop.run_in_executor(None, self.store.append, record)
+            outcome_type = str(record.outcome.get("type"))
+            self._outcome_counts[outcome_type] = self._outcome_counts.get(outcome_type, 0) + 1
+            self._judgments += 1
+            if record.escalation is not None:
+                await out.put(record)
+        await out.put(_DONE)
+
+    async def _route(self, records: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while (record := await records.get()) is not _DONE:
+            await loop.run_in_executor(None, route_escalation, record, self.escalations_dir)
+            self._escalations += 1
+
+
+def run_pipeline(
+    mandates: Sequence[Mandate],
+    source: ScenarioSource,
+    thresholds: ProcedureThresholds,
+    store: RecordStore,
+    escalations_dir: Path,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    judge_workers: int = DEFAULT_JUDGE_WORKERS,
+) -> BatchSummary:
+    """Run a pipeline to completion from synchronous code."""
+    pipeline = JudgmentPipeline(
+        mandates,
+        thresholds,
+        store,
+        escalations_dir,
+        queue_size=queue_size,
+        judge_workers=judge_workers,
+    )
+    return asyncio.run(pipeline.run(source))
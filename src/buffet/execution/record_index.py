@@ -0,0 +1,427 @@
+"""SQLite index over judgment records for fast metadata queries."""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from buffet.contracts.fingerprint import judgment_fingerprint
+from buffet.contracts.judgment_record import JudgmentRecord
+from buffet.contracts.serialization import RECORD_SUFFIXES, serializer_for_path
+from buffet.execution.memory import RecordStore
+
+DEFAULT_INDEX_PATH = Path("data/processed/judgment_index.sqlite")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    record_id TEXT PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    mandate_id TEXT,
+    mandate_version TEXT,
+    procedure_id TEXT,
+    procedure_version TEXT,
+    outcome_type TEXT,
+    confidence_level REAL,
+    escalated INTEGER NOT NULL,
+    fingerprint TEXT,
+    location TEXT
+);
+CREATE INDEX IF NOT EXISTS records_timestamp ON records (timestamp);
+CREATE INDEX IF NOT EXISTS records_mandate ON records (mandate_id, timestamp);
+CREATE INDEX IF NOT EXISTS records_procedure ON records (procedure_id, timestamp);
+CREATE INDEX IF NOT EXISTS records_outcome ON records (outcome_type, timestamp);
+CREATE INDEX IF NOT EXISTS records_escalated ON records (escalated, timestamp);
+CREATE INDEX IF NOT EXISTS records_fingerprint ON records (fingerprint);
+CREATE TABLE IF NOT EXISTS fingerprints (
+    fingerprint TEXT PRIMARY KEY,
+    first_record_id TEXT NOT NULL,
+    first_timestamp TEXT NOT NULL,
+    last_record_id TEXT NOT NULL,
+    last_timestamp TEXT NOT NULL,
+    emissions INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS fingerprints_first ON fingerprints (first_timestamp);
+CREATE INDEX IF NOT EXISTS fingerprints_last ON fingerprints (last_timestamp);
+"""
+
+# All SET expressions read the pre-update row, so first/last ids move together
+# with their timestamps.
+_UPSERT_FINGERPRINT = """
+INSERT INTO fingerprints
+    (fingerprint, first_record_id, first_timestamp, last_record_id, last_timestamp, emissions)
+VALUES (?, ?, ?, ?, ?, 1)
+ON CONFLICT (fingerprint) DO UPDATE SET
+    first_record_id = CASE WHEN excluded.first_timestamp < first_timestamp
+        THEN excluded.first_record_id ELSE first_record_id END,
+    first_timestamp = MIN(first_timestamp, excluded.first_timestamp),
+    last_record_id = CASE WHEN excluded.last_timestamp >= last_timestamp
+        THEN excluded.last_record_id ELSE last_record_id END,
+    last_timestamp = MAX(last_timestamp, excluded.last_timestamp),
+    emissions = emissions + 1
+"""
+
+_REBUILD_FINGERPRINTS = """
+INSERT INTO fingerprints
+    (fingerprint, first_record_id, first_timestamp, last_record_id, last_timestamp, emissions)
+SELECT
+    fingerprint,
+    (SELECT r.record_id FROM records r WHERE r.fingerprint = g.fingerprint
+        ORDER BY r.timestamp ASC, r.record_id ASC LIMIT 1),
+    MIN(timestamp),
+    (SELECT r.record_id FROM records r WHERE r.fingerprint = g.fingerprint
+        ORDER BY r.timestamp DESC, r.record_id DESC LIMIT 1),
+    MAX(timestamp),
+    COUNT(*)
+FROM records g
+WHERE fingerprint IS NOT NULL
+GROUP BY fingerprint
+"""
+
+_COLUMNS = (
+    "record_id",
+    "timestamp",
+    "mandate_id",
+    "mandate_version",
+    "procedure_id",
+    "procedure_version",
+    "outcome_type",
+    "confidence_level",
+    "escalated",
+    "fingerprint",
+    "location",
+)
+
+
+@dataclass(frozen=True)
+class IndexedRecord:
+    """One row of the judgment record index."""
+
+    record_id: str
+    timestamp: str
+    mandate_id: Optional[str]
+    mandate_version: Optional[str]
+    procedure_id: Optional[str]
+    procedure_version: Optional[str]
+    outcome_type: Optional[str]
+    confidence_level: Optional[float]
+    escalated: bool
+    fingerprint: Optional[str]
+    location: Optional[str]
+
+
+@dataclass(frozen=True)
+class FingerprintEmissions:
+    """First and last emission of one judgment fingerprint."""
+
+    fingerprint: str
+    first_record_id: str
+    first_timestamp: str
+    last_record_id: str
+    last_timestamp: str
+    emissions: int
+
+
+_FINGERPRINT_COLUMNS = tuple(field.name for field in fields(FingerprintEmissions))
+
+
+def _optional_str(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def index_row(data: Dict[str, Any], location: Optional[str]) -> Tuple[Any, ...]:
+    """Extract index columns from a serialized record."""
+    authority = data.get("authority") if isinstance(data.get("authority"), dict) else {}
+    outcome = data.get("outcome") if isinstance(data.get("outcome"), dict) else {}
+    confidence = data.get("confidence") if isinstance(data.get("confidence"), dict) else {}
+    behavior = data.get("behavior") if isinstance(data.get("behavior"), dict) else {}
+    level = confidence.get("level")
+    return (
+        str(data.get("record_id")),
+        str(data.get("timestamp")),
+        _optional_str(authority.get("mandate_id")),
+        _optional_str(authority.get("mandate_version")),
+        _optional_str(authority.get("procedure_id")),
+        _optional_str(authority.get("procedure_version")),
+        _optional_str(outcome.get("type")),
+        None if level is None else float(level),
+        int(bool(behavior.get("escalated", outcome.get("type") == "escalate"))),
+        data.get("judgment_fingerprint") or judgment_fingerprint(data),
+        location,
+    )
+
+
+def _from_row(row: Tuple[Any, ...]) -> IndexedRecord:
+    values = dict(zip(_COLUMNS, row))
+    values["escalated"] = bool(values["escalated"])
+    return IndexedRecord(**values)
+
+
+class RecordIndex:
+    """Queryable SQLite index of record metadata."""
+
+    def __init__(
+        self, db_path: Path = DEFAULT_INDEX_PATH, commit_every: int = 500, check_same_thread: bool = True
+    ) -> None:
+        """Open (or create) the index.
+
+        Pass ``check_same_thread=False`` to use the index from several threads;
+        the caller must then serialize access itself.
+        """
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self.commit_every = commit_every
+        self._pending = 0
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=check_same_thread)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def add(self, record: JudgmentRecord, location: Optional[str] = None) -> None:
+        """Index a freshly written record; duplicate record_ids are rejected."""
+        self.add_dict(record.to_dict(), location)
+
+    def add_dict(self, data: Dict[str, Any], location: Optional[str] = None, replace: bool = False) -> None:
+        """Index a serialized record.
+
+        New records also update the fingerprint emission table. ``replace``
+        is for backfills, which refresh that table via ``rebuild_fingerprints``.
+        """
+        verb = "INSERT OR REPLACE" if replace else "INSERT"
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        row = index_row(data, location)
+        try:
+            self._conn.execute(
+                f"{verb} INTO records ({', '.join(_COLUMNS)}) VALUES ({placeholders})",
+                row,
+            )
+        except sqlite3.IntegrityError as exc:
+            raise FileExistsError(f"Judgment record already indexed: {data.get('record_id')}") from exc
+        values = dict(zip(_COLUMNS, row))
+        if not replace and values["fingerprint"]:
+            record_id, timestamp = values["record_id"], values["timestamp"]
+            self._conn.execute(
+                _UPSERT_FINGERPRINT, (values["fingerprint"], record_id, timestamp, record_id, timestamp)
+            )
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self.commit()
+
+    def commit(self) -> None:
+        """Commit pending index rows."""
+        self._conn.commit()
+        self._pending = 0
+
+    def query(
+        self,
+        mandate_id: Optional[str] = None,
+        procedure_id: Optional[str] = None,
+        outcome_type: Optional[str] = None,
+        escalated: Optional[bool] = None,
+        fingerprint: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[IndexedRecord]:
+        """Return matching rows, newest first.
+
+        ``since``/``until`` compare against ISO-8601 timestamps, so a bare date
+        such as ``2026-01-01`` works as a bound.
+        """
+        self.commit()
+        clauses: List[str] = []
+        params: List[Any] = []
+        for column, value in (
+            ("mandate_id", mandate_id),
+            ("procedure_id", procedure_id),
+            ("outcome_type", outcome_type),
+            ("fingerprint", fingerprint),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if escalated is not None:
+            clauses.append("escalated = ?")
+            params.append(int(escalated))
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(until)
+
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM records"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY timestamp DESC, record_id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return [_from_row(row) for row in self._conn.execute(sql, params)]
+
+    def fingerprint_emissions(self, fingerprint: str) -> Optional[FingerprintEmissions]:
+        """Return first/last emission details for a fingerprint, or None if never seen."""
+        self.commit()
+        row = self._conn.execute(
+            f"SELECT {', '.join(_FINGERPRINT_COLUMNS)} FROM fingerprints WHERE fingerprint = ?",
+            (fingerprint,),
+        ).fetchone()
+        return None if row is None else FingerprintEmissions(*row)
+
+    def new_fingerprints(self, since: str) -> List[FingerprintEmissions]:
+        """Return fingerprints first emitted at or after ``since``, newest first."""
+        self.commit()
+        rows = self._conn.execute(
+            f"SELECT {', '.join(_FINGERPRINT_COLUMNS)} FROM fingerprints "
+            "WHERE first_timestamp >= ? ORDER BY first_timestamp DESC, fingerprint",
+            (since,),
+        )
+        return [FingerprintEmissions(*row) for row in rows]
+
+    def rebuild_fingerprints(self) -> None:
+        """Recompute the fingerprint emission table from indexed records."""
+        self._conn.execute("DELETE FROM fingerprints")
+        self._conn.execute(_REBUILD_FINGERPRINTS)
+        self.commit()
+
+    def count(self) -> int:
+        """Return the number of indexed records."""
+        self.commit()
+        return int(self._conn.execute("SELECT COUNT(*) FROM records").fetchone()[0])
+
+    def close(self) -> None:
+        """Commit and close the database."""
+        self.commit()
+        self._conn.close()
+
+    def __enter__(self) -> "RecordIndex":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class IndexedRecordStore:
+    """Record store wrapper that indexes every record it appends."""
+
+    def __init__(self, store: RecordStore, index: RecordIndex) -> None:
+        self.store = store
+        self.index = index
+
+    def append(self, record: JudgmentRecord) -> str:
+        """Append to the underlying store, then index the record."""
+        location = self.store.append(record)
+        self.index.add(record, location)
+        return location
+
+    def close(self) -> None:
+        """Close the underlying store and commit the index."""
+        self.store.close()
+        self.index.close()
+
+
+def rebuild_index(
+    index: RecordIndex,
+    records_dir: Optional[Path] = None,
+    log_dir: Optional[Path] = None,
+) -> int:
+    """Backfill the index from a record directory (any record format) and/or segmented log."""
+    count = 0
+    if records_dir is not None:
+        for path in sorted(path for path in records_dir.iterdir() if path.suffix in RECORD_SUFFIXES):
+            data = serializer_for_path(path).decode(path.read_bytes())
+            if isinstance(data, dict):
+                index.add_dict(data, str(path), replace=True)
+                count += 1
+    if log_dir is not None:
+        from buffet.execution.record_log import iter_log_entries
+
+        for location, data in iter_log_entries(log_dir):
+            index.add_dict(data, location, replace=True)
+            count += 1
+    index.rebuild_fingerprints()
+    return count
+
+
+def _print_rows(rows: Iterable[IndexedRecord]) -> None:
+    for row in rows:
+        print(
+            f"{row.timestamp}  {row.record_id}  mandate={row.mandate_id}  "
+            f"procedure={row.procedure_id}  outcome={row.outcome_type}  "
+            f"confidence={row.confidence_level}  escalated={row.escalated}"
+        )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser."""
+    parser = argparse.ArgumentParser(description="Query or rebuild the judgment record index.")
+    parser.add_argument("--db", default=str(DEFAULT_INDEX_PATH), help="Path to the SQLite index")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    query = commands.add_parser("query", help="Query indexed records, newest first")
+    query.add_argument("--mandate", help="Filter by mandate_id")
+    query.add_argument("--procedure", help="Filter by procedure_id")
+    query.add_argument("--outcome", help="Filter by outcome type")
+    query.add_argument("--fingerprint", help="Filter by judgment fingerprint")
+    query.add_argument("--escalated", action="store_true", help="Only escalated records")
+    query.add_argument("--since", help="Earliest timestamp or date (inclusive)")
+    query.add_argument("--until", help="Latest timestamp or date (exclusive)")
+    query.add_argument("--limit", type=int, default=10, help="Maximum rows to print")
+
+    changes = commands.add_parser("fingerprints", help="List judgments first emitted since a timestamp")
+    changes.add_argument("--since", required=True, help="Earliest first-emission timestamp or date (inclusive)")
+
+    rebuild = commands.add_parser("rebuild", help="Backfill the index from stored records")
+    rebuild.add_argument("--records-dir", help="Directory of per-record judgment files")
+    rebuild.add_argument("--log-dir", help="Directory of a segmented record log")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run an index query or rebuild."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    with RecordIndex(Path(args.db)) as index:
+        if args.command == "rebuild":
+            count = rebuild_index(
+                index,
+                records_dir=Path(args.records_dir) if args.records_dir else None,
+                log_dir=Path(args.log_dir) if args.log_dir else None,
+            )
+            print(f"Indexed {count} judgment records into {args.db}")
+            return 0
+
+        if args.command == "fingerprints":
+            emissions = index.new_fingerprints(args.since)
+            if not emissions:
+                print(f"No new judgments since {args.since}.")
+                return 1
+            for item in emissions:
+                print(
+                    f"{item.first_timestamp}  {item.fingerprint[:16]}  emissions={item.emissions}  "
+                    f"first={item.first_record_id}  last={item.last_record_id}@{item.last_timestamp}"
+                )
+            return 0
+
+        rows = index.query(
+            mandate_id=args.mandate,
+            procedure_id=args.procedure,
+            outcome_type=args.outcome,
+            escalated=True if args.escalated else None,
+            fingerprint=args.fingerprint,
+            since=args.since,
+            until=args.until,
+            limit=args.limit,
+        )
+    if not rows:
+        print("No matching judgment records.")
+        return 1
+    _print_rows(rows)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,338 @@
+"""Append-only segmented log for judgment records.
+
+Each record is framed as a 4-byte big-endian payload length, a 4-byte CRC32
+of the payload, and the payload itself (canonical JSON of
+``JudgmentRecord.to_dict``). Frames are appended to ``segment-NNNNNN.log``
+files that rotate at a size limit. Frames are only ever appended; the one
+exception is a torn tail left by a crash (a partial frame, possibly followed
+by zero padding), which is truncated when the log is reopened so appends
+resume right after the last intact frame. A bad frame is only accepted as a
+torn tail when no intact frame follows it; corruption anywhere else raises
+ValueError. Zero-length frames are never written, so zero padding can never
+read as a frame.
+
+Record ids are unique across the whole log. When a segment is sealed its ids
+are written to a ``segment-NNNNNN.ids`` sidecar, so reopening a log reads the
+sidecars (rebuilding any that are missing or stale) and only decodes the
+payloads of the tail segment (UUID ids are kept as 16-byte keys).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import struct
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from time import monotonic
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Set, Tuple, Union
+from uuid import UUID
+
+from buffet.contracts.fingerprint import canonical_json_bytes
+from buffet.contracts.judgment_record import JudgmentRecord
+from buffet.execution.memory import write_judgment_record
+from buffet.utils.metrics import observe_write_failure
+from buffet.utils.timing import stage
+
+FRAME_HEADER = struct.Struct(">II")
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".log"
+IDS_SUFFIX = ".ids"
+DEFAULT_SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class FsyncPolicy:
+    """Group-commit policy: fsync after N records or T seconds, whichever first.
+
+    ``None`` disables a trigger. Segments are always fsynced on rotation and
+    close.
+    """
+
+    max_records: Optional[int] = 1000
+    max_seconds: Optional[float] = 1.0
+
+
+def _segment_name(sequence: int) -> str:
+    return f"{SEGMENT_PREFIX}{sequence:06d}{SEGMENT_SUFFIX}"
+
+
+def list_segments(log_dir: Path) -> List[Path]:
+    """Return segment files in append order."""
+    return sorted(log_dir.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"))
+
+
+def encode_frame(payload: bytes) -> bytes:
+    """Frame a payload with its length and checksum."""
+    return FRAME_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _scan_frames(handle: BinaryIO) -> Iterator[Tuple[int, Optional[bytes]]]:
+    """Yield (offset, payload) per frame; payload is None for a torn or corrupt tail."""
+    offset = 0
+    while True:
+        header = handle.read(FRAME_HEADER.size)
+        if not header:
+            return
+        if len(header) < FRAME_HEADER.size:
+            yield offset, None
+            return
+        length, checksum = FRAME_HEADER.unpack(header)
+        payload = handle.read(length)
+        if not length or len(payload) < length or zlib.crc32(payload) != checksum:
+            yield offset, None
+            return
+        yield offset, payload
+        offset += FRAME_HEADER.size + length
+
+
+def _is_record_payload(payload: bytes) -> bool:
+    try:
+        return isinstance(json.loads(payload), dict)
+    except ValueError:
+        return False
+
+
+def _follows_intact_frame(data: bytes) -> bool:
+    """Return True if an intact, decodable record frame starts anywhere after the first byte of ``data``.
+
+    Zero-length frames never count: zero padding would otherwise read as one,
+    since ``crc32(b"")`` is 0.
+    """
+    for start in range(1, len(data) - FRAME_HEADER.size + 1):
+        length, checksum = FRAME_HEADER.unpack_from(data, start)
+        end = start + FRAME_HEADER.size + length
+        if not length or end > len(data):
+            continue
+        payload = data[start + FRAME_HEADER.size : end]
+        if zlib.crc32(payload) == checksum and _is_record_payload(payload):
+            return True
+    return False
+
+
+def _iter_segment(segment: Path) -> Iterator[Tuple[int, bytes]]:
+    """Yield (offset, payload) per intact frame, stopping at a torn tail and raising on other corruption."""
+    with segment.open("rb") as handle:
+        for offset, payload in _scan_frames(handle):
+            if payload is None:
+                handle.seek(offset)
+                if _follows_intact_frame(handle.read()):
+                    raise ValueError(f"Corrupt record frame in {segment} at offset {offset}")
+                return
+            yield offset, payload
+
+
+def _record_key(record_id: str) -> Union[bytes, str]:
+    try:
+        return UUID(record_id).bytes
+    except ValueError:
+        return record_id
+
+
+def _ids_path(segment: Path) -> Path:
+    return segment.with_suffix(IDS_SUFFIX)
+
+
+def _write_segment_ids(segment: Path, size: int, record_ids: List[str]) -> None:
+    """Atomically write a sealed segment's record ids, tagged with the segment size they cover."""
+    path = _ids_path(segment)
+    temporary = path.with_name(f".{path.name}.tmp")
+    temporary.write_text(json.dumps({"size": size, "record_ids": record_ids}), encoding="utf-8")
+    temporary.replace(path)
+
+
+def _sealed_segment_ids(segment: Path) -> List[str]:
+    """Return a sealed segment's record ids from its sidecar, rebuilding the sidecar if missing or stale."""
+    size = segment.stat().st_size
+    path = _ids_path(segment)
+    if path.exists():
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError:
+            data = None
+        if isinstance(data, dict) and data.get("size") == size and isinstance(data.get("record_ids"), list):
+            return data["record_ids"]
+    record_ids = [json.loads(payload)["record_id"] for _, payload in _iter_segment(segment)]
+    _write_segment_ids(segment, size, record_ids)
+    return record_ids
+
+
+class SegmentedRecordLog:
+    """Record store appending checksummed frames to rotating segment files."""
+
+    def __init__(
+        self,
+        log_dir: Path,
+        segment_max_bytes: int = DEFAULT_SEGMENT_MAX_BYTES,
+        fsync_policy: FsyncPolicy = FsyncPolicy(),
+    ) -> None:
+        if segment_max_bytes <= FRAME_HEADER.size:
+            raise ValueError("segment_max_bytes is too small to hold a record")
+        self.log_dir = log_dir
+        self.segment_max_bytes = segment_max_bytes
+        self.fsync_policy = fsync_policy
+        self._record_ids: Set[Union[bytes, str]] = set()
+        self._segment_record_ids: List[str] = []
+        self._handle: Optional[BinaryIO] = None
+        self._segment_path: Optional[Path] = None
+        self._segment_size = 0
+        self._sequence = 0
+        self._unsynced = 0
+        self._last_sync = monotonic()
+        self._open_tail()
+
+    def _open_tail(self) -> None:
+        """Load logged ids, truncate a torn tail and resume the newest segment (or seal it if full)."""
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        segments = list_segments(self.log_dir)
+        if not segments:
+            self._open_segment(1)
+            return
+        for segment in segments[:-1]:
+            self._record_ids.update(_record_key(record_id) for record_id in _sealed_segment_ids(segment))
+
+        last = segments[-1]
+        self._sequence = int(last.name[len(SEGMENT_PREFIX) : -len(SEGMENT_SUFFIX)])
+        tail_ids: List[str] = []
+        end = 0
+        for offset, payload in _iter_segment(last):
+            tail_ids.append(json.loads(payload)["record_id"])
+            end = offset + FRAME_HEADER.size + len(payload)
+        if last.stat().st_size > end:
+            with last.open("r+b") as handle:
+                handle.truncate(end)
+                os.fsync(handle.fileno())
+        self._record_ids.update(_record_key(record_id) for record_id in tail_ids)
+
+        if end < self.segment_max_bytes:
+            self._open_segment(self._sequence, end)
+            self._segment_record_ids = tail_ids
+        else:
+            _write_segment_ids(last, end, tail_ids)
+            self._open_segment(self._sequence + 1)
+
+    def _open_segment(self, sequence: int, size: int = 0) -> None:
+        self._sequence = sequence
+        self._segment_path = self.log_dir / _segment_name(sequence)
+        self._handle = self._segment_path.open("ab")
+        self._segment_size = size
+        self._segment_record_ids = []
+
+    def _sync(self) -> None:
+        if self._handle is None:
+            return
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        self._unsynced = 0
+        self._last_sync = monotonic()
+
+    def _rotate(self) -> None:
+        self._sync()
+        if self._handle is not None:
+            self._handle.close()
+        assert self._segment_path is not None
+        _write_segment_ids(self._segment_path, self._segment_size, self._segment_record_ids)
+        self._open_segment(self._sequence + 1)
+
+    def append(self, record: JudgmentRecord) -> str:
+        """Append a record and return ``<segment>@<offset>``."""
+        try:
+            return self._append(record)
+        except OSError as exc:
+            observe_write_failure(
+                record.authority.get("mandate_id", ""), record.authority.get("procedure_id", ""), "record", exc
+            )
+            raise
+
+    def _append(self, record: JudgmentRecord) -> str:
+        if self._handle is None:
+            raise ValueError("Record log is closed")
+        key = _record_key(record.record_id)
+        if key in self._record_ids:
+            raise FileExistsError(f"Judgment record already appended: {record.record_id}")
+        with stage("serialization"):
+            frame = encode_frame(canonical_json_bytes(record.to_dict()))
+        if self._segment_size and self._segment_size + len(frame) > self.segment_max_bytes:
+            self._rotate()
+        offset = self._segment_size
+        with stage("write"):
+            self._handle.write(frame)
+        self._segment_size += len(frame)
+        self._record_ids.add(key)
+        self._segment_record_ids.append(record.record_id)
+        self._unsynced += 1
+
+        policy = self.fsync_policy
+        if (policy.max_records is not None and self._unsynced >= policy.max_records) or (
+            policy.max_seconds is not None and monotonic() - self._last_sync >= policy.max_seconds
+        ):
+            self._sync()
+        assert self._segment_path is not None
+        return f"{self._segment_path.name}@{offset}"
+
+    def close(self) -> None:
+        """Fsync and close the active segment."""
+        if self._handle is None:
+            return
+        self._sync()
+        self._handle.close()
+        self._handle = None
+
+    def __enter__(self) -> "SegmentedRecordLog":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def iter_log_entries(log_dir: Path) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield ``(<segment>@<offset>, record dict)`` from every segment in append order.
+
+    A torn frame is tolerated only at the tail of a segment (the writer moves
+    to a new segment after a crash); any other corruption raises ValueError.
+    """
+    for segment in list_segments(log_dir):
+        for offset, payload in _iter_segment(segment):
+            yield f"{segment.name}@{offset}", json.loads(payload)
+
+
+def iter_log_records(log_dir: Path) -> Iterator[Dict[str, Any]]:
+    """Yield record dictionaries from every segment in append order."""
+    for _, data in iter_log_entries(log_dir):
+        yield data
+
+
+def export_yaml_layout(log_dir: Path, output_dir: Path) -> List[Path]:
+    """Reproduce the one-YAML-file-per-record layout from a segmented log."""
+    paths: List[Path] = []
+    for data in iter_log_records(log_dir):
+        JudgmentRecord.validate_fields(data)
+        paths.append(write_judgment_record(JudgmentRecord(**data), output_dir))
+    return paths
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser."""
+    parser = argparse.ArgumentParser(description="Export a segmented record log to YAML-per-record files.")
+    parser.add_argument("--log-dir", required=True, help="Directory containing segment-*.log files")
+    parser.add_argument(
+        "--out-dir",
+        default="data/processed/judgment_records",
+        help="Output directory for exported YAML records",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Export every logged record for auditors."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    paths = export_yaml_layout(Path(args.log_dir), Path(args.out_dir))
+    print(f"Exported {len(paths)} judgment records to {args.out_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,474 @@
+"""Batch runner for judging a mandate × scenario grid in one process."""
+
+from __future__ import annotations
+
+import argparse
+import glob
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter, perf_counter_ns
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+import yaml
+
+from buffet.contracts.judgment_record import JudgmentRecord
+from buffet.execution.escalation import route_escalation
+from buffet.execution.judgment_cache import DEFAULT_MAX_ENTRIES, JudgmentCache, mark_cache_miss
+from buffet.execution.loop_runner import judge_with_latency, observe_record
+from buffet.execution.memory import RECORD_STORE_KINDS, RecordStore, YamlDirectoryStore, open_record_store
+from buffet.execution.record_index import IndexedRecordStore, RecordIndex
+from buffet.mandates.loader import Mandate, load_mandate
+from buffet.procedures.rate_regime_adjustment import (
+    ProcedureThresholds,
+    RateRegimeAdjustmentProcedure,
+    load_thresholds,
+)
+from buffet.sensing.batch import ScenarioBatch
+from buffet.sensing.scenario import ScenarioInput
+from buffet.sensing.sources import iter_scenarios
+from buffet.utils.metrics import serve_metrics, write_textfile
+from buffet.utils.profiling import DEFAULT_PROFILE_DIR, PROFILE_MODES, RunProfiler
+from buffet.utils.timing import default_histograms, enable_timings, timings_enabled
+from buffet.utils.yaml_cache import default_yaml_cache, enable_disk_cache
+
+DEFAULT_CHUNK_SIZE = 256
+
+_WorkerInputs = Tuple[Sequence[Mandate], Sequence[ScenarioInput], ProcedureThresholds]
+_worker_inputs: Optional[_WorkerInputs] = None
+
+
+@dataclass(frozen=True)
+class BatchSummary:
+    """Counts and timing for a completed batch run."""
+
+    mandates: int
+    scenarios: int
+    judgments: int
+    escalations: int
+    elapsed_seconds: float
+    outcome_counts: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def judgments_per_second(self) -> float:
+        """Return judgment throughput for the run."""
+        if self.elapsed_seconds <= 0:
+            return float(self.judgments)
+        return self.judgments / self.elapsed_seconds
+
+
+def expand_paths(patterns: Sequence[str]) -> List[Path]:
+    """Expand glob patterns into a sorted, de-duplicated list of files."""
+    matched = set()
+    for pattern in patterns:
+        for match in glob.glob(pattern, recursive=True):
+            path = Path(match)
+            if path.is_file():
+                matched.add(path)
+    return sorted(matched)
+
+
+def valid_mandate_paths(paths: Sequence[Path]) -> List[Path]:
+    """Return the paths that load as mandates, printing a warning for each one skipped."""
+    valid = []
+    for path in paths:
+        try:
+            load_mandate(path)
+        except (ValueError, yaml.YAMLError) as exc:
+            print(f"Skipping invalid mandate {path}: {exc}")
+            continue
+        valid.append(path)
+    return valid
+
+
+def _init_worker(
+    mandates: Sequence[Mandate],
+    scenarios: Sequence[ScenarioInput],
+    thresholds: ProcedureThresholds,
+    timings: bool = False,
+) -> None:
+    """Install batch inputs once per worker process."""
+    global _worker_inputs
+    _worker_inputs = (mandates, scenarios, thresholds)
+    enable_timings(timings)
+
+
+def _judge_shard(indices: Sequence[int]) -> List[JudgmentRecord]:
+    """Judge the given positions of the flattened (mandate, scenario) grid."""
+    if _worker_inputs is None:
+        raise RuntimeError("Batch worker used before initialization")
+    mandates, scenarios, thresholds = _worker_inputs
+    procedure = RateRegimeAdjustmentProcedure()
+    width = len(scenarios)
+    return [
+        judge_with_latency(procedure, mandates[index // width], scenarios[index % width], thresholds)
+        for index in indices
+    ]
+
+
+def _iter_shards(
+    mandates: Sequence[Mandate],
+    scenarios: Sequence[ScenarioInput],
+    thresholds: ProcedureThresholds,
+    chunk_size: int,
+    cache: Optional[JudgmentCache],
+) -> Iterator[Tuple[Sequence[int], List[JudgmentRecord]]]:
+    """Yield (grid positions to judge, cached records resolved meanwhile).
+
+    Without a cache the shards are plain ranges. With one, cache hits are
+    resolved here in the parent and only the misses are handed out.
+    """
+    total = len(mandates) * len(scenarios)
+    if cache is None:
+        for start in range(0, total, chunk_size):
+            yield range(start, min(start + chunk_size, total)), []
+        return
+    procedure = RateRegimeAdjustmentProcedure()
+    width = len(scenarios)
+    misses: List[int] = []
+    hits: List[JudgmentRecord] = []
+    for index in range(total):
+        mandate = mandates[index // width]
+        lookup_start = perf_counter_ns()
+        record = cache.get(cache.key(procedure, mandate, scenarios[index % width], thresholds), mandate)
+        if record is not None:
+            observe_record(record, perf_counter_ns() - lookup_start)
+            hits.append(record)
+            continue
+        misses.append(index)
+        if len(misses) == chunk_size:
+            yield misses, hits
+            misses, hits = [], []
+    if misses or hits:
+        yield misses, hits
+
+
+def _cache_results(
+    mandates: Sequence[Mandate],
+    scenarios: Sequence[ScenarioInput],
+    thresholds: ProcedureThresholds,
+    cache: Optional[JudgmentCache],
+    indices: Iterable[int],
+    records: List[JudgmentRecord],
+) -> List[JudgmentRecord]:
+    """Store worker results in the parent's cache and flag them as misses."""
+    if cache is None:
+        return records
+    procedure = RateRegimeAdjustmentProcedure()
+    width = len(scenarios)
+    marked = []
+    for index, record in zip(indices, records):
+        record = mark_cache_miss(record)
+        cache.put(cache.key(procedure, mandates[index // width], scenarios[index % width], thresholds), record)
+        marked.append(record)
+    return marked
+
+
+def _iter_parallel_records(
+    mandates: Sequence[Mandate],
+    scenarios: Sequence[ScenarioInput],
+    thresholds: ProcedureThresholds,
+    workers: int,
+    chunk_size: int,
+    cache: Optional[JudgmentCache] = None,
+) -> Iterator[JudgmentRecord]:
+    """Shard the grid across a process pool and yield records as shards finish.
+
+    The cache is only touched from this (parent) process.
+    """
+    max_in_flight = workers * 2
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(mandates, scenarios, thresholds, timings_enabled()),
+    ) as executor:
+        pending: Dict[Future[List[JudgmentRecord]], Sequence[int]] = {}
+
+        def finish(futures: Iterable[Future[List[JudgmentRecord]]]) -> Iterator[JudgmentRecord]:
+            for future in futures:
+                indices = pending.pop(future)
+                records = future.result()
+                if timings_enabled():
+                    # Worker histograms stay in the workers; fold in the per-record spans instead.
+                    for record in records:
+                        default_histograms().record_all(record.behavior.get("timings_ns", {}))
+                for record in _cache_results(mandates, scenarios, thresholds, cache, indices, records):
+                    # Likewise for worker metrics: count the judgment here from its stamped latency.
+                    timings = record.behavior.get("timings_ns")
+                    if timings and "judge" in timings:
+                        latency_ns = timings["judge"]
+                    else:
+                        latency_ns = record.behavior["decision_latency_ms"] * 1_000_000
+                    observe_record(record, latency_ns)
+                    yield record
+
+        for indices, hits in _iter_shards(mandates, scenarios, thresholds, chunk_size, cache):
+            yield from hits
+            if not indices:
+                continue
+            pending[executor.submit(_judge_shard, indices)] = indices
+            if len(pending) < max_in_flight:
+                continue
+            done, _ = wait(set(pending), return_when=FIRST_COMPLETED)
+            yield from finish(done)
+        yield from finish(list(pending))
+
+
+def iter_batch_records(
+    mandates: Sequence[Mandate],
+    scenarios: Sequence[ScenarioInput],
+    thresholds: ProcedureThresholds,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    cache: Optional[JudgmentCache] = None,
+) -> Iterator[JudgmentRecord]:
+    """Yield one judgment record per (mandate, scenario) pair.
+
+    With ``workers > 1`` the grid is judged in a process pool; records are
+    yielded back to the caller, which remains the single writer. With a
+    ``cache``, unchanged pairs are served from it instead of being re-judged.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if workers > 1:
+        yield from _iter_parallel_records(mandates, scenarios, thresholds, workers, chunk_size, cache)
+        return
+    procedure = RateRegimeAdjustmentProcedure()
+    for mandate in mandates:
+        for scenario in scenarios:
+            yield judge_with_latency(procedure, mandate, scenario, thresholds, cache=cache)
+
+
+def run_batch(
+    mandate_paths: Sequence[Path],
+    scenario_paths: Sequence[Path],
+    thresholds_path: Path,
+    records_dir: Path,
+    escalations_dir: Path,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    store: Optional[RecordStore] = None,
+    cache: Optional[JudgmentCache] = None,
+) -> BatchSummary:
+    """Judge the full mandate × scenario cross-product and persist each record.
+
+    Records go to ``store`` when given, otherwise one YAML file per record
+    under ``records_dir``. The caller owns (and closes) a supplied store and
+    judgment cache.
+    """
+    start = perf_counter()
+    mandates = [load_mandate(path) for path in mandate_paths]
+    scenarios = ScenarioBatch.from_scenarios(scenario for path in scenario_paths for scenario in iter_scenarios(path))
+    thresholds = load_thresholds(thresholds_path)
+
+    judgments = 0
+    escalations = 0
+    outcome_counts: Dict[str, int] = {}
+    sink = store if store is not None else YamlDirectoryStore(records_dir)
+    records = iter_batch_records(mandates, scenarios, thresholds, workers=workers, chunk_size=chunk_size, cache=cache)
+    for record in records:
+        sink.append(record)
+        if record.escalation is not None:
+            route_escalation(record, escalations_dir)
+            escalations += 1
+        outcome_type = str(record.outcome.get("type"))
+        outcome_counts[outcome_type] = outcome_counts.get(outcome_type, 0) + 1
+        judgments += 1
+    if cache is not None:
+        cache.commit()
+
+    return BatchSummary(
+        mandates=len(mandates),
+        scenarios=len(scenarios),
+        judgments=judgments,
+        escalations=escalations,
+        elapsed_seconds=perf_counter() - start,
+        outcome_counts=outcome_counts,
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser."""
+    parser = argparse.ArgumentParser(description="Run a buffet judgment batch over a mandate × scenario grid.")
+    parser.add_argument(
+        "--mandates",
+        required=True,
+        nargs="+",
+        help="Glob pattern(s) for mandate YAML files",
+    )
+    parser.add_argument(
+        "--scenarios",
+        required=True,
+        nargs="+",
+        help="Glob pattern(s) for scenario files (YAML, or NDJSON/CSV/.npz holding many scenarios)",
+    )
+    parser.add_argument(
+        "--thresholds",
+        default="judgment_loops/rate_regime_adjustment/thresholds.yaml",
+        help="Path to procedure thresholds YAML",
+    )
+    parser.add_argument(
+        "--out-dir",
+        default="data/processed/judgment_records",
+        help="Output directory for judgment records",
+    )
+    parser.add_argument(
+        "--escalations-dir",
+        default="data/processed/escalations",
+        help="Output directory for escalation stubs routed for human review",
+    )
+    parser.add_argument(
+        "--store",
+        choices=RECORD_STORE_KINDS,
+        default="yaml",
+        help="Record storage backend: one file per record (yaml, json or msgpack), or segmented append-only log",
+    )
+    parser.add_argument(
+        "--index",
+        default=None,
+        help="Optional SQLite record index to update (e.g. data/processed/judgment_index.sqlite)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for judging (1 runs in-process)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Pairs per worker task when --workers > 1",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Directory for the on-disk parsed YAML cache (e.g. data/cache/yaml)",
+    )
+    parser.add_argument(
+        "--judgment-cache",
+        default=None,
+        help="SQLite file memoizing judgments of unchanged inputs (e.g. data/cache/judgments.sqlite)",
+    )
+    parser.add_argument(
+        "--judgment-cache-size",
+        type=int,
+        default=DEFAULT_MAX_ENTRIES,
+        help="Maximum cached judgments; least recently used entries are evicted",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Record per-stage nanosecond timings in behavior.timings_ns and print latency histograms",
+    )
+    parser.add_argument(
+        "--metrics-textfile",
+        default=None,
+        help="Write runtime metrics in Prometheus text format here when done (e.g. data/processed/metrics/buffet.prom)",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Serve runtime metrics at http://127.0.0.1:PORT/metrics while the batch runs",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="cprofile",
+        choices=PROFILE_MODES,
+        help="Profile the run with cProfile (the default) or the low-overhead stack sampler ('sample', for"
+        " flamegraphs); write the artifacts and a hot-function report to --profile-dir"
+        " (with --workers > 1 only the parent process is profiled)",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default=str(DEFAULT_PROFILE_DIR),
+        help="Output directory for --profile artifacts",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the batch and report throughput."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.timings:
+        enable_timings()
+
+    if args.cache_dir:
+        enable_disk_cache(Path(args.cache_dir))
+
+    mandate_paths = expand_paths(args.mandates)
+    scenario_paths = expand_paths(args.scenarios)
+    if not mandate_paths:
+        print(f"No mandates matched: {' '.join(args.mandates)}")
+        return 1
+    if not scenario_paths:
+        print(f"No scenarios matched: {' '.join(args.scenarios)}")
+        return 1
+    mandate_paths = valid_mandate_paths(mandate_paths)
+    if not mandate_paths:
+        print("No valid mandates to judge")
+        return 1
+
+    metrics_server = serve_metrics(port=args.metrics_port) if args.metrics_port is not None else None
+    store = open_record_store(args.store, Path(args.out_dir))
+    if args.index:
+        store = IndexedRecordStore(store, RecordIndex(Path(args.index)))
+    cache = None
+    if args.judgment_cache:
+        cache = JudgmentCache(max_entries=args.judgment_cache_size, db_path=Path(args.judgment_cache))
+    profiler = RunProfiler("run_batch", Path(args.profile_dir), mode=args.profile) if args.profile else None
+    try:
+        with profiler or nullcontext():
+            summary = run_batch(
+                mandate_paths=mandate_paths,
+                scenario_paths=scenario_paths,
+                thresholds_path=Path(args.thresholds),
+                records_dir=Path(args.out_dir),
+                escalations_dir=Path(args.escalations_dir),
+                workers=args.workers,
+                chunk_size=args.chunk_size,
+                store=store,
+                cache=cache,
+            )
+    finally:
+        store.close()
+        if cache is not None:
+            cache.close()
+        if metrics_server is not None:
+            metrics_server.shutdown()
+        if args.metrics_textfile:
+            write_textfile(Path(args.metrics_textfile))
+
+    print(
+        f"Judged {summary.judgments} pairs "
+        f"({summary.mandates} mandates × {summary.scenarios} scenarios) "
+        f"in {summary.elapsed_seconds:.3f}s "
+        f"({summary.judgments_per_second:.1f} judgments/s)."
+    )
+    for outcome_type, count in sorted(summary.outcome_counts.items()):
+        print(f"  {outcome_type}: {count}")
+    if summary.escalations:
+        print(f"Escalations routed for human review: {summary.escalations}")
+    if args.cache_dir:
+        stats = default_yaml_cache().stats
+        print(f"Parse cache: {stats.hits} hits, {stats.disk_hits} disk hits, {stats.misses} misses")
+    if cache is not None:
+        judged = cache.stats
+        print(f"Judgment cache: {judged.hits} hits, {judged.misses} misses, {judged.evictions} evictions")
+    if args.timings:
+        print(default_histograms().format_summary())
+    if profiler is not None:
+        artifacts = profiler.save(mandates=summary.mandates, procedures=1, scenarios=summary.scenarios)
+        print(artifacts.report)
+        print(f"Wrote profile: {', '.join(str(path) for path in artifacts.paths)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,9 +3,14 @@
 from __future__ import annotations
 
 import argparse
+from contextlib import nullcontext
 from pathlib import Path
 
 from buffet.execution.loop_runner import run_judgment_loop
+from buffet.execution.record_index import RecordIndex
+from buffet.utils.metrics import write_textfile
+from buffet.utils.profiling import DEFAULT_PROFILE_DIR, PROFILE_MODES, RunProfiler
+from buffet.utils.timing import default_histograms, enable_timings
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -23,6 +28,39 @@ def build_parser() -> argparse.ArgumentParser:
         default="data/processed/judgment_records",
         help="Output directory for judgment records",
     )
+    parser.add_argument(
+        "--escalations-dir",
+        default="data/processed/escalations",
+        help="Output directory for escalation stubs routed for human review",
+    )
+    parser.add_argument(
+        "--index",
+        default=None,
+        help="Optional SQLite record index to update (e.g. data/processed/judgment_index.sqlite)",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Record per-stage nanosecond timings in behavior.timings_ns and print a summary",
+    )
+    parser.add_argument(
+        "--metrics-textfile",
+        default=None,
+        help="Write runtime metrics in Prometheus text format here when done (e.g. data/processed/metrics/buffet.prom)",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="cprofile",
+        choices=PROFILE_MODES,
+        help="Profile the run with cProfile (the default) or the low-overhead stack sampler ('sample', for"
+        " flamegraphs); write the artifacts and a hot-function report to --profile-dir",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default=str(DEFAULT_PROFILE_DIR),
+        help="Output directory for --profile artifacts",
+    )
     return parser
 
 
@@ -30,21 +68,39 @@ def main(argv: list[str] | None = None) -> int:
     """Run the example and write outputs under data/processed."""
     parser = build_parser()
     args = parser.parse_args(argv)
+    if args.timings:
+        enable_timings()
 
     records_dir = Path(args.out_dir)
-    escalations_dir = Path("data/processed/escalations")
+    escalations_dir = Path(args.escalations_dir)
 
-    record, record_path = run_judgment_loop(
-        mandate_path=Path(args.mandate),
-        scenario_path=Path(args.scenario),
-        thresholds_path=Path(args.thresholds),
-        records_dir=records_dir,
-        escalations_dir=escalations_dir,
-    )
+    index = RecordIndex(Path(args.index)) if args.index else None
+    profiler = RunProfiler("run_example", Path(args.profile_dir), mode=args.profile) if args.profile else None
+    try:
+        with profiler or nullcontext():
+            record, record_path = run_judgment_loop(
+                mandate_path=Path(args.mandate),
+                scenario_path=Path(args.scenario),
+                thresholds_path=Path(args.thresholds),
+                records_dir=records_dir,
+                escalations_dir=escalations_dir,
+                index=index,
+            )
+    finally:
+        if index is not None:
+            index.close()
+        if args.metrics_textfile:
+            write_textfile(Path(args.metrics_textfile))
 
     print(f"Wrote judgment record: {record_path}")
     if record.escalation is not None:
         print("Escalation routed for human review.")
+    if profiler is not None:
+        artifacts = profiler.save(mandates=1, procedures=1, scenarios=1)
+        print(artifacts.report)
+        print(f"Wrote profile: {', '.join(str(path) for path in artifacts.paths)}")
+    if args.timings:
+        print(default_histograms().format_summary())
     return 0
 
 
@@ -3,9 +3,12 @@
 from __future__ import annotations
 
 import argparse
+from contextlib import nullcontext
 from pathlib import Path
 
 from buffet.execution.loop_runner import run_judgment_loop
+from buffet.execution.record_index import RecordIndex
+from buffet.utils.profiling import DEFAULT_PROFILE_DIR, PROFILE_MODES, RunProfiler
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -23,6 +26,29 @@ def build_parser() -> argparse.ArgumentParser:
         default="data/processed/judgment_records",
         help="Output directory for judgment records",
     )
+    parser.add_argument(
+        "--escalations-dir",
+        default="data/processed/escalations",
+        help="Output directory for escalation stubs routed for human review",
+    )
+    parser.add_argument(
+        "--index",
+        default=None,
+        help="Optional SQLite record index to update (e.g. data/processed/judgment_index.sqlite)",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="cprofile",
+        choices=PROFILE_MODES,
+        help="Profile the run with cProfile (the default) or the low-overhead stack sampler ('sample', for"
+        " flamegraphs); write the artifacts and a hot-function report to --profile-dir",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default=str(DEFAULT_PROFILE_DIR),
+        help="Output directory for --profile artifacts",
+    )
     return parser
 
 
@@ -31,17 +57,29 @@ def main(argv: list[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
 
-    record, path = run_judgment_loop(
-        mandate_path=Path(args.mandate),
-        scenario_path=Path(args.scenario),
-        thresholds_path=Path(args.thresholds),
-        records_dir=Path(args.out_dir),
-        escalations_dir=Path("data/processed/escalations"),
-    )
+    index = RecordIndex(Path(args.index)) if args.index else None
+    profiler = RunProfiler("run_skill", Path(args.profile_dir), mode=args.profile) if args.profile else None
+    try:
+        with profiler or nullcontext():
+            record, path = run_judgment_loop(
+                mandate_path=Path(args.mandate),
+                scenario_path=Path(args.scenario),
+                thresholds_path=Path(args.thresholds),
+                records_dir=Path(args.out_dir),
+                escalations_dir=Path(args.escalations_dir),
+                index=index,
+            )
+    finally:
+        if index is not None:
+            index.close()
 
     print(f"Wrote judgment record: {path}")
     if record.escalation is not None:
         print("Escalation routed for human review.")
+    if profiler is not None:
+        artifacts = profiler.save(mandates=1, procedures=1, scenarios=1)
+        print(artifacts.report)
+        print(f"Wrote profile: {', '.join(str(path) for path in artifacts.paths)}")
     return 0
 
 
@@ -0,0 +1,366 @@
+"""Long-running judgment service with mandates and thresholds kept warm.
+
+The one-shot CLIs pay interpreter start, imports and mandate parsing on every
+call. This daemon loads mandates and thresholds once and serves judge
+requests over localhost HTTP or a Unix socket (HTTP framing in both cases):
+
+- ``GET /health`` reports the loaded mandates.
+- ``GET /metrics`` exposes the runtime metrics (Prometheus text, or
+  OpenMetrics when the scraper's Accept header asks for it).
+- ``POST /judge`` takes ``{"mandate_id": ..., "scenario": {...}}`` or a batch
+  ``{"mandate_id": ..., "scenarios": [{...}, ...]}`` with scenarios inline in
+  the same shape as scenario YAML files. Records stream back as NDJSON, one
+  line per scenario, after each has been persisted through the record store.
+
+Requests are judged and written under one lock, so the store keeps its
+single-writer guarantee. Handler threads share the index and cache through
+that lock, so a ``RecordIndex`` must be opened with
+``check_same_thread=False``. Connections are kept alive between requests.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from buffet.contracts.judgment_record import JudgmentRecord
+from buffet.execution.escalation import route_escalation
+from buffet.execution.judgment_cache import JudgmentCache
+from buffet.execution.loop_runner import judge_with_latency
+from buffet.execution.memory import RECORD_STORE_KINDS, RecordStore, open_record_store
+from buffet.execution.record_index import RecordIndex
+from buffet.execution.run_batch import expand_paths, valid_mandate_paths
+from buffet.mandates.loader import Mandate, load_mandate
+from buffet.procedures.rate_regime_adjustment import (
+    ProcedureThresholds,
+    RateRegimeAdjustmentProcedure,
+    load_thresholds,
+)
+from buffet.sensing.scenario import parse_scenario
+from buffet.utils.metrics import default_registry, negotiate
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8737
+MAX_BATCH_SCENARIOS = 10_000
+
+
+class JudgmentService:
+    """Warm mandates, thresholds and store behind a thread-safe judge call."""
+
+    def __init__(
+        self,
+        mandates: Sequence[Mandate],
+        thresholds: ProcedureThresholds,
+        store: RecordStore,
+        escalations_dir: Path,
+        index: Optional[RecordIndex] = None,
+        cache: Optional[JudgmentCache] = None,
+    ) -> None:
+        self.mandates: Dict[str, Mandate] = {mandate.mandate_id: mandate for mandate in mandates}
+        self.thresholds = thresholds
+        self.store = store
+        self.escalations_dir = escalations_dir
+        self.index = index
+        self.cache = cache
+        self.procedure = RateRegimeAdjustmentProcedure()
+        self._lock = threading.Lock()
+
+    def mandate(self, mandate_id: Any) -> Mandate:
+        """Return a loaded mandate by id."""
+        mandate = self.mandates.get(str(mandate_id))
+        if mandate is None:
+            raise ValueError(f"Unknown mandate_id: {mandate_id}")
+        return mandate
+
+    def judge(self, request: Dict[str, Any]) -> Iterator[JudgmentRecord]:
+        """Validate a judge request, then judge and persist each scenario in order."""
+        if not isinstance(request, dict):
+            raise ValueError("Request body must be a JSON object")
+        mandate = self.mandate(request.get("mandate_id"))
+        if "scenarios" in request:
+            payloads = request["scenarios"]
+            if not isinstance(payloads, list):
+                raise ValueError("scenarios must be a list")
+        elif "scenario" in request:
+            payloads = [request["scenario"]]
+        else:
+            raise ValueError("Request needs a scenario or scenarios")
+        if len(payloads) > MAX_BATCH_SCENARIOS:
+            raise ValueError(f"Batch exceeds {MAX_BATCH_SCENARIOS} scenarios")
+        scenarios = [
+            parse_scenario(payload, default_id=f"inline_{position}") for position, payload in enumerate(payloads)
+        ]
+
+        try:
+            for scenario in scenarios:
+                with self._lock:
+                    record = judge_with_latency(self.procedure, mandate, scenario, self.thresholds, cache=self.cache)
+                    location = self.store.append(record)
+                    if self.index is not None:
+                        self.index.add(record, location)
+                    if record.escalation is not None:
+                        route_escalation(record, self.escalations_dir)
+                yield record
+        finally:
+            # Runs on failure and when a disconnected client's generator is closed, too.
+            with self._lock:
+                if self.index is not None:
+                    self.index.commit()
+                if self.cache is not None:
+                    self.cache.commit()
+
+    def close(self) -> None:
+        """Close the store, index and cache."""
+        with self._lock:
+            self.store.close()
+            if self.index is not None:
+                self.index.close()
+            if self.cache is not None:
+                self.cache.close()
+
+
+class _JudgeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Buffer the response so headers and a single record leave in one write;
+    # batches flush per record to keep streaming.
+    wbufsize = -1
+    server: "_ServiceServer"
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address.
+        return str(self.client_address[0]) if self.client_address else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+    def do_GET(self) -> None:
+        if self.path == "/metrics":
+            openmetrics, content_type = negotiate(self.headers.get("Accept"))
+            body = default_registry().render(openmetrics).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if self.path != "/health":
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+        self._send_json(200, {"status": "ok", "mandates": sorted(self.server.service.mandates)})
+
+    def do_POST(self) -> None:
+        if self.path != "/judge":
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b"null")
+            records = self.server.service.judge(request)
+            first = next(records, None)
+        except (ValueError, TypeError) as exc:
+            self._send_json(400, {"error": str(exc)})
+            return
+        except Exception as exc:
+            self.log_error("Judge request failed: %r", exc)
+            self._send_json(500, {"error": str(exc)})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            self._stream(first, records)
+        except OSError:
+            # The client went away mid-stream; closing the generator below still commits.
+            self.close_connection = True
+        finally:
+            records.close()
+
+    def _stream(self, first: Optional[JudgmentRecord], records: Iterator[JudgmentRecord]) -> None:
+        """Write one NDJSON chunk per record; a failure mid-batch ends the stream with an error line."""
+        pending = first
+        error: Optional[Exception] = None
+        while pending is not None:
+            try:
+                following = next(records, None)
+            except Exception as exc:
+                self.log_error("Judge request failed mid-stream: %r", exc)
+                following, error = None, exc
+            self._write_chunk(json.dumps(pending.to_dict()).encode("utf-8") + b"\n")
+            if following is not None:
+                # Flush per record to keep streaming; the last one leaves with the terminating chunk.
+                self.wfile.flush()
+            pending = following
+        if error is not None:
+            self._write_chunk(json.dumps({"error": str(error)}).encode("utf-8") + b"\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+
+class _ServiceServer:
+    """Mixin carrying the service onto the socketserver instance."""
+
+    service: JudgmentService
+    verbose: bool = False
+
+
+class JudgmentHTTPServer(_ServiceServer, ThreadingHTTPServer):
+    """Threaded localhost HTTP server for the judgment service."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple, service: JudgmentService, verbose: bool = False) -> None:
+        self.service = service
+        self.verbose = verbose
+        super().__init__(address, _JudgeHandler)
+
+    def server_bind(self) -> None:
+        self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        super().server_bind()
+
+
+class JudgmentUnixServer(_ServiceServer, socketserver.ThreadingUnixStreamServer):
+    """Threaded Unix-socket server speaking the same HTTP protocol."""
+
+    daemon_threads = True
+
+    def __init__(self, path: Path, service: JudgmentService, verbose: bool = False) -> None:
+        self.service = service
+        self.verbose = verbose
+        if path.exists():
+            path.unlink()
+        super().__init__(str(path), _JudgeHandler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+def build_service(
+    mandate_paths: Sequence[Path],
+    thresholds_path: Path,
+    store: RecordStore,
+    escalations_dir: Path,
+    index: Optional[RecordIndex] = None,
+    cache: Optional[JudgmentCache] = None,
+) -> JudgmentService:
+    """Load mandates and thresholds once and wrap them in a service."""
+    mandates: List[Mandate] = [load_mandate(path) for path in mandate_paths]
+    return JudgmentService(mandates, load_thresholds(thresholds_path), store, escalations_dir, index, cache)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser."""
+    parser = argparse.ArgumentParser(description="Serve buffet judgments from a warm, long-running process.")
+    parser.add_argument(
+        "--mandates",
+        required=True,
+        nargs="+",
+        help="Glob pattern(s) for mandate YAML files to keep loaded",
+    )
+    parser.add_argument(
+        "--thresholds",
+        default="judgment_loops/rate_regime_adjustment/thresholds.yaml",
+        help="Path to procedure thresholds YAML",
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Address to bind for HTTP")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to bind for HTTP")
+    parser.add_argument("--socket", default=None, help="Serve on this Unix socket path instead of HTTP")
+    parser.add_argument(
+        "--out-dir",
+        default="data/processed/judgment_records",
+        help="Output directory for judgment records",
+    )
+    parser.add_argument(
+        "--escalations-dir",
+        default="data/processed/escalations",
+        help="Output directory for escalation stubs routed for human review",
+    )
+    parser.add_argument(
+        "--store",
+        choices=RECORD_STORE_KINDS,
+        default="segments",
+        help="Record storage backend; the segmented log keeps per-call write cost lowest",
+    )
+    parser.add_argument(
+        "--index",
+        default=None,
+        help="Optional SQLite record index to update (e.g. data/processed/judgment_index.sqlite)",
+    )
+    parser.add_argument(
+        "--judgment-cache-size",
+        type=int,
+        default=0,
+        help="Keep up to this many memoized judgments in memory (0 disables)",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Log each request")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Load mandates and serve until interrupted."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    mandate_paths = expand_paths(args.mandates)
+    if not mandate_paths:
+        print(f"No mandates matched: {' '.join(args.mandates)}")
+        return 1
+    mandate_paths = valid_mandate_paths(mandate_paths)
+    if not mandate_paths:
+        print("No valid mandates to serve")
+        return 1
+
+    store = open_record_store(args.store, Path(args.out_dir))
+    index = RecordIndex(Path(args.index), check_same_thread=False) if args.index else None
+    cache = JudgmentCache(max_entries=args.judgment_cache_size) if args.judgment_cache_size > 0 else None
+    service = build_service(
+        mandate_paths,
+        Path(args.thresholds),
+        store,
+        Path(args.escalations_dir),
+        index=index,
+        cache=cache,
+    )
+    if args.socket:
+        server: socketserver.BaseServer = JudgmentUnixServer(Path(args.socket), service, args.verbose)
+        where = args.socket
+    else:
+        server = JudgmentHTTPServer((args.host, args.port), service, args.verbose)
+        where = f"http://{args.host}:{server.server_address[1]}"
+
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    print(f"Serving {len(service.mandates)} mandates on {where}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,11 +2,194 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-import yaml
+from buffet.utils.timing import stage
+from buffet.utils.yaml_cache import load_yaml
+
+
+@dataclass(frozen=True, slots=True)
+class ConstraintCheck:
+    """A single mandate limit compared against one portfolio field."""
+
+    name: str
+    portfolio_field: str
+    bound: str
+    limit: float
+    hard: bool
+    recommendation: str
+
+    def violated(self, value: float) -> bool:
+        """Return True when the value falls outside the limit."""
+        if self.bound == "max":
+            return value > self.limit
+        return value < self.limit
+
+
+@dataclass(frozen=True, slots=True)
+class MandatePlan:
+    """Mandate limits resolved and validated once at load time."""
+
+    mandate_id: str
+    mandate_version: str
+    effective_date: str
+    min_confidence_level: float
+    max_gross_exposure: Optional[float]
+    min_liquidity_buffer_months: Optional[int]
+    min_funding_ratio: Optional[float]
+    max_drawdown: Optional[float]
+    max_shortfall_probability: Optional[float]
+    max_illiquid_allocation: Optional[float]
+    retention_years: int
+    checks: Tuple[ConstraintCheck, ...]
+
+
+def _get_nested(data: Dict[str, Any], *keys: str, default: Any = None) -> Any:
+    current: Any = data
+    for key in keys:
+        if not isinstance(current, dict) or key not in current:
+            return default
+        current = current[key]
+    return current
+
+
+def _coerce_limit(
+    data: Dict[str, Any],
+    source_path: Path,
+    keys: Tuple[str, ...],
+    convert: Callable[[Any], Any],
+) -> Any:
+    """Resolve an optional numeric limit, rejecting malformed or negative values.
+
+    Integer limits must be whole numbers; ``4.5`` is rejected rather than
+    truncated to ``4``.
+    """
+    value = _get_nested(data, *keys)
+    if value is None:
+        return None
+    dotted = ".".join(keys)
+    if isinstance(value, bool):
+        raise ValueError(f"Mandate at {source_path} has non-numeric {dotted}: {value!r}")
+    try:
+        converted = float(value) if convert is int else convert(value)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Mandate at {source_path} has non-numeric {dotted}: {value!r}") from exc
+    if convert is int:
+        if not converted.is_integer():
+            raise ValueError(f"Mandate at {source_path} has non-integer {dotted}: {value!r}")
+        converted = int(converted)
+    if converted < 0:
+        raise ValueError(f"Mandate at {source_path} has negative {dotted}: {value!r}")
+    return converted
+
+
+def compile_mandate_plan(data: Dict[str, Any], source_path: Path) -> MandatePlan:
+    """Resolve and validate every mandate limit into a flat constraint plan."""
+    mandate_id = _get_nested(data, "meta", "mandate_id")
+    if not mandate_id:
+        raise ValueError(f"Mandate at {source_path} is missing meta.mandate_id")
+
+    min_confidence = _coerce_limit(data, source_path, ("confidence", "minimum_confidence_level"), float)
+    min_confidence = 0.0 if min_confidence is None else min_confidence
+    if min_confidence > 1.0:
+        raise ValueError(f"Mandate at {source_path} has confidence.minimum_confidence_level above 1.0")
+
+    max_gross = _coerce_limit(data, source_path, ("leverage", "max_gross_exposure"), float)
+    min_buffer = _coerce_limit(data, source_path, ("liquidity", "minimum_buffer_months"), int)
+    min_funding = _coerce_limit(data, source_path, ("risk_constraints", "funding_ratio", "minimum"), float)
+    max_drawdown = _coerce_limit(data, source_path, ("risk_constraints", "max_drawdown", "level"), float)
+    max_shortfall = _coerce_limit(
+        data, source_path, ("risk_constraints", "shortfall_risk", "max_probability"), float
+    )
+    max_illiquid = _coerce_limit(
+        data, source_path, ("liquidity", "illiquid_assets", "max_allocation"), float
+    )
+    retention = _coerce_limit(data, source_path, ("audit", "rationale_retention_years"), int)
+
+    checks: List[ConstraintCheck] = []
+    if max_gross is not None:
+        checks.append(
+            ConstraintCheck(
+                name="leverage.max_gross_exposure",
+                portfolio_field="gross_exposure",
+                bound="max",
+                limit=max_gross,
+                hard=True,
+                recommendation="Reduce gross exposure to mandate maximum",
+            )
+        )
+    if min_buffer is not None:
+        checks.append(
+            ConstraintCheck(
+                name="liquidity.minimum_buffer_months",
+                portfolio_field="liquidity_buffer_months",
+                bound="min",
+                limit=min_buffer,
+                hard=False,
+                recommendation="Increase liquidity buffer to mandate minimum",
+            )
+        )
+    if min_funding is not None:
+        checks.append(
+            ConstraintCheck(
+                name="risk_constraints.funding_ratio.minimum",
+                portfolio_field="funding_ratio",
+                bound="min",
+                limit=min_funding,
+                hard=True,
+                recommendation="Restore funding ratio above mandate minimum",
+            )
+        )
+    if max_drawdown is not None:
+        checks.append(
+            ConstraintCheck(
+                name="risk_constraints.max_drawdown.level",
+                portfolio_field="drawdown",
+                bound="max",
+                limit=max_drawdown,
+                hard=True,
+                recommendation="Reduce risk to bring drawdown within mandate maximum",
+            )
+        )
+    if max_shortfall is not None:
+        checks.append(
+            ConstraintCheck(
+                name="risk_constraints.shortfall_risk.max_probability",
+                portfolio_field="shortfall_probability",
+                bound="max",
+                limit=max_shortfall,
+                hard=True,
+                recommendation="Reduce shortfall probability to mandate maximum",
+            )
+        )
+    if max_illiquid is not None:
+        checks.append(
+            ConstraintCheck(
+                name="liquidity.illiquid_assets.max_allocation",
+                portfolio_field="illiquid_allocation",
+                bound="max",
+                limit=max_illiquid,
+                hard=False,
+                recommendation="Reduce illiquid allocation to mandate maximum",
+            )
+        )
+
+    return MandatePlan(
+        mandate_id=str(mandate_id),
+        mandate_version=str(_get_nested(data, "meta", "version")),
+        effective_date=str(_get_nested(data, "meta", "effective_date")),
+        min_confidence_level=min_confidence,
+        max_gross_exposure=max_gross,
+        min_liquidity_buffer_months=min_buffer,
+        min_funding_ratio=min_funding,
+        max_drawdown=max_drawdown,
+        max_shortfall_probability=max_shortfall,
+        max_illiquid_allocation=max_illiquid,
+        retention_years=10 if retention is None else retention,
+        checks=tuple(checks),
+    )
 
 
 @dataclass(frozen=True)
@@ -15,63 +198,74 @@ class Mandate:
 
     raw: Dict[str, Any]
     source_path: Path
+    plan: MandatePlan = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "plan", compile_mandate_plan(self.raw, self.source_path))
 
     def _get_nested(self, *keys: str, default: Any = None) -> Any:
-        current: Any = self.raw
-        for key in keys:
-            if not isinstance(current, dict) or key not in current:
-                return default
-            current = current[key]
-        return current
+        return _get_nested(self.raw, *keys, default=default)
 
     @property
     def mandate_id(self) -> str:
         """Return the mandate identifier."""
-        return str(self._get_nested("meta", "mandate_id"))
+        return self.plan.mandate_id
 
     @property
     def mandate_version(self) -> str:
         """Return the mandate version string."""
-        return str(self._get_nested("meta", "version"))
+        return self.plan.mandate_version
 
     @property
     def effective_date(self) -> str:
         """Return the mandate effective date."""
-        return str(self._get_nested("meta", "effective_date"))
+        return self.plan.effective_date
 
     @property
     def min_confidence_level(self) -> float:
         """Return the minimum confidence level required by the mandate."""
-        return float(self._get_nested("confidence", "minimum_confidence_level", default=0.0))
+        return self.plan.min_confidence_level
 
     @property
     def max_gross_exposure(self) -> Optional[float]:
         """Return the maximum gross exposure constraint if defined."""
-        value = self._get_nested("leverage", "max_gross_exposure")
-        return float(value) if value is not None else None
+        return self.plan.max_gross_exposure
 
     @property
     def min_liquidity_buffer_months(self) -> Optional[int]:
         """Return the minimum liquidity buffer in months if defined."""
-        value = self._get_nested("liquidity", "minimum_buffer_months")
-        return int(value) if value is not None else None
+        return self.plan.min_liquidity_buffer_months
 
     @property
     def min_funding_ratio(self) -> Optional[float]:
         """Return the minimum funding ratio if defined."""
-        value = self._get_nested("risk_constraints", "funding_ratio", "minimum")
-        return float(value) if value is not None else None
+        return self.plan.min_funding_ratio
+
+    @property
+    def max_drawdown(self) -> Optional[float]:
+        """Return the maximum peak-to-trough drawdown if defined."""
+        return self.plan.max_drawdown
+
+    @property
+    def max_shortfall_probability(self) -> Optional[float]:
+        """Return the maximum shortfall probability if defined."""
+        return self.plan.max_shortfall_probability
+
+    @property
+    def max_illiquid_allocation(self) -> Optional[float]:
+        """Return the maximum illiquid asset allocation if defined."""
+        return self.plan.max_illiquid_allocation
 
     @property
     def retention_years(self) -> int:
         """Return audit retention years if defined, otherwise default."""
-        value = self._get_nested("audit", "rationale_retention_years")
-        return int(value) if value is not None else 10
+        return self.plan.retention_years
 
 
 def load_mandate(path: Path) -> Mandate:
     """Load a mandate YAML file from disk."""
-    data = yaml.safe_load(path.read_text())
-    if not isinstance(data, dict):
-        raise ValueError(f"Mandate at {path} is empty or invalid")
-    return Mandate(raw=data, source_path=path)
+    with stage("load_mandate"):
+        data = load_yaml(path)
+        if not isinstance(data, dict):
+            raise ValueError(f"Mandate at {path} is empty or invalid")
+        return Mandate(raw=data, source_path=path)
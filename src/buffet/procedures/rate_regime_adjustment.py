@@ -4,11 +4,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 from uuid import uuid4
 
-import yaml
-
+from buffet.contracts.fingerprint import judgment_fingerprint
 from buffet.contracts.judgment_record import JudgmentRecord
 from buffet.mandates.loader import Mandate
 from buffet.reasoning.align import AlignmentResult, evaluate_alignment
@@ -16,6 +15,8 @@ from buffet.reasoning.confidence import ConfidenceResult, compute_confidence
 from buffet.reasoning.explain import outcome_rationale
 from buffet.sensing.scenario import ScenarioInput
 from buffet.utils.time import retained_until_date, utc_now_iso
+from buffet.utils.timing import timed
+from buffet.utils.yaml_cache import load_yaml
 
 
 @dataclass(frozen=True)
@@ -28,7 +29,7 @@ class ProcedureThresholds:
 
 def load_thresholds(path: Path) -> ProcedureThresholds:
     """Load procedure thresholds from YAML."""
-    data = yaml.safe_load(path.read_text()) or {}
+    data = load_yaml(path) or {}
     persistence = data.get("persistence", {}) if isinstance(data, dict) else {}
     return ProcedureThresholds(
         minimum_confirmations=int(persistence.get("minimum_confirmations", 2)),
@@ -48,13 +49,16 @@ class RateRegimeAdjustmentProcedure:
         scenario: ScenarioInput,
         thresholds: ProcedureThresholds,
         decision_latency_ms: int,
+        prior_confidence: Optional[float] = None,
     ) -> JudgmentRecord:
-        """Execute the procedure and produce a judgment record."""
-        alignment = evaluate_alignment(mandate, scenario)
-        confidence = compute_confidence(scenario)
-        rationale = outcome_rationale(mandate, scenario, alignment, confidence)
+        """Execute the procedure and produce a judgment record.
+
+        ``prior_confidence`` is the previous observation's confidence level when
+        judging a time series; it turns the confidence trend into an observed one.
+        """
+        alignment, confidence, outcome_type = self.evaluate(mandate, scenario, prior_confidence)
+        rationale = timed("outcome_rationale", outcome_rationale, mandate, scenario, alignment, confidence)
 
-        outcome_type = self._determine_outcome(mandate, alignment, confidence)
         branches = self._branches_taken(alignment, confidence, outcome_type, mandate.min_confidence_level)
         outcome = {
             "type": outcome_type,
@@ -85,7 +89,7 @@ class RateRegimeAdjustmentProcedure:
                 "automated_actions_suspended": True,
             }
 
-        return JudgmentRecord(
+        fields: Dict[str, Any] = dict(
             record_id=str(uuid4()),
             timestamp=utc_now_iso(),
             authority={
@@ -147,6 +151,20 @@ class RateRegimeAdjustmentProcedure:
                 "superseded_by": None,
             },
         )
+        # The fingerprint covers only semantic identity, so it is computed once
+        # here and stays valid when behavior timings are filled in later.
+        return JudgmentRecord(**fields, judgment_fingerprint=judgment_fingerprint(fields))
+
+    def evaluate(
+        self,
+        mandate: Mandate,
+        scenario: ScenarioInput,
+        prior_confidence: Optional[float] = None,
+    ) -> Tuple[AlignmentResult, ConfidenceResult, str]:
+        """Evaluate alignment, confidence and outcome type without building a record."""
+        alignment = timed("evaluate_alignment", evaluate_alignment, mandate, scenario)
+        confidence = timed("compute_confidence", compute_confidence, scenario, prior_confidence)
+        return alignment, confidence, self._determine_outcome(mandate, alignment, confidence)
 
     def _determine_outcome(
         self,
@@ -25,21 +25,16 @@ def evaluate_alignment(mandate: Mandate, scenario: ScenarioInput) -> AlignmentRe
     at_risk: List[str] = []
     recommended: List[str] = []
 
-    max_gross = mandate.max_gross_exposure
-    if max_gross is not None and scenario.portfolio.gross_exposure > max_gross:
-        hard_breach = True
-        recommended.append("Reduce gross exposure to mandate maximum")
-
-    min_buffer = mandate.min_liquidity_buffer_months
-    if min_buffer is not None and scenario.portfolio.liquidity_buffer_months < min_buffer:
-        at_risk.append("liquidity_buffer_months")
-        recommended.append("Increase liquidity buffer to mandate minimum")
-
-    min_funding = mandate.min_funding_ratio
-    if min_funding is not None and scenario.portfolio.funding_ratio is not None:
-        if scenario.portfolio.funding_ratio < min_funding:
+    portfolio = scenario.portfolio
+    for check in mandate.plan.checks:
+        value = getattr(portfolio, check.portfolio_field)
+        if value is None or not check.violated(value):
+            continue
+        if check.hard:
             hard_breach = True
-            recommended.append("Restore funding ratio above mandate minimum")
+        else:
+            at_risk.append(check.portfolio_field)
+        recommended.append(check.recommendation)
 
     status = "aligned"
     if hard_breach or at_risk:
@@ -3,9 +3,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Optional
 
 from buffet.sensing.scenario import ScenarioInput
 
+# Level changes smaller than this count as a stable trend.
+TREND_TOLERANCE = 1e-9
+
 
 @dataclass(frozen=True)
 class ConfidenceResult:
@@ -16,11 +20,22 @@ class ConfidenceResult:
     attribution: str
 
 
-def compute_confidence(scenario: ScenarioInput) -> ConfidenceResult:
-    """Compute a deterministic confidence score from scenario uncertainty."""
+def compute_confidence(scenario: ScenarioInput, prior_level: Optional[float] = None) -> ConfidenceResult:
+    """Compute a deterministic confidence score from scenario uncertainty.
+
+    With ``prior_level`` (the previous observation's level) the trend is the
+    observed direction of change; otherwise it is inferred from the scenario.
+    """
     uncertainty = max(0.0, min(1.0, scenario.environment.uncertainty))
     level = max(0.0, min(1.0, 0.85 - (uncertainty * 0.5)))
-    if uncertainty >= 0.6:
+    if prior_level is not None:
+        if level > prior_level + TREND_TOLERANCE:
+            trend = "improving"
+        elif level < prior_level - TREND_TOLERANCE:
+            trend = "degrading"
+        else:
+            trend = "stable"
+    elif uncertainty >= 0.6:
         trend = "degrading"
     elif uncertainty <= 0.2:
         trend = "improving" if scenario.environment.rate_regime != "stable" else "stable"
@@ -0,0 +1,267 @@
+"""Columnar alignment and confidence evaluation for scenario sweeps.
+
+Mirrors ``evaluate_alignment``, ``compute_confidence`` and the procedure's
+outcome rule over NumPy arrays so a sensitivity grid is evaluated in one pass.
+Results are identical to the scalar path element by element. Requires the
+optional ``numpy`` dependency (``buffet[vector]``).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Sequence
+
+import numpy as np
+
+from buffet.mandates.loader import Mandate
+from buffet.sensing.batch import ScenarioBatch
+from buffet.sensing.scenario import ScenarioInput
+
+TREND_LABELS = ("stable", "improving", "degrading")
+TREND_STABLE, TREND_IMPROVING, TREND_DEGRADING = range(3)
+
+OUTCOME_LABELS = ("affirm_alignment", "recommend_adjustment", "escalate")
+OUTCOME_AFFIRM, OUTCOME_ADJUST, OUTCOME_ESCALATE = range(3)
+
+
+@dataclass(frozen=True)
+class ScenarioColumns:
+    """Scenario fields laid out as equally shaped arrays."""
+
+    gross_exposure: np.ndarray
+    liquidity_buffer_months: np.ndarray
+    funding_ratio: np.ndarray
+    uncertainty: np.ndarray
+    rate_regime: np.ndarray
+    drawdown: np.ndarray
+    shortfall_probability: np.ndarray
+    illiquid_allocation: np.ndarray
+
+    def portfolio(self) -> Dict[str, np.ndarray]:
+        """Return portfolio columns keyed by ``PortfolioState`` field name."""
+        return {
+            "gross_exposure": self.gross_exposure,
+            "liquidity_buffer_months": self.liquidity_buffer_months,
+            "funding_ratio": self.funding_ratio,
+            "drawdown": self.drawdown,
+            "shortfall_probability": self.shortfall_probability,
+            "illiquid_allocation": self.illiquid_allocation,
+        }
+
+
+@dataclass(frozen=True)
+class AlignmentArrays:
+    """Element-wise alignment flags against mandate limits."""
+
+    violations: Dict[str, np.ndarray]
+    hard_constraints_breached: np.ndarray
+    constraints_at_risk: np.ndarray
+
+    @property
+    def misaligned(self) -> np.ndarray:
+        """Return the mask of scenarios with any breach or constraint at risk."""
+        return self.hard_constraints_breached | self.constraints_at_risk
+
+
+@dataclass(frozen=True)
+class ConfidenceArrays:
+    """Element-wise confidence levels and trend codes."""
+
+    level: np.ndarray
+    trend_code: np.ndarray
+
+    def trends(self) -> np.ndarray:
+        """Return trend labels for each element."""
+        return np.asarray(TREND_LABELS, dtype=object)[self.trend_code]
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    """Alignment, confidence and outcome codes for a scenario sweep."""
+
+    alignment: AlignmentArrays
+    confidence: ConfidenceArrays
+    outcome_code: np.ndarray
+
+    def outcomes(self) -> np.ndarray:
+        """Return outcome type labels for each element."""
+        return np.asarray(OUTCOME_LABELS, dtype=object)[self.outcome_code]
+
+
+def _optional_column(scenarios: Sequence[ScenarioInput], name: str) -> np.ndarray:
+    """Collect an optional portfolio field, mapping None to NaN."""
+    values = (getattr(s.portfolio, name) for s in scenarios)
+    return np.fromiter(
+        (np.nan if value is None else value for value in values), dtype=np.float64, count=len(scenarios)
+    )
+
+
+def scenario_columns(scenarios: Sequence[ScenarioInput]) -> ScenarioColumns:
+    """Build columnar arrays from scalar scenarios; missing optional fields become NaN."""
+    return ScenarioColumns(
+        gross_exposure=np.fromiter(
+            (s.portfolio.gross_exposure for s in scenarios), dtype=np.float64, count=len(scenarios)
+        ),
+        liquidity_buffer_months=np.fromiter(
+            (s.portfolio.liquidity_buffer_months for s in scenarios), dtype=np.int64, count=len(scenarios)
+        ),
+        funding_ratio=_optional_column(scenarios, "funding_ratio"),
+        uncertainty=np.fromiter(
+            (s.environment.uncertainty for s in scenarios), dtype=np.float64, count=len(scenarios)
+        ),
+        rate_regime=np.asarray([s.environment.rate_regime for s in scenarios], dtype=object),
+        drawdown=_optional_column(scenarios, "drawdown"),
+        shortfall_probability=_optional_column(scenarios, "shortfall_probability"),
+        illiquid_allocation=_optional_column(scenarios, "illiquid_allocation"),
+    )
+
+
+def batch_columns(batch: ScenarioBatch) -> ScenarioColumns:
+    """Wrap a batch's typed columns as arrays without copying them.
+
+    The arrays share memory with the batch, which must not grow while they
+    are alive. The regime column is decoded from its interned codes.
+    """
+    floats = {name: np.frombuffer(column, dtype=np.float64) for name, column in batch.floats.items()}
+    regimes = batch.interned["rate_regime"]
+    return ScenarioColumns(
+        gross_exposure=floats["gross_exposure"],
+        liquidity_buffer_months=np.frombuffer(batch.liquidity_buffer_months, dtype=np.int64),
+        funding_ratio=floats["funding_ratio"],
+        uncertainty=floats["uncertainty"],
+        rate_regime=np.asarray(regimes.labels, dtype=object)[np.frombuffer(regimes.codes, dtype=np.uintc)],
+        drawdown=floats["drawdown"],
+        shortfall_probability=floats["shortfall_probability"],
+        illiquid_allocation=floats["illiquid_allocation"],
+    )
+
+
+def evaluate_alignment_arrays(mandate: Mandate, portfolio: Mapping[str, Any]) -> AlignmentArrays:
+    """Evaluate the mandate's constraint checks element-wise.
+
+    ``portfolio`` maps ``PortfolioState`` field names to broadcastable arrays.
+    Fields that are absent, or NaN entries, are not checked, matching the
+    scalar path's handling of ``None``.
+    """
+    names = list(portfolio)
+    arrays = np.broadcast_arrays(
+        *(
+            np.asarray(portfolio[name]).astype(np.int64)
+            if name == "liquidity_buffer_months"
+            else np.asarray(portfolio[name], dtype=np.float64)
+            for name in names
+        )
+    )
+    columns = dict(zip(names, arrays))
+    shape = arrays[0].shape if arrays else ()
+    hard = np.zeros(shape, dtype=bool)
+    at_risk = np.zeros(shape, dtype=bool)
+    violations: Dict[str, np.ndarray] = {}
+
+    for check in mandate.plan.checks:
+        column = columns.get(check.portfolio_field)
+        if column is None:
+            continue
+        if check.bound == "max":
+            violated = column > check.limit
+        else:
+            violated = column < check.limit
+        violations[check.portfolio_field] = violated
+        if check.hard:
+            hard |= violated
+        else:
+            at_risk |= violated
+
+    return AlignmentArrays(
+        violations=violations,
+        hard_constraints_breached=hard,
+        constraints_at_risk=at_risk,
+    )
+
+
+def compute_confidence_arrays(uncertainty: Any, rate_regime: Any) -> ConfidenceArrays:
+    """Compute confidence levels and trend codes element-wise."""
+    raw, regime = np.broadcast_arrays(
+        np.asarray(uncertainty, dtype=np.float64),
+        np.asarray(rate_regime, dtype=object),
+    )
+    clipped = np.clip(raw, 0.0, 1.0)
+    level = np.clip(0.85 - (clipped * 0.5), 0.0, 1.0)
+
+    trend = np.full(clipped.shape, TREND_STABLE, dtype=np.int8)
+    trend[(clipped <= 0.2) & (regime != "stable")] = TREND_IMPROVING
+    trend[clipped >= 0.6] = TREND_DEGRADING
+    return ConfidenceArrays(level=level, trend_code=trend)
+
+
+def determine_outcome_codes(
+    mandate: Mandate,
+    alignment: AlignmentArrays,
+    confidence: ConfidenceArrays,
+) -> np.ndarray:
+    """Apply the procedure's outcome rule element-wise."""
+    escalate = alignment.hard_constraints_breached | (confidence.level < mandate.min_confidence_level)
+    outcome = np.where(alignment.misaligned, OUTCOME_ADJUST, OUTCOME_AFFIRM).astype(np.int8)
+    outcome[escalate] = OUTCOME_ESCALATE
+    return outcome
+
+
+def evaluate_sweep(
+    mandate: Mandate,
+    gross_exposure: Any,
+    liquidity_buffer_months: Any,
+    funding_ratio: Any,
+    uncertainty: Any,
+    rate_regime: Any,
+    drawdown: Any = np.nan,
+    shortfall_probability: Any = np.nan,
+    illiquid_allocation: Any = np.nan,
+) -> SweepResult:
+    """Evaluate a broadcastable grid of scenario fields against one mandate."""
+    (
+        gross,
+        buffer_months,
+        funding,
+        drawdowns,
+        shortfall,
+        illiquid,
+        raw_uncertainty,
+        regime,
+    ) = np.broadcast_arrays(
+        np.asarray(gross_exposure, dtype=np.float64),
+        np.asarray(liquidity_buffer_months),
+        np.asarray(funding_ratio, dtype=np.float64),
+        np.asarray(drawdown, dtype=np.float64),
+        np.asarray(shortfall_probability, dtype=np.float64),
+        np.asarray(illiquid_allocation, dtype=np.float64),
+        np.asarray(uncertainty, dtype=np.float64),
+        np.asarray(rate_regime, dtype=object),
+    )
+    alignment = evaluate_alignment_arrays(
+        mandate,
+        {
+            "gross_exposure": gross,
+            "liquidity_buffer_months": buffer_months,
+            "funding_ratio": funding,
+            "drawdown": drawdowns,
+            "shortfall_probability": shortfall,
+            "illiquid_allocation": illiquid,
+        },
+    )
+    confidence = compute_confidence_arrays(raw_uncertainty, regime)
+    return SweepResult(
+        alignment=alignment,
+        confidence=confidence,
+        outcome_code=determine_outcome_codes(mandate, alignment, confidence),
+    )
+
+
+def evaluate_columns(mandate: Mandate, columns: ScenarioColumns) -> SweepResult:
+    """Evaluate pre-built scenario columns against one mandate."""
+    alignment = evaluate_alignment_arrays(mandate, columns.portfolio())
+    confidence = compute_confidence_arrays(columns.uncertainty, columns.rate_regime)
+    return SweepResult(
+        alignment=alignment,
+        confidence=confidence,
+        outcome_code=determine_outcome_codes(mandate, alignment, confidence),
+    )
@@ -0,0 +1,254 @@
+"""Struct-of-arrays container for large scenario sets.
+
+``ScenarioBatch`` stores each scenario field as one typed ``array.array``
+column instead of three Python objects per scenario. Regime labels and
+``as_of`` stamps are interned to integer codes, scenario ids are packed into
+one UTF-8 buffer, and missing optional portfolio fields are stored as NaN.
+
+Indexing returns a ``ScenarioRow``: a view holding only the batch and a row
+number, exposing the same ``environment`` / ``portfolio`` attributes as
+``ScenarioInput`` so procedures consume it unchanged. Use ``to_scenario`` to
+materialize a standalone ``ScenarioInput``. Columns export the buffer
+protocol, so ``buffet.reasoning.vectorized.batch_columns`` wraps them as
+NumPy arrays without copying.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from buffet.sensing.scenario import EnvironmentState, PortfolioState, ScenarioInput
+
+FLOAT_COLUMNS = (
+    "gross_exposure",
+    "uncertainty",
+    "funding_ratio",
+    "drawdown",
+    "shortfall_probability",
+    "illiquid_allocation",
+)
+OPTIONAL_COLUMNS = ("funding_ratio", "drawdown", "shortfall_probability", "illiquid_allocation")
+INTERNED_COLUMNS = ("as_of", "rate_regime", "inflation_regime")
+
+
+def _optional(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+class _Interned:
+    """Integer codes for a low-cardinality string column."""
+
+    __slots__ = ("labels", "codes", "_lookup")
+
+    def __init__(self) -> None:
+        self.labels: List[str] = []
+        self.codes = array("I")
+        self._lookup: Dict[str, int] = {}
+
+    def append(self, value: str) -> None:
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.labels)
+            self.labels.append(value)
+        self.codes.append(code)
+
+    def __getitem__(self, index: int) -> str:
+        return self.labels[self.codes[index]]
+
+    def __getstate__(self) -> tuple:
+        return self.labels, self.codes
+
+    def __setstate__(self, state: tuple) -> None:
+        self.labels, self.codes = state
+        self._lookup = {label: code for code, label in enumerate(self.labels)}
+
+
+class _PackedStrings:
+    """High-cardinality strings packed into one UTF-8 buffer plus end offsets."""
+
+    __slots__ = ("data", "ends")
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+        self.ends = array("Q")
+
+    def append(self, value: str) -> None:
+        self.data += value.encode("utf-8")
+        self.ends.append(len(self.data))
+
+    def __len__(self) -> int:
+        return len(self.ends)
+
+    def __getitem__(self, index: int) -> str:
+        start = self.ends[index - 1] if index else 0
+        return self.data[start : self.ends[index]].decode("utf-8")
+
+    def __getstate__(self) -> tuple:
+        return self.data, self.ends
+
+    def __setstate__(self, state: tuple) -> None:
+        self.data, self.ends = state
+
+
+class ScenarioBatch:
+    """Columnar scenarios with typed columns and interned string labels."""
+
+    def __init__(self) -> None:
+        self.scenario_ids = _PackedStrings()
+        self.liquidity_buffer_months = array("q")
+        self.floats: Dict[str, array] = {name: array("d") for name in FLOAT_COLUMNS}
+        self.interned: Dict[str, _Interned] = {name: _Interned() for name in INTERNED_COLUMNS}
+
+    @classmethod
+    def from_scenarios(cls, scenarios: Iterable[ScenarioInput]) -> "ScenarioBatch":
+        """Build a batch from any iterable of scenarios (or row views)."""
+        batch = cls()
+        batch.extend(scenarios)
+        return batch
+
+    def append(self, scenario: ScenarioInput) -> None:
+        """Append one scenario's fields to the columns."""
+        environment = scenario.environment
+        portfolio = scenario.portfolio
+        self.scenario_ids.append(scenario.scenario_id)
+        self.interned["as_of"].append(scenario.as_of)
+        self.interned["rate_regime"].append(environment.rate_regime)
+        self.interned["inflation_regime"].append(environment.inflation_regime)
+        self.floats["uncertainty"].append(environment.uncertainty)
+        self.floats["gross_exposure"].append(portfolio.gross_exposure)
+        self.liquidity_buffer_months.append(portfolio.liquidity_buffer_months)
+        for name in OPTIONAL_COLUMNS:
+            value = getattr(portfolio, name)
+            self.floats[name].append(math.nan if value is None else value)
+
+    def extend(self, scenarios: Iterable[ScenarioInput]) -> None:
+        """Append every scenario from an iterable."""
+        for scenario in scenarios:
+            self.append(scenario)
+
+    def __len__(self) -> int:
+        return len(self.scenario_ids)
+
+    def __getitem__(self, index: int) -> "ScenarioRow":
+        size = len(self.scenario_ids)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("scenario batch index out of range")
+        return ScenarioRow(self, index)
+
+    def __iter__(self) -> Iterator["ScenarioRow"]:
+        for index in range(len(self.scenario_ids)):
+            yield ScenarioRow(self, index)
+
+
+class ScenarioRow:
+    """Zero-copy view of one batch row with the ``ScenarioInput`` attribute shape."""
+
+    __slots__ = ("batch", "index", "environment", "portfolio")
+
+    def __init__(self, batch: ScenarioBatch, index: int) -> None:
+        self.batch = batch
+        self.index = index
+        self.environment = EnvironmentView(batch, index)
+        self.portfolio = PortfolioView(batch, index)
+
+    @property
+    def scenario_id(self) -> str:
+        return self.batch.scenario_ids[self.index]
+
+    @property
+    def as_of(self) -> str:
+        return self.batch.interned["as_of"][self.index]
+
+    def to_scenario(self) -> ScenarioInput:
+        """Materialize the row as a standalone ``ScenarioInput``."""
+        batch, index = self.batch, self.index
+        floats = batch.floats
+        return ScenarioInput(
+            scenario_id=batch.scenario_ids[index],
+            as_of=batch.interned["as_of"][index],
+            environment=EnvironmentState(
+                rate_regime=batch.interned["rate_regime"][index],
+                inflation_regime=batch.interned["inflation_regime"][index],
+                uncertainty=floats["uncertainty"][index],
+            ),
+            portfolio=PortfolioState(
+                gross_exposure=floats["gross_exposure"][index],
+                liquidity_buffer_months=batch.liquidity_buffer_months[index],
+                funding_ratio=_optional(floats["funding_ratio"][index]),
+                drawdown=_optional(floats["drawdown"][index]),
+                shortfall_probability=_optional(floats["shortfall_probability"][index]),
+                illiquid_allocation=_optional(floats["illiquid_allocation"][index]),
+            ),
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ScenarioRow):
+            return self.to_scenario() == other.to_scenario()
+        if isinstance(other, ScenarioInput):
+            return self.to_scenario() == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"ScenarioRow({self.scenario_id!r}, index={self.index})"
+
+
+class EnvironmentView:
+    """``EnvironmentState`` attributes read from a batch row."""
+
+    __slots__ = ("batch", "index")
+
+    def __init__(self, batch: ScenarioBatch, index: int) -> None:
+        self.batch = batch
+        self.index = index
+
+    @property
+    def rate_regime(self) -> str:
+        return self.batch.interned["rate_regime"][self.index]
+
+    @property
+    def inflation_regime(self) -> str:
+        return self.batch.interned["inflation_regime"][self.index]
+
+    @property
+    def uncertainty(self) -> float:
+        return self.batch.floats["uncertainty"][self.index]
+
+
+class PortfolioView:
+    """``PortfolioState`` attributes read from a batch row."""
+
+    __slots__ = ("batch", "index")
+
+    def __init__(self, batch: ScenarioBatch, index: int) -> None:
+        self.batch = batch
+        self.index = index
+
+    @property
+    def gross_exposure(self) -> float:
+        return self.batch.floats["gross_exposure"][self.index]
+
+    @property
+    def liquidity_buffer_months(self) -> int:
+        return self.batch.liquidity_buffer_months[self.index]
+
+    @property
+    def funding_ratio(self) -> Optional[float]:
+        return _optional(self.batch.floats["funding_ratio"][self.index])
+
+    @property
+    def drawdown(self) -> Optional[float]:
+        return _optional(self.batch.floats["drawdown"][self.index])
+
+    @property
+    def shortfall_probability(self) -> Optional[float]:
+        return _optional(self.batch.floats["shortfall_probability"][self.index])
+
+    @property
+    def illiquid_allocation(self) -> Optional[float]:
+        return _optional(self.batch.floats["illiquid_allocation"][self.index])
@@ -1,15 +1,20 @@
-"""Scenario input parsing for deterministic sensing stubs."""
+"""Scenario input parsing for deterministic sensing stubs.
+
+The scenario dataclasses are slotted to keep per-scenario memory small; see
+``buffet.sensing.batch`` for the columnar form used by large sweeps.
+"""
 
 from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Mapping, Optional
 
-import yaml
+from buffet.utils.timing import stage
+from buffet.utils.yaml_cache import load_yaml
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EnvironmentState:
     """Minimal environmental regime snapshot."""
 
@@ -18,16 +23,19 @@ class EnvironmentState:
     uncertainty: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PortfolioState:
     """Minimal portfolio exposure snapshot."""
 
     gross_exposure: float
     liquidity_buffer_months: int
     funding_ratio: Optional[float]
+    drawdown: Optional[float] = None
+    shortfall_probability: Optional[float] = None
+    illiquid_allocation: Optional[float] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ScenarioInput:
     """Deterministic scenario input for sensing."""
 
@@ -58,12 +66,24 @@ def _get_nested(data: Dict[str, Any], *keys: str, default: Any = None) -> Any:
     return current
 
 
+def _optional_float(value: Any) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
 def load_scenario(path: Path) -> ScenarioInput:
     """Load a scenario YAML file, falling back to defaults when needed."""
-    data = yaml.safe_load(path.read_text()) if path.exists() else None
-    data = data or {}
-
-    scenario_id = str(data.get("scenario_id") or path.stem)
+    with stage("load_scenario"):
+        data = load_yaml(path) if path.exists() else None
+        return parse_scenario(data or {}, default_id=path.stem)
+
+
+def parse_scenario(data: Mapping[str, Any], default_id: str = "scenario") -> ScenarioInput:
+    """Build a scenario from an already-parsed mapping, falling back to defaults when needed."""
+    if not isinstance(data, Mapping):
+        raise ValueError("Scenario must be a mapping")
+    if not isinstance(data, dict):
+        data = dict(data)
+    scenario_id = str(data.get("scenario_id") or default_id)
     as_of = str(data.get("as_of") or "1970-01-01T00:00:00Z")
 
     env = EnvironmentState(
@@ -79,13 +99,12 @@ def load_scenario(path: Path) -> ScenarioInput:
         liquidity_buffer_months=int(
             _get_nested(data, "portfolio", "liquidity_buffer_months", default=_DEFAULT_PORTFOLIO.liquidity_buffer_months)
         ),
-        funding_ratio=_get_nested(data, "portfolio", "funding_ratio", default=_DEFAULT_PORTFOLIO.funding_ratio),
-    )
-    funding_ratio = float(portfolio.funding_ratio) if portfolio.funding_ratio is not None else None
-    portfolio = PortfolioState(
-        gross_exposure=portfolio.gross_exposure,
-        liquidity_buffer_months=portfolio.liquidity_buffer_months,
-        funding_ratio=funding_ratio,
+        funding_ratio=_optional_float(
+            _get_nested(data, "portfolio", "funding_ratio", default=_DEFAULT_PORTFOLIO.funding_ratio)
+        ),
+        drawdown=_optional_float(_get_nested(data, "portfolio", "drawdown")),
+        shortfall_probability=_optional_float(_get_nested(data, "portfolio", "shortfall_probability")),
+        illiquid_allocation=_optional_float(_get_nested(data, "portfolio", "illiquid_allocation")),
     )
 
     return ScenarioInput(
@@ -0,0 +1,189 @@
+"""Streaming scenario sources for large scenario sets.
+
+One file can carry many scenarios:
+
+- ``.ndjson`` / ``.jsonl``: one scenario mapping per line, shaped like a
+  scenario YAML file (``environment`` and ``portfolio`` sections);
+- ``.csv``: one scenario per row with flat column names (see
+  ``SCENARIO_COLUMNS``); empty cells count as missing;
+- ``.npz``: one NumPy array per flat column name, NaN marking missing values.
+
+Every row goes through ``parse_scenario`` so the defaults match scenario YAML
+files. ``.npz`` files can also be read as ``ScenarioColumns`` chunks for the
+vectorized engine without building ``ScenarioInput`` objects; that path and
+``save_scenarios_npz`` require the optional ``numpy`` dependency.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from dataclasses import asdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Mapping
+
+from buffet.sensing.scenario import _DEFAULT_ENV, _DEFAULT_PORTFOLIO, ScenarioInput, load_scenario, parse_scenario
+
+if TYPE_CHECKING:
+    from buffet.reasoning.vectorized import ScenarioColumns
+
+DEFAULT_CHUNK_SIZE = 65_536
+
+ENVIRONMENT_COLUMNS = ("rate_regime", "inflation_regime", "uncertainty")
+PORTFOLIO_COLUMNS = (
+    "gross_exposure",
+    "liquidity_buffer_months",
+    "funding_ratio",
+    "drawdown",
+    "shortfall_probability",
+    "illiquid_allocation",
+)
+SCENARIO_COLUMNS = ("scenario_id", "as_of") + ENVIRONMENT_COLUMNS + PORTFOLIO_COLUMNS
+
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+YAML_SUFFIXES = (".yaml", ".yml")
+
+
+def _is_missing(value: Any) -> bool:
+    # NaN is the only value not equal to itself.
+    return value is None or value == "" or value != value
+
+
+def scenario_from_row(row: Mapping[str, Any], default_id: str) -> ScenarioInput:
+    """Build a scenario from a flat row keyed by ``SCENARIO_COLUMNS``.
+
+    Columns may also be written ``environment.<name>`` / ``portfolio.<name>``.
+    Unknown columns are ignored.
+    """
+    data: Dict[str, Any] = {"environment": {}, "portfolio": {}}
+    for column, value in row.items():
+        if _is_missing(value):
+            continue
+        name = column.rsplit(".", 1)[-1]
+        if name in ENVIRONMENT_COLUMNS:
+            data["environment"][name] = value
+        elif name in PORTFOLIO_COLUMNS:
+            data["portfolio"][name] = value
+        elif name in ("scenario_id", "as_of"):
+            data[name] = value
+    if "liquidity_buffer_months" in data["portfolio"]:
+        # CSV cells and float arrays hold whole months as "18" / 18.0.
+        data["portfolio"]["liquidity_buffer_months"] = int(float(data["portfolio"]["liquidity_buffer_months"]))
+    return parse_scenario(data, default_id=default_id)
+
+
+def iter_ndjson_scenarios(path: Path) -> Iterator[ScenarioInput]:
+    """Stream scenarios from an NDJSON file, skipping blank lines."""
+    with path.open("r", encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"Invalid JSON in {path} line {line_number}: {exc}") from exc
+            yield parse_scenario(data, default_id=f"{path.stem}_{line_number}")
+
+
+def iter_csv_scenarios(path: Path) -> Iterator[ScenarioInput]:
+    """Stream scenarios from a CSV file with a header row."""
+    with path.open("r", encoding="utf-8", newline="") as handle:
+        for row_number, row in enumerate(csv.DictReader(handle), start=1):
+            yield scenario_from_row(row, default_id=f"{path.stem}_{row_number}")
+
+
+def _load_npz(path: Path) -> Dict[str, Any]:
+    import numpy as np
+
+    with np.load(path, allow_pickle=False) as archive:
+        arrays = {name.rsplit(".", 1)[-1]: archive[name] for name in archive.files}
+    lengths = {len(array) for array in arrays.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"Columns in {path} have different lengths: {sorted(lengths)}")
+    return arrays
+
+
+def iter_npz_scenarios(path: Path) -> Iterator[ScenarioInput]:
+    """Stream scenarios row by row from a columnar ``.npz`` file."""
+    arrays = _load_npz(path)
+    names = [name for name in arrays if name in SCENARIO_COLUMNS]
+    columns = [arrays[name].tolist() for name in names]
+    for row_number, values in enumerate(zip(*columns), start=1):
+        yield scenario_from_row(dict(zip(names, values)), default_id=f"{path.stem}_{row_number}")
+
+
+def iter_npz_columns(path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator["ScenarioColumns"]:
+    """Yield ``ScenarioColumns`` slices of an ``.npz`` file with scenario defaults applied."""
+    import numpy as np
+
+    from buffet.reasoning.vectorized import ScenarioColumns
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    arrays = _load_npz(path)
+    rows = len(next(iter(arrays.values()))) if arrays else 0
+
+    def numeric(name: str, default: Any) -> Any:
+        column = np.asarray(arrays.get(name, np.full(rows, np.nan)), dtype=np.float64)
+        if default is None:
+            return column
+        return np.where(np.isnan(column), default, column)
+
+    regimes = np.asarray(arrays.get("rate_regime", np.full(rows, "")), dtype=object)
+    regimes[regimes == ""] = _DEFAULT_ENV.rate_regime
+    filled = {
+        "gross_exposure": numeric("gross_exposure", _DEFAULT_PORTFOLIO.gross_exposure),
+        "liquidity_buffer_months": numeric(
+            "liquidity_buffer_months", _DEFAULT_PORTFOLIO.liquidity_buffer_months
+        ).astype(np.int64),
+        "funding_ratio": numeric("funding_ratio", None),
+        "uncertainty": numeric("uncertainty", _DEFAULT_ENV.uncertainty),
+        "rate_regime": regimes,
+        "drawdown": numeric("drawdown", None),
+        "shortfall_probability": numeric("shortfall_probability", None),
+        "illiquid_allocation": numeric("illiquid_allocation", None),
+    }
+    for start in range(0, rows, chunk_size):
+        stop = start + chunk_size
+        yield ScenarioColumns(**{name: column[start:stop] for name, column in filled.items()})
+
+
+def save_scenarios_npz(path: Path, scenarios: Iterable[ScenarioInput]) -> int:
+    """Write scenarios as a columnar ``.npz`` file and return the row count."""
+    import numpy as np
+
+    columns: Dict[str, List[Any]] = {name: [] for name in SCENARIO_COLUMNS}
+    for scenario in scenarios:
+        row = {
+            "scenario_id": scenario.scenario_id,
+            "as_of": scenario.as_of,
+            **asdict(scenario.environment),
+            **asdict(scenario.portfolio),
+        }
+        for name in SCENARIO_COLUMNS:
+            columns[name].append(row[name])
+    arrays = {
+        name: np.asarray(values, dtype=str)
+        if name in ("scenario_id", "as_of", "rate_regime", "inflation_regime")
+        else np.asarray([np.nan if value is None else value for value in values], dtype=np.float64)
+        for name, values in columns.items()
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as handle:
+        np.savez_compressed(handle, **arrays)
+    return len(columns["scenario_id"])
+
+
+def iter_scenarios(path: Path) -> Iterator[ScenarioInput]:
+    """Stream every scenario in a file, choosing the reader by suffix."""
+    suffix = path.suffix.lower()
+    if suffix in YAML_SUFFIXES:
+        yield load_scenario(path)
+    elif suffix in NDJSON_SUFFIXES:
+        yield from iter_ndjson_scenarios(path)
+    elif suffix == ".csv":
+        yield from iter_csv_scenarios(path)
+    elif suffix == ".npz":
+        yield from iter_npz_scenarios(path)
+    else:
+        raise ValueError(f"Unsupported scenario source: {path}")
@@ -0,0 +1,251 @@
+"""Deterministic time-series replay of scenarios through the procedure.
+
+Each mandate keeps rolling state while an ordered series of observations is
+replayed:
+
+- the outcome evaluated at each step enters a window of the last
+  ``review_cycles`` observations (at least ``minimum_confirmations`` long);
+  a new outcome is confirmed once it appears ``minimum_confirmations`` times
+  in that window, so a single print never moves the state;
+- escalations are confirmed immediately, as the procedure requires for hard
+  constraint breaches and confidence collapse, and restart the window, so
+  leaving an escalation takes ``minimum_confirmations`` fresh observations;
+- the previous step's confidence level is carried forward so the recorded
+  trend is the observed direction of change.
+
+Window counts are updated in O(1) per step. Full judgment records are only
+built when a mandate's confirmed outcome changes.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import deque
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from buffet.contracts.judgment_record import JudgmentRecord
+from buffet.execution.escalation import route_escalation
+from buffet.execution.memory import RECORD_STORE_KINDS, RecordStore, open_record_store
+from buffet.execution.run_batch import expand_paths, valid_mandate_paths
+from buffet.mandates.loader import Mandate, load_mandate
+from buffet.procedures.rate_regime_adjustment import (
+    ProcedureThresholds,
+    RateRegimeAdjustmentProcedure,
+    load_thresholds,
+)
+from buffet.sensing.scenario import ScenarioInput
+from buffet.sensing.sources import iter_scenarios
+from buffet.utils.profiling import DEFAULT_PROFILE_DIR, PROFILE_MODES, RunProfiler
+
+IMMEDIATE_OUTCOMES = frozenset({"escalate"})
+
+
+@dataclass
+class MandateReplayState:
+    """Rolling persistence and confidence state for one mandate."""
+
+    window_size: int
+    minimum_confirmations: int
+    confirmed: Optional[str] = None
+    prior_confidence: Optional[float] = None
+    window: Deque[str] = field(default_factory=deque)
+    counts: Dict[str, int] = field(default_factory=dict)
+
+    def observe(self, outcome_type: str) -> bool:
+        """Add one observed outcome; return True when the confirmed outcome changes."""
+        self.window.append(outcome_type)
+        self.counts[outcome_type] = self.counts.get(outcome_type, 0) + 1
+        if len(self.window) > self.window_size:
+            dropped = self.window.popleft()
+            self.counts[dropped] -= 1
+        if outcome_type == self.confirmed:
+            return False
+        if outcome_type in IMMEDIATE_OUTCOMES:
+            # Evidence from before the escalation must not confirm a way out of it.
+            self.window = deque([outcome_type])
+            self.counts = {outcome_type: 1}
+            self.confirmed = outcome_type
+            return True
+        if self.counts[outcome_type] >= self.minimum_confirmations:
+            self.confirmed = outcome_type
+            return True
+        return False
+
+
+@dataclass(frozen=True)
+class ReplayTransition:
+    """A confirmed outcome change for one mandate at one step of the series."""
+
+    mandate_id: str
+    step: int
+    as_of: str
+    previous: Optional[str]
+    record: JudgmentRecord
+
+    @property
+    def outcome(self) -> str:
+        """Return the newly confirmed outcome type."""
+        return str(self.record.outcome.get("type"))
+
+
+class ReplayEngine:
+    """Feed an ordered scenario series through the procedure for each mandate."""
+
+    def __init__(
+        self,
+        mandates: Sequence[Mandate],
+        thresholds: ProcedureThresholds,
+        procedure: Optional[RateRegimeAdjustmentProcedure] = None,
+    ) -> None:
+        if thresholds.minimum_confirmations < 1:
+            raise ValueError("minimum_confirmations must be at least 1")
+        self.mandates = list(mandates)
+        self.thresholds = thresholds
+        self.procedure = procedure or RateRegimeAdjustmentProcedure()
+        window_size = max(thresholds.review_cycles, thresholds.minimum_confirmations)
+        self.states = {
+            mandate.mandate_id: MandateReplayState(window_size, thresholds.minimum_confirmations)
+            for mandate in self.mandates
+        }
+        self.steps = 0
+        self._last_as_of: Optional[str] = None
+
+    def step(self, scenario: ScenarioInput) -> List[ReplayTransition]:
+        """Advance every mandate by one observation and return any transitions."""
+        if self._last_as_of is not None and scenario.as_of < self._last_as_of:
+            raise ValueError(
+                f"Replay series out of order: {scenario.as_of} after {self._last_as_of} "
+                f"(scenario {scenario.scenario_id})"
+            )
+        self._last_as_of = scenario.as_of
+        transitions: List[ReplayTransition] = []
+        for mandate in self.mandates:
+            state = self.states[mandate.mandate_id]
+            prior = state.prior_confidence
+            _, confidence, outcome_type = self.procedure.evaluate(mandate, scenario, prior)
+            state.prior_confidence = confidence.level
+            previous = state.confirmed
+            if state.observe(outcome_type):
+                record = self.procedure.judge(
+                    mandate,
+                    scenario,
+                    self.thresholds,
+                    decision_latency_ms=0,
+                    prior_confidence=prior,
+                )
+                transitions.append(ReplayTransition(mandate.mandate_id, self.steps, scenario.as_of, previous, record))
+        self.steps += 1
+        return transitions
+
+    def replay(self, scenarios: Iterable[ScenarioInput]) -> Iterator[ReplayTransition]:
+        """Replay a series, yielding transitions as they are confirmed."""
+        for scenario in scenarios:
+            yield from self.step(scenario)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser."""
+    parser = argparse.ArgumentParser(description="Replay an ordered scenario series and record outcome transitions.")
+    parser.add_argument(
+        "--mandates",
+        required=True,
+        nargs="+",
+        help="Glob pattern(s) for mandate YAML files",
+    )
+    parser.add_argument(
+        "--series",
+        required=True,
+        nargs="+",
+        help="Scenario file(s) in time order (NDJSON, CSV, .npz or YAML), sorted by as_of",
+    )
+    parser.add_argument(
+        "--thresholds",
+        default="judgment_loops/rate_regime_adjustment/thresholds.yaml",
+        help="Path to procedure thresholds YAML",
+    )
+    parser.add_argument(
+        "--out-dir",
+        default="data/processed/judgment_records",
+        help="Output directory for transition records",
+    )
+    parser.add_argument(
+        "--escalations-dir",
+        default="data/processed/escalations",
+        help="Output directory for escalation stubs routed for human review",
+    )
+    parser.add_argument(
+        "--store",
+        choices=RECORD_STORE_KINDS,
+        default="yaml",
+        help="Record storage backend for transition records",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Report transitions without writing records")
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="cprofile",
+        choices=PROFILE_MODES,
+        help="Profile the run with cProfile (the default) or the low-overhead stack sampler ('sample', for"
+        " flamegraphs); write the artifacts and a hot-function report to --profile-dir",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default=str(DEFAULT_PROFILE_DIR),
+        help="Output directory for --profile artifacts",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Replay the series and persist one record per transition."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    mandate_paths = expand_paths(args.mandates)
+    if not mandate_paths:
+        print(f"No mandates matched: {' '.join(args.mandates)}")
+        return 1
+    mandate_paths = valid_mandate_paths(mandate_paths)
+    if not mandate_paths:
+        print("No valid mandates to replay")
+        return 1
+    engine = ReplayEngine([load_mandate(path) for path in mandate_paths], load_thresholds(Path(args.thresholds)))
+    series = (scenario for path in args.series for scenario in iter_scenarios(Path(path)))
+
+    start = perf_counter()
+    store: Optional[RecordStore] = None if args.dry_run else open_record_store(args.store, Path(args.out_dir))
+    transitions = 0
+    profiler = RunProfiler("replay", Path(args.profile_dir), mode=args.profile) if args.profile else None
+    try:
+        with profiler or nullcontext():
+            for transition in engine.replay(series):
+                transitions += 1
+                print(
+                    f"{transition.as_of} {transition.mandate_id}: "
+                    f"{transition.previous or '-'} -> {transition.outcome}"
+                )
+                if store is not None:
+                    store.append(transition.record)
+                    if transition.record.escalation is not None:
+                        route_escalation(transition.record, Path(args.escalations_dir))
+    finally:
+        if store is not None:
+            store.close()
+
+    print(
+        f"Replayed {engine.steps} observations across {len(engine.mandates)} mandates "
+        f"in {perf_counter() - start:.3f}s; {transitions} transitions."
+    )
+    if profiler is not None:
+        artifacts = profiler.save(mandates=len(engine.mandates), procedures=1, scenarios=engine.steps)
+        print(artifacts.report)
+        print(f"Wrote profile: {', '.join(str(path) for path in artifacts.paths)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
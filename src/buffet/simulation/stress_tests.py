@@ -0,0 +1,529 @@
+"""Declarative stress grids and outcome surfaces for mandates.
+
+A stress spec names a base scenario and one shock axis per scenario field::
+
+    stress_test_id: rate_shock_grid
+    base_scenario: ../scenarios/rising_rates_2022.yaml   # relative to the spec
+    tolerance: 0.001
+    shocks:
+      rate_regime:
+        values: [stable, rising_rates]
+      uncertainty:
+        bumps: {start: 0.0, stop: 0.6, steps: 7}
+      funding_ratio:
+        scale: [0.8, 0.9, 1.0]
+
+``values`` sets the field, ``bumps`` adds to the base value and ``scale``
+multiplies it; each takes a list or a ``{start, stop, steps}`` range. The grid
+is the product of all axes. It is never materialized: grid points are decoded
+from their flat index, so chunks of any size can be judged in worker
+processes.
+
+The report gives, per mandate, outcome counts over the grid and the
+breakpoints where the outcome flips along each numeric axis. Breakpoints are
+found by bisecting the axis span on every line through the other axes, so a
+line costs O(flips × log(span / tolerance)) evaluations instead of one per
+grid step. Bisection saves the steps along an axis, not the lines: each
+numeric axis has ``grid_size / len(axis)`` lines, the product of the other
+axes' sizes, so breakpoint search still grows exponentially with the number
+of axes, as does the outcome count over the full grid. Keep the other axes
+coarse in high-dimensional specs; ``--breakpoints-only`` drops the grid count
+but not the lines. Whole-number fields (``liquidity_buffer_months``) are bisected and
+reported in field units down to adjacent integers, whatever the shock mode;
+other axes are bisected and reported in shock units. Bisection assumes a flip
+and its reversal are never closer than ``tolerance``; the outcome rule is
+monotone in every shipped constraint.
+"""
+
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+from math import prod
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import yaml
+
+from buffet.execution.run_batch import expand_paths, valid_mandate_paths
+from buffet.mandates.loader import Mandate, load_mandate
+from buffet.procedures.rate_regime_adjustment import RateRegimeAdjustmentProcedure
+from buffet.sensing.scenario import ScenarioInput, load_scenario, parse_scenario
+from buffet.utils.yaml_cache import SafeDumper, load_yaml
+
+OUTCOME_ORDER = ("affirm_alignment", "recommend_adjustment", "escalate")
+ENVIRONMENT_FIELDS = ("rate_regime", "inflation_regime", "uncertainty")
+PORTFOLIO_FIELDS = (
+    "gross_exposure",
+    "liquidity_buffer_months",
+    "funding_ratio",
+    "drawdown",
+    "shortfall_probability",
+    "illiquid_allocation",
+)
+CATEGORICAL_FIELDS = ("rate_regime", "inflation_regime")
+SHOCK_MODES = ("values", "bumps", "scale")
+DEFAULT_TOLERANCE = 1e-3
+DEFAULT_CHUNK_SIZE = 4096
+
+_Task = Tuple[str, int, int, int]
+_TaskResult = Tuple[List[Dict[str, int]], List["Breakpoint"], int]
+_worker_inputs: Optional[Tuple["StressSpec", Sequence[Mandate]]] = None
+
+
+@dataclass(frozen=True)
+class ShockAxis:
+    """One scenario field and the shocks applied to it."""
+
+    field: str
+    mode: str
+    shocks: Tuple[Any, ...]
+
+    @property
+    def numeric(self) -> bool:
+        """Return True when the axis can be bisected."""
+        return self.field not in CATEGORICAL_FIELDS
+
+    @property
+    def integral(self) -> bool:
+        """Return True when the field holds whole numbers."""
+        return self.field == "liquidity_buffer_months"
+
+    def apply(self, base_value: Any, shock: Any) -> Any:
+        """Return the field value after applying one shock to the base value."""
+        if self.mode == "values":
+            value = shock
+        elif self.mode == "bumps":
+            value = base_value + shock
+        else:
+            value = base_value * shock
+        return int(round(value)) if self.integral else value
+
+
+@dataclass(frozen=True)
+class StressSpec:
+    """Base scenario plus shock axes defining a lazily expanded grid."""
+
+    stress_test_id: str
+    base: ScenarioInput
+    axes: Tuple[ShockAxis, ...]
+    tolerance: float = DEFAULT_TOLERANCE
+
+    @property
+    def grid_size(self) -> int:
+        """Return the number of points in the full grid."""
+        return prod(len(axis.shocks) for axis in self.axes)
+
+    def point(self, index: int, axes: Optional[Sequence[int]] = None) -> Dict[int, Any]:
+        """Decode a flat index into shock values for the given axis positions (all by default)."""
+        positions = range(len(self.axes)) if axes is None else axes
+        shocks: Dict[int, Any] = {}
+        for position in reversed(positions):
+            values = self.axes[position].shocks
+            index, offset = divmod(index, len(values))
+            shocks[position] = values[offset]
+        return shocks
+
+    def base_value(self, axis: ShockAxis) -> Any:
+        """Return the base scenario's value for an axis's field."""
+        section = self.base.environment if axis.field in ENVIRONMENT_FIELDS else self.base.portfolio
+        return getattr(section, axis.field)
+
+    def field_axis(self, position: int) -> "StressSpec":
+        """Return a spec whose axis at ``position`` sets the shocked field values directly."""
+        axis = self.axes[position]
+        values = tuple(axis.apply(self.base_value(axis), shock) for shock in axis.shocks)
+        axes = self.axes[:position] + (ShockAxis(axis.field, "values", values),) + self.axes[position + 1 :]
+        return replace(self, axes=axes)
+
+    def scenario(self, shocks: Mapping[int, Any]) -> ScenarioInput:
+        """Build the scenario for shock values keyed by axis position."""
+        environment: Dict[str, Any] = {}
+        portfolio: Dict[str, Any] = {}
+        for position, shock in shocks.items():
+            axis = self.axes[position]
+            value = axis.apply(self.base_value(axis), shock)
+            if axis.field in ENVIRONMENT_FIELDS:
+                environment[axis.field] = value
+            else:
+                portfolio[axis.field] = value
+        return replace(
+            self.base,
+            environment=replace(self.base.environment, **environment),
+            portfolio=replace(self.base.portfolio, **portfolio),
+        )
+
+
+@dataclass(frozen=True)
+class Breakpoint:
+    """Bracket along one axis where a mandate's outcome flips."""
+
+    mandate_id: str
+    axis: str
+    fixed: Tuple[Tuple[str, Any], ...]
+    below: str
+    above: str
+    lower: Any
+    upper: Any
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the breakpoint for the stress report."""
+        return {
+            "axis": self.axis,
+            "fixed": dict(self.fixed),
+            "from": self.below,
+            "to": self.above,
+            "between": [self.lower, self.upper],
+        }
+
+
+@dataclass
+class OutcomeSurface:
+    """Outcome counts and breakpoints for one mandate."""
+
+    mandate_id: str
+    outcome_counts: Dict[str, int] = field(default_factory=dict)
+    breakpoints: List[Breakpoint] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the surface for the stress report."""
+        return {
+            "mandate_id": self.mandate_id,
+            "outcome_counts": {name: self.outcome_counts.get(name, 0) for name in OUTCOME_ORDER},
+            "breakpoints": [breakpoint.to_dict() for breakpoint in self.breakpoints],
+        }
+
+
+@dataclass(frozen=True)
+class StressReport:
+    """Outcome surfaces for every mandate plus run statistics."""
+
+    stress_test_id: str
+    grid_size: int
+    evaluations: int
+    elapsed_seconds: float
+    surfaces: List[OutcomeSurface]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the report as written by the CLI."""
+        return {
+            "stress_test_id": self.stress_test_id,
+            "grid_size": self.grid_size,
+            "evaluations": self.evaluations,
+            "elapsed_seconds": round(self.elapsed_seconds, 6),
+            "surfaces": [surface.to_dict() for surface in self.surfaces],
+        }
+
+
+def _shock_values(name: str, mode: str, raw: Any) -> Tuple[Any, ...]:
+    """Expand a shock list or ``{start, stop, steps}`` range."""
+    if isinstance(raw, Mapping):
+        try:
+            start, stop, steps = float(raw["start"]), float(raw["stop"]), int(raw["steps"])
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f"Shock range for {name} needs numeric start, stop and steps") from exc
+        if steps < 1:
+            raise ValueError(f"Shock range for {name} needs at least one step")
+        if steps == 1:
+            return (start,)
+        step = (stop - start) / (steps - 1)
+        return tuple(round(start + offset * step, 12) for offset in range(steps))
+    if not isinstance(raw, list) or not raw:
+        raise ValueError(f"Shock {mode} for {name} must be a non-empty list or range")
+    return tuple(raw)
+
+
+def parse_stress_spec(data: Mapping[str, Any], base_dir: Path = Path(".")) -> StressSpec:
+    """Build a stress spec from a parsed YAML mapping."""
+    base_path = data.get("base_scenario")
+    if base_path:
+        base = load_scenario(base_dir / base_path)
+    else:
+        base = parse_scenario(data.get("base") or {}, default_id="stress_base")
+
+    shocks = data.get("shocks") or {}
+    if not isinstance(shocks, Mapping) or not shocks:
+        raise ValueError("Stress spec needs at least one shock axis")
+    axes = []
+    for name, definition in shocks.items():
+        if name not in ENVIRONMENT_FIELDS + PORTFOLIO_FIELDS:
+            raise ValueError(f"Unknown shock field: {name}")
+        modes = [mode for mode in SHOCK_MODES if mode in (definition or {})]
+        if len(modes) != 1:
+            raise ValueError(f"Shock {name} needs exactly one of: {', '.join(SHOCK_MODES)}")
+        mode = modes[0]
+        if name in CATEGORICAL_FIELDS and mode != "values":
+            raise ValueError(f"Shock {name} is categorical and only supports values")
+        section = base.environment if name in ENVIRONMENT_FIELDS else base.portfolio
+        if mode != "values" and getattr(section, name) is None:
+            raise ValueError(f"Shock {name} uses {mode} but the base scenario has no {name}")
+        axes.append(ShockAxis(field=name, mode=mode, shocks=_shock_values(name, mode, definition[mode])))
+
+    tolerance = float(data.get("tolerance", DEFAULT_TOLERANCE))
+    if tolerance <= 0:
+        raise ValueError("tolerance must be positive")
+    return StressSpec(
+        stress_test_id=str(data.get("stress_test_id") or "stress_test"),
+        base=base,
+        axes=tuple(axes),
+        tolerance=tolerance,
+    )
+
+
+def load_stress_spec(path: Path) -> StressSpec:
+    """Load a stress spec YAML; ``base_scenario`` resolves relative to the spec."""
+    data = load_yaml(path)
+    if not isinstance(data, dict):
+        raise ValueError(f"Stress spec at {path} is empty or invalid")
+    return parse_stress_spec(data, base_dir=path.parent)
+
+
+def _bisect_flips(
+    outcome_at: Callable[[Any], str],
+    axis: ShockAxis,
+    tolerance: float,
+    lower: Any,
+    upper: Any,
+    lower_outcome: str,
+    upper_outcome: str,
+) -> Iterator[Tuple[Any, Any, str, str]]:
+    """Yield (lower, upper, outcome below, outcome above) brackets between two shock values."""
+    if lower_outcome == upper_outcome:
+        return
+    if axis.integral:
+        if upper - lower <= 1:
+            yield lower, upper, lower_outcome, upper_outcome
+            return
+        middle = (lower + upper) // 2
+    else:
+        if upper - lower <= tolerance:
+            yield lower, upper, lower_outcome, upper_outcome
+            return
+        middle = (lower + upper) / 2
+    middle_outcome = outcome_at(middle)
+    yield from _bisect_flips(outcome_at, axis, tolerance, lower, middle, lower_outcome, middle_outcome)
+    yield from _bisect_flips(outcome_at, axis, tolerance, middle, upper, middle_outcome, upper_outcome)
+
+
+def _count_grid(spec: StressSpec, mandates: Sequence[Mandate], start: int, stop: int) -> _TaskResult:
+    """Count outcomes per mandate over a range of flat grid indices."""
+    procedure = RateRegimeAdjustmentProcedure()
+    counts: List[Dict[str, int]] = [{} for _ in mandates]
+    for index in range(start, stop):
+        scenario = spec.scenario(spec.point(index))
+        for mandate, mandate_counts in zip(mandates, counts):
+            outcome = procedure.evaluate(mandate, scenario)[2]
+            mandate_counts[outcome] = mandate_counts.get(outcome, 0) + 1
+    return counts, [], (stop - start) * len(mandates)
+
+
+def _bisect_lines(
+    spec: StressSpec,
+    mandates: Sequence[Mandate],
+    position: int,
+    start: int,
+    stop: int,
+) -> _TaskResult:
+    """Find breakpoints along one axis for a range of lines through the other axes."""
+    procedure = RateRegimeAdjustmentProcedure()
+    if spec.axes[position].integral:
+        # A whole-number field is bisected in field units: one shock unit of a scale can span many months.
+        spec = spec.field_axis(position)
+    axis = spec.axes[position]
+    others = [other for other in range(len(spec.axes)) if other != position]
+    lower, upper = min(axis.shocks), max(axis.shocks)
+    breakpoints: List[Breakpoint] = []
+    evaluations = 0
+    for line in range(start, stop):
+        shocks = spec.point(line, others)
+        fixed = tuple((spec.axes[other].field, shocks[other]) for other in others)
+        for mandate in mandates:
+
+            def outcome_at(value: Any) -> str:
+                nonlocal evaluations
+                evaluations += 1
+                return procedure.evaluate(mandate, spec.scenario({**shocks, position: value}))[2]
+
+            for low, high, below, above in _bisect_flips(
+                outcome_at, axis, spec.tolerance, lower, upper, outcome_at(lower), outcome_at(upper)
+            ):
+                breakpoints.append(Breakpoint(mandate.mandate_id, axis.field, fixed, below, above, low, high))
+    return [], breakpoints, evaluations
+
+
+def _run_task(spec: StressSpec, mandates: Sequence[Mandate], task: _Task) -> _TaskResult:
+    kind, position, start, stop = task
+    if kind == "grid":
+        return _count_grid(spec, mandates, start, stop)
+    return _bisect_lines(spec, mandates, position, start, stop)
+
+
+def _init_worker(spec: StressSpec, mandates: Sequence[Mandate]) -> None:
+    """Install stress inputs once per worker process."""
+    global _worker_inputs
+    _worker_inputs = (spec, mandates)
+
+
+def _run_worker_task(task: _Task) -> _TaskResult:
+    if _worker_inputs is None:
+        raise RuntimeError("Stress worker used before initialization")
+    return _run_task(*_worker_inputs, task)
+
+
+def _iter_tasks(spec: StressSpec, chunk_size: int, count_grid: bool) -> Iterator[_Task]:
+    """Split the grid count and each axis's bisection lines into chunks."""
+    if count_grid:
+        for start in range(0, spec.grid_size, chunk_size):
+            yield "grid", -1, start, min(start + chunk_size, spec.grid_size)
+    # A bisection line costs several evaluations, so lines use smaller chunks.
+    line_chunk = max(1, chunk_size // 16)
+    for position, axis in enumerate(spec.axes):
+        if not axis.numeric:
+            continue
+        lines = spec.grid_size // len(axis.shocks)
+        for start in range(0, lines, line_chunk):
+            yield "lines", position, start, min(start + line_chunk, lines)
+
+
+def _iter_results(
+    spec: StressSpec,
+    mandates: Sequence[Mandate],
+    tasks: Iterable[_Task],
+    workers: int,
+) -> Iterator[_TaskResult]:
+    """Run tasks in-process or across a bounded process pool."""
+    if workers <= 1:
+        for task in tasks:
+            yield _run_task(spec, mandates, task)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(spec, mandates)) as executor:
+        pending: List[Future[_TaskResult]] = []
+        for task in tasks:
+            pending.append(executor.submit(_run_worker_task, task))
+            if len(pending) < workers * 2:
+                continue
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            pending = [future for future in pending if future not in done]
+            for future in done:
+                yield future.result()
+        for future in pending:
+            yield future.result()
+
+
+def run_stress_test(
+    spec: StressSpec,
+    mandates: Sequence[Mandate],
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    count_grid: bool = True,
+) -> StressReport:
+    """Evaluate the stress grid for each mandate and locate outcome breakpoints."""
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    start = perf_counter()
+    surfaces = [OutcomeSurface(mandate.mandate_id) for mandate in mandates]
+    by_id = {surface.mandate_id: surface for surface in surfaces}
+    evaluations = 0
+    for counts, breakpoints, task_evaluations in _iter_results(
+        spec, mandates, _iter_tasks(spec, chunk_size, count_grid), workers
+    ):
+        evaluations += task_evaluations
+        for surface, mandate_counts in zip(surfaces, counts):
+            for outcome, count in mandate_counts.items():
+                surface.outcome_counts[outcome] = surface.outcome_counts.get(outcome, 0) + count
+        for breakpoint in breakpoints:
+            by_id[breakpoint.mandate_id].breakpoints.append(breakpoint)
+    for surface in surfaces:
+        surface.breakpoints.sort(key=lambda item: (item.axis, item.fixed, item.lower))
+    return StressReport(
+        stress_test_id=spec.stress_test_id,
+        grid_size=spec.grid_size,
+        evaluations=evaluations,
+        elapsed_seconds=perf_counter() - start,
+        surfaces=surfaces,
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Run a stress grid and report outcome surfaces per mandate.",
+        epilog="Cost grows with the product of all axis sizes: the grid count evaluates every point and breakpoint"
+        " search bisects every line through the other axes, so keep axes coarse when adding dimensions.",
+    )
+    parser.add_argument("--spec", required=True, help="Path to a stress spec YAML")
+    parser.add_argument(
+        "--mandates",
+        required=True,
+        nargs="+",
+        help="Glob pattern(s) for mandate YAML files",
+    )
+    parser.add_argument(
+        "--out-dir",
+        default="data/processed/stress",
+        help="Output directory for the stress report",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes (1 runs in-process)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Grid points per worker task",
+    )
+    parser.add_argument(
+        "--breakpoints-only",
+        action="store_true",
+        help="Skip counting outcomes over the full grid; only bisect for breakpoints (still one bisection per"
+        " line through the other axes, i.e. grid size / axis length lines per numeric axis)",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the stress spec and write its report."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    mandate_paths = expand_paths(args.mandates)
+    if not mandate_paths:
+        print(f"No mandates matched: {' '.join(args.mandates)}")
+        return 1
+    mandate_paths = valid_mandate_paths(mandate_paths)
+    if not mandate_paths:
+        print("No valid mandates to stress")
+        return 1
+    spec = load_stress_spec(Path(args.spec))
+    report = run_stress_test(
+        spec,
+        [load_mandate(path) for path in mandate_paths],
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        count_grid=not args.breakpoints_only,
+    )
+
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_path = out_dir / f"{spec.stress_test_id}.yaml"
+    with out_path.open("w", encoding="utf-8") as handle:
+        yaml.dump(report.to_dict(), handle, Dumper=SafeDumper, sort_keys=False)
+
+    print(
+        f"Stress test {spec.stress_test_id}: {report.grid_size} grid points, "
+        f"{report.evaluations} evaluations in {report.elapsed_seconds:.3f}s."
+    )
+    for surface in report.surfaces:
+        counts = ", ".join(f"{name}={surface.outcome_counts.get(name, 0)}" for name in OUTCOME_ORDER)
+        print(f"  {surface.mandate_id}: {counts}; {len(surface.breakpoints)} breakpoints")
+    print(f"Report written to {out_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
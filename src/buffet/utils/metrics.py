@@ -0,0 +1,437 @@
+"""Runtime metrics registry with Prometheus text and OpenMetrics exposition.
+
+Execution modules update the process-wide registry through the helpers at
+the bottom of this module (``observe_judgment``, ``observe_escalation``,
+``observe_write_failure``). Every series is labelled by ``mandate_id`` and
+``procedure_id``. All series of a registry share one lock, and
+``observe_judgment`` updates its series under a single acquisition after one
+dict lookup, so metrics stay on in the batch hot path.
+
+Export either way:
+
+- ``write_textfile`` atomically replaces a ``.prom`` file for the
+  node_exporter textfile collector;
+- ``serve_metrics`` starts a background ``GET /metrics`` endpoint, and the
+  judgment daemon serves the same route. Scrapers asking for
+  ``application/openmetrics-text`` get OpenMetrics.
+
+Worker processes keep their own registries; ``run_batch`` folds worker
+results into the parent's registry from the returned records.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+DEFAULT_LATENCY_BUCKETS = (
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self, lock: threading.Lock) -> None:
+        self.value = 0.0
+        self._lock = lock
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the counter; ``amount`` must not be negative."""
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        with self._lock:
+            self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self, lock: threading.Lock) -> None:
+        self.value = 0.0
+        self._lock = lock
+
+    def set(self, value: float) -> None:
+        """Set the gauge to a value."""
+        self.value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Add to the gauge (use a negative amount to decrease it)."""
+        with self._lock:
+            self.value += amount
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "count", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...], lock: threading.Lock) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = lock
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        with self._lock:
+            self._observe(value)
+
+    def _observe(self, value: float) -> None:
+        # Caller holds the registry lock.
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricFamily:
+    """One named metric with a fixed set of label names."""
+
+    kind = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        lock: Optional[threading.Lock] = None,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = lock or threading.Lock()
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def labels(self, *values: str) -> Any:
+        """Return the child series for these label values (positional, in label-name order)."""
+        child = self._children.get(values)
+        if child is not None:
+            return child
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+        with self._lock:
+            return self._children.setdefault(tuple(str(value) for value in values), self._new_child())
+
+    def clear(self) -> None:
+        """Drop every child series."""
+        with self._lock:
+            self._children.clear()
+
+    def _items(self) -> List[Tuple[Tuple[str, ...], Any]]:
+        with self._lock:
+            return sorted(self._children.items())
+
+    def _family_name(self, openmetrics: bool) -> str:
+        return self.name
+
+    def expose(self, openmetrics: bool = False) -> Iterator[str]:
+        """Yield exposition lines for this family."""
+        family = self._family_name(openmetrics)
+        yield f"# HELP {family} {_escape(self.documentation)}"
+        yield f"# TYPE {family} {self.kind}"
+        yield from self._samples()
+
+    def _samples(self) -> Iterator[str]:
+        for values, child in self._items():
+            yield f"{self.name}{_label_text(self.labelnames, values)} {_format_value(child.value)}"
+
+
+class Counter(MetricFamily):
+    """Monotonically increasing count; the name should end in ``_total``."""
+
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild(self._lock)
+
+    def _family_name(self, openmetrics: bool) -> str:
+        # OpenMetrics names the counter family without its _total sample suffix.
+        if openmetrics and self.name.endswith("_total"):
+            return self.name[: -len("_total")]
+        return self.name
+
+
+class Gauge(MetricFamily):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild(self._lock)
+
+
+class Histogram(MetricFamily):
+    """Observations counted into fixed cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        lock: Optional[threading.Lock] = None,
+    ) -> None:
+        super().__init__(name, documentation, labelnames, lock)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets if not math.isinf(bound)))
+        if not self.buckets:
+            raise ValueError("Histogram needs at least one finite bucket")
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets, self._lock)
+
+    def _samples(self) -> Iterator[str]:
+        for values, child in self._items():
+            with self._lock:
+                counts, total, count = list(child.counts), child.sum, child.count
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                labels = _label_text(self.labelnames, values, f'le="{_format_value(bound)}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _label_text(self.labelnames, values)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+class MetricsRegistry:
+    """Named metric families rendered together.
+
+    Families created through the registry share its ``lock``, so callers
+    updating several series at once can take it a single time.
+    """
+
+    def __init__(self) -> None:
+        self.families: Dict[str, MetricFamily] = {}
+        self.lock = threading.Lock()
+
+    def register(self, family: MetricFamily) -> MetricFamily:
+        """Add a family; names must be unique."""
+        with self.lock:
+            if family.name in self.families:
+                raise ValueError(f"Metric already registered: {family.name}")
+            self.families[family.name] = family
+        return family
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Create and register a counter."""
+        return self.register(Counter(name, documentation, labelnames, self.lock))  # type: ignore[return-value]
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Create and register a gauge."""
+        return self.register(Gauge(name, documentation, labelnames, self.lock))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Create and register a histogram."""
+        family = Histogram(name, documentation, labelnames, buckets, self.lock)
+        return self.register(family)  # type: ignore[return-value]
+
+    def clear(self) -> None:
+        """Drop every series while keeping the families registered."""
+        for family in list(self.families.values()):
+            family.clear()
+        if self is _default_registry:
+            _judgment_series.clear()
+
+    def render(self, openmetrics: bool = False) -> str:
+        """Render every family in Prometheus text format, or OpenMetrics."""
+        lines: List[str] = []
+        for name in sorted(self.families):
+            lines.extend(self.families[name].expose(openmetrics))
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def write_textfile(path: Path, registry: Optional[MetricsRegistry] = None) -> Path:
+    """Atomically write the registry as a Prometheus textfile (``*.prom``)."""
+    registry = registry or _default_registry
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(registry.render(), encoding="utf-8")
+    os.replace(tmp_path, path)
+    return path
+
+
+def negotiate(accept: Optional[str]) -> Tuple[bool, str]:
+    """Return (openmetrics, content type) for a scrape request's Accept header."""
+    if accept and "application/openmetrics-text" in accept:
+        return True, OPENMETRICS_CONTENT_TYPE
+    return False, PROMETHEUS_CONTENT_TYPE
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry
+
+    def do_GET(self) -> None:
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        openmetrics, content_type = negotiate(self.headers.get("Accept"))
+        body = self.registry.render(openmetrics).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        return
+
+
+def serve_metrics(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    registry: Optional[MetricsRegistry] = None,
+) -> ThreadingHTTPServer:
+    """Serve ``GET /metrics`` from a daemon thread; call ``shutdown()`` to stop."""
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry or _default_registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="buffet-metrics", daemon=True).start()
+    return server
+
+
+_default_registry = MetricsRegistry()
+
+
+def default_registry() -> MetricsRegistry:
+    """Return the process-wide metrics registry."""
+    return _default_registry
+
+
+JUDGMENT_LABELS = ("mandate_id", "procedure_id")
+
+JUDGMENTS = _default_registry.counter(
+    "buffet_judgments_total", "Judgments produced, by outcome type.", JUDGMENT_LABELS + ("outcome",)
+)
+JUDGMENT_LATENCY = _default_registry.histogram(
+    "buffet_judgment_latency_seconds", "Wall time of the procedure call per judgment.", JUDGMENT_LABELS
+)
+LAST_JUDGMENT = _default_registry.gauge(
+    "buffet_last_judgment_timestamp_seconds", "Unix time of the most recent judgment.", JUDGMENT_LABELS
+)
+CACHE_LOOKUPS = _default_registry.counter(
+    "buffet_judgment_cache_lookups_total",
+    "Judgment cache lookups, by result (hit or miss).",
+    JUDGMENT_LABELS + ("result",),
+)
+ESCALATIONS = _default_registry.counter(
+    "buffet_escalations_routed_total", "Escalation stubs written for human review.", JUDGMENT_LABELS
+)
+WRITE_FAILURES = _default_registry.counter(
+    "buffet_write_failures_total",
+    "Failed record or escalation writes, by target and reason (collision or io_error).",
+    JUDGMENT_LABELS + ("target", "reason"),
+)
+
+
+class _JudgmentSeries:
+    """The judgment series of one (mandate_id, procedure_id) pair, resolved once."""
+
+    __slots__ = ("labels", "outcomes", "latency", "last", "cache")
+
+    def __init__(self, mandate_id: str, procedure_id: str) -> None:
+        self.labels = (mandate_id, procedure_id)
+        self.outcomes: Dict[str, _CounterChild] = {}
+        self.latency: _HistogramChild = JUDGMENT_LATENCY.labels(mandate_id, procedure_id)
+        self.last: _GaugeChild = LAST_JUDGMENT.labels(mandate_id, procedure_id)
+        self.cache: Dict[bool, _CounterChild] = {}
+
+    def outcome(self, outcome: str) -> _CounterChild:
+        child = self.outcomes.get(outcome)
+        if child is None:
+            child = self.outcomes[outcome] = JUDGMENTS.labels(*self.labels, outcome)
+        return child
+
+    def cache_lookup(self, hit: bool) -> _CounterChild:
+        child = self.cache.get(hit)
+        if child is None:
+            child = self.cache[hit] = CACHE_LOOKUPS.labels(*self.labels, "hit" if hit else "miss")
+        return child
+
+
+_judgment_series: Dict[Tuple[str, str], _JudgmentSeries] = {}
+
+
+def observe_judgment(
+    mandate_id: str,
+    procedure_id: str,
+    outcome: str,
+    latency_ns: int,
+    cache_hit: Optional[bool] = None,
+) -> None:
+    """Count one judgment and record its latency."""
+    series = _judgment_series.get((mandate_id, procedure_id))
+    if series is None:
+        series = _judgment_series[(mandate_id, procedure_id)] = _JudgmentSeries(mandate_id, procedure_id)
+    counter = series.outcome(outcome)
+    lookups = series.cache_lookup(cache_hit) if cache_hit is not None else None
+    now = time.time()
+    with _default_registry.lock:
+        counter.value += 1
+        series.latency._observe(latency_ns / 1e9)
+        series.last.value = now
+        if lookups is not None:
+            lookups.value += 1
+
+
+def observe_escalation(mandate_id: str, procedure_id: str) -> None:
+    """Count one routed escalation."""
+    ESCALATIONS.labels(mandate_id, procedure_id).inc()
+
+
+def observe_write_failure(mandate_id: str, procedure_id: str, target: str, error: BaseException) -> None:
+    """Count a failed write; ``FileExistsError`` counts as a collision."""
+    reason = "collision" if isinstance(error, FileExistsError) else "io_error"
+    WRITE_FAILURES.labels(mandate_id, procedure_id, target, reason).inc()
@@ -0,0 +1,246 @@
+"""Opt-in run profiling: cProfile stats or sampled flamegraph stacks, plus a hot-function report.
+
+CLIs with ``--profile [cprofile|sample]`` wrap their run in a ``RunProfiler``
+in one of two modes. ``save`` writes the artifacts under ``data/profiles/``,
+named after the run and tagged with its mandate, procedure and scenario
+counts:
+
+- ``cprofile`` (the default) traces every call and writes ``<stem>.pstats``
+  (load with ``pstats`` or snakeviz) and ``<stem>.txt``, the hottest
+  ``buffet.*`` functions by own time;
+- ``sample`` runs a background thread that samples the profiled thread's
+  Python stack every ``interval`` seconds and writes ``<stem>.collapsed``
+  (one ``frame;frame;frame count`` line per stack, ready for
+  ``flamegraph.pl`` or speedscope) and ``<stem>.txt``, the ``buffet.*``
+  functions sampled most often at the top of the stack.
+
+The modes never run together. cProfile's tracing cost is paid per call, so
+it inflates small, call-heavy functions far more than the rest, and stacks
+sampled under it would show that distortion rather than where the run
+spends its time. cProfile timings carry the same skew, so use them for call
+counts and call paths and the sampled flamegraph for proportions. The
+sampler itself only takes the GIL briefly once per interval.
+
+Without ``--profile`` no profiler is created, so runs pay nothing.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import os
+import pstats
+import sys
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from types import FrameType
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_PROFILE_DIR = Path("data/profiles")
+DEFAULT_SAMPLE_INTERVAL = 0.001
+PROFILE_MODES = ("cprofile", "sample")
+REPORT_LIMIT = 20
+PACKAGE = "buffet"
+
+
+@dataclass(frozen=True)
+class HotFunction:
+    """One function's share of a profiled run."""
+
+    function: str
+    calls: int
+    own_seconds: float
+    cumulative_seconds: float
+
+
+@dataclass(frozen=True)
+class ProfileArtifacts:
+    """Files written for one profiled run; only the active mode's data file is set."""
+
+    pstats_path: Optional[Path]
+    collapsed_path: Optional[Path]
+    report_path: Path
+    report: str
+
+    @property
+    def paths(self) -> Tuple[Path, ...]:
+        """Return every written file."""
+        return tuple(path for path in (self.pstats_path, self.collapsed_path, self.report_path) if path is not None)
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    spec = frame.f_globals.get("__spec__")
+    module = spec.name if spec is not None else frame.f_globals.get("__name__", "?")
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class StackSampler:
+    """Samples one thread's Python stack on a timer into collapsed-stack counts."""
+
+    def __init__(self, thread_id: int, root: Optional[FrameType], interval: float = DEFAULT_SAMPLE_INTERVAL) -> None:
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.thread_id = thread_id
+        self.root = root
+        self.interval = interval
+        self.counts: Dict[str, int] = {}
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="buffet-stack-sampler", daemon=True)
+
+    def _collapse(self, frame: FrameType) -> str:
+        labels = []
+        current: Optional[FrameType] = frame
+        while current is not None:
+            labels.append(_frame_label(current))
+            if current is self.root:
+                break
+            current = current.f_back
+        return ";".join(reversed(labels))
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = self._collapse(frame)
+            self.counts[stack] = self.counts.get(stack, 0) + 1
+            self.samples += 1
+
+    def start(self) -> None:
+        """Start sampling in a daemon thread."""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the thread."""
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        """Return the samples in collapsed-stack format, heaviest stacks first."""
+        ordered = sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))
+        return "".join(f"{stack} {count}\n" for stack, count in ordered)
+
+
+def _package_path(filename: str, package: str) -> Optional[str]:
+    marker = f"{os.sep}{package}{os.sep}"
+    position = filename.rfind(marker)
+    if position < 0:
+        return None
+    return filename[position + 1 :].replace(os.sep, "/")
+
+
+def hot_functions(stats: pstats.Stats, package: str = PACKAGE, limit: int = REPORT_LIMIT) -> List[HotFunction]:
+    """Return the package's functions with the most own time, hottest first (the profiler itself excluded)."""
+    rows = []
+    for (filename, lineno, name), (_, calls, own, cumulative, _) in stats.stats.items():  # type: ignore[attr-defined]
+        if filename == __file__:
+            continue
+        path = _package_path(filename, package)
+        if path is not None:
+            rows.append(HotFunction(f"{path}:{lineno}({name})", calls, own, cumulative))
+    rows.sort(key=lambda row: (-row.own_seconds, row.function))
+    return rows[:limit]
+
+
+def sampled_functions(
+    counts: Dict[str, int], interval: float, package: str = PACKAGE, limit: int = REPORT_LIMIT
+) -> List[HotFunction]:
+    """Estimate the package's hottest functions from sampled stacks (``calls`` holds sample counts).
+
+    Own time counts samples with the function at the top of the stack;
+    cumulative time counts samples with it anywhere on the stack.
+    """
+    own: Dict[str, int] = {}
+    cumulative: Dict[str, int] = {}
+    for stack, count in counts.items():
+        frames = stack.split(";")
+        own[frames[-1]] = own.get(frames[-1], 0) + count
+        for frame in set(frames):
+            cumulative[frame] = cumulative.get(frame, 0) + count
+    rows = [
+        HotFunction(frame, own.get(frame, 0), own.get(frame, 0) * interval, total * interval)
+        for frame, total in cumulative.items()
+        if frame.startswith(f"{package}.") and not frame.startswith(f"{__name__}:")
+    ]
+    rows.sort(key=lambda row: (-row.own_seconds, -row.cumulative_seconds, row.function))
+    return rows[:limit]
+
+
+def format_report(title: str, rows: List[HotFunction], samples: Optional[int] = None) -> str:
+    """Render a hot-function table in milliseconds (from cProfile, or from ``samples`` stack samples)."""
+    counted = "calls" if samples is None else "samples"
+    lines = [title, "cProfile trace" if samples is None else f"{samples} stack samples (times estimated)"]
+    lines.append(f"{counted:>10}{'own ms':>11}{'cum ms':>11}  function")
+    for row in rows:
+        lines.append(
+            f"{row.calls:>10}{row.own_seconds * 1e3:>11.2f}{row.cumulative_seconds * 1e3:>11.2f}  {row.function}"
+        )
+    return "\n".join(lines)
+
+
+class RunProfiler:
+    """Profile one CLI run with either cProfile or a stack sampler."""
+
+    def __init__(
+        self,
+        name: str,
+        out_dir: Path = DEFAULT_PROFILE_DIR,
+        interval: float = DEFAULT_SAMPLE_INTERVAL,
+        mode: str = "cprofile",
+    ) -> None:
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+        self.name = name
+        self.out_dir = out_dir
+        self.interval = interval
+        self.mode = mode
+        self.profile: Optional[cProfile.Profile] = cProfile.Profile() if mode == "cprofile" else None
+        self.sampler: Optional[StackSampler] = None
+        self.started_at: Optional[datetime] = None
+
+    def __enter__(self) -> "RunProfiler":
+        self.started_at = datetime.now(timezone.utc)
+        if self.profile is not None:
+            self.profile.enable()
+        else:
+            self.sampler = StackSampler(threading.get_ident(), sys._getframe(1), self.interval)
+            self.sampler.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self.profile is not None:
+            self.profile.disable()
+        if self.sampler is not None:
+            self.sampler.stop()
+
+    def save(self, mandates: int, procedures: int, scenarios: int) -> ProfileArtifacts:
+        """Write the mode's data file and the .txt report, tagged with the run's counts."""
+        if self.started_at is None:
+            raise ValueError("Profiler has not run")
+        stem = (
+            f"{self.started_at.strftime('%Y%m%dT%H%M%SZ')}_{self.name}"
+            f"_m{mandates}_p{procedures}_s{scenarios}"
+        )
+        data_path = self.out_dir / f"{stem}.{'pstats' if self.profile is not None else 'collapsed'}"
+        report_path = self.out_dir / f"{stem}.txt"
+        for path in (data_path, report_path):
+            if path.exists():
+                raise FileExistsError(f"Profile already exists: {path}")
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+
+        title = f"{self.name}: {mandates} mandates × {procedures} procedures × {scenarios} scenarios"
+        if self.profile is not None:
+            self.profile.dump_stats(str(data_path))
+            report = format_report(title, hot_functions(pstats.Stats(str(data_path))))
+        else:
+            assert self.sampler is not None
+            data_path.write_text(self.sampler.collapsed(), encoding="utf-8")
+            rows = sampled_functions(self.sampler.counts, self.interval)
+            report = format_report(title, rows, self.sampler.samples)
+        report_path.write_text(report + "\n", encoding="utf-8")
+        if self.profile is not None:
+            return ProfileArtifacts(data_path, None, report_path, report)
+        return ProfileArtifacts(None, data_path, report_path, report)
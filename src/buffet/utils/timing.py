@@ -0,0 +1,267 @@
+"""Opt-in nanosecond stage timings and in-process latency histograms.
+
+Instrumented code wraps each stage in ``with stage("<name>"):`` or, on hot
+paths, calls it through ``timed("<name>", function, *args)``. While timings
+are disabled (the default) these are a shared no-op context manager and a
+plain call. Once ``enable_timings()`` is called,
+every span is measured with ``perf_counter_ns`` and:
+
+- recorded into the process-wide ``HistogramRegistry``;
+- added to the outermost active ``collect_timings()`` block, if any (nested
+  blocks share its totals), which ``judge_with_latency`` copies into
+  ``behavior.timings_ns``.
+
+Histograms use HDR-style log-linear buckets: values below 2**7 ns are exact
+and larger values keep 7 significant bits (under 1.6% relative error), so
+memory stays bounded whatever the range of latencies.
+"""
+
+from __future__ import annotations
+
+import threading
+from contextvars import ContextVar
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, Mapping, Optional, TypeVar
+
+STAGES = (
+    "load_mandate",
+    "load_scenario",
+    "evaluate_alignment",
+    "compute_confidence",
+    "outcome_rationale",
+    "judge",
+    "serialization",
+    "write",
+    "escalation_routing",
+)
+SUB_BUCKET_BITS = 7
+SUMMARY_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+T = TypeVar("T")
+
+_enabled = False
+_current: ContextVar[Optional[Dict[str, int]]] = ContextVar("buffet_stage_timings", default=None)
+
+
+class LatencyHistogram:
+    """Log-linear histogram of nanosecond latencies."""
+
+    _half = 1 << (SUB_BUCKET_BITS - 1)
+    _full = 1 << SUB_BUCKET_BITS
+
+    def __init__(self) -> None:
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns: Optional[int] = None
+        self.max_ns = 0
+
+    @classmethod
+    def _index(cls, value: int) -> int:
+        if value < cls._full:
+            return value
+        shift = value.bit_length() - SUB_BUCKET_BITS
+        return cls._full + (shift - 1) * cls._half + (value >> shift) - cls._half
+
+    @classmethod
+    def _highest_equivalent(cls, index: int) -> int:
+        if index < cls._full:
+            return index
+        shift, offset = divmod(index - cls._full, cls._half)
+        return ((offset + cls._half + 1) << (shift + 1)) - 1
+
+    def record(self, value_ns: int, count: int = 1) -> None:
+        """Record one latency (or ``count`` identical latencies)."""
+        value_ns = max(0, int(value_ns))
+        index = self._index(value_ns)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.count += count
+        self.total_ns += value_ns * count
+        self.max_ns = max(self.max_ns, value_ns)
+        self.min_ns = value_ns if self.min_ns is None else min(self.min_ns, value_ns)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add every observation from another histogram."""
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+        if other.min_ns is not None:
+            self.min_ns = other.min_ns if self.min_ns is None else min(self.min_ns, other.min_ns)
+
+    def percentile(self, percent: float) -> int:
+        """Return the latency at or below which ``percent`` of observations fall."""
+        if not self.count:
+            return 0
+        target = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._highest_equivalent(index), self.max_ns)
+        return self.max_ns
+
+    @property
+    def mean_ns(self) -> float:
+        """Return the exact mean latency."""
+        return self.total_ns / self.count if self.count else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """Return count, mean, min, max and summary percentiles in nanoseconds."""
+        summary: Dict[str, Any] = {
+            "count": self.count,
+            "mean_ns": round(self.mean_ns),
+            "min_ns": self.min_ns or 0,
+            "max_ns": self.max_ns,
+        }
+        for percent in SUMMARY_PERCENTILES:
+            summary[f"p{percent:g}_ns"] = self.percentile(percent)
+        return summary
+
+
+class HistogramRegistry:
+    """Thread-safe latency histograms keyed by stage name."""
+
+    def __init__(self) -> None:
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage_name: str, value_ns: int) -> None:
+        """Record one stage latency."""
+        with self._lock:
+            histogram = self.histograms.get(stage_name)
+            if histogram is None:
+                histogram = self.histograms[stage_name] = LatencyHistogram()
+            histogram.record(value_ns)
+
+    def record_all(self, timings_ns: Mapping[str, int]) -> None:
+        """Record every stage of a ``behavior.timings_ns`` block (e.g. from a worker process)."""
+        for stage_name, value_ns in timings_ns.items():
+            self.record(stage_name, value_ns)
+
+    def clear(self) -> None:
+        """Drop every histogram."""
+        with self._lock:
+            self.histograms.clear()
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Return per-stage summaries, instrumented stages first."""
+        with self._lock:
+            order = {name: position for position, name in enumerate(STAGES)}
+            names = sorted(self.histograms, key=lambda name: (order.get(name, len(STAGES)), name))
+            return {name: self.histograms[name].summary() for name in names}
+
+    def format_summary(self) -> str:
+        """Render per-stage summaries as an aligned table in microseconds."""
+        lines = [f"{'stage':<20}{'count':>9}{'mean µs':>11}{'p50 µs':>10}{'p99 µs':>10}{'max µs':>10}"]
+        for name, row in self.summary().items():
+            lines.append(
+                f"{name:<20}{row['count']:>9}{row['mean_ns'] / 1e3:>11.1f}{row['p50_ns'] / 1e3:>10.1f}"
+                f"{row['p99_ns'] / 1e3:>10.1f}{row['max_ns'] / 1e3:>10.1f}"
+            )
+        return "\n".join(lines)
+
+
+_default_registry = HistogramRegistry()
+
+
+def default_histograms() -> HistogramRegistry:
+    """Return the process-wide stage histogram registry."""
+    return _default_registry
+
+
+def enable_timings(enabled: bool = True) -> None:
+    """Turn stage timing on or off for this process."""
+    global _enabled
+    _enabled = enabled
+
+
+def timings_enabled() -> bool:
+    """Return True when stage timing is on."""
+    return _enabled
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.start = 0
+
+    def __enter__(self) -> None:
+        self.start = perf_counter_ns()
+
+    def __exit__(self, *exc_info: object) -> None:
+        add_timing(self.name, perf_counter_ns() - self.start)
+
+
+def stage(name: str) -> Any:
+    """Return a context manager timing one stage; a shared no-op while disabled."""
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def timed(name: str, function: Callable[..., T], *args: Any) -> T:
+    """Call ``function(*args)`` as one stage; a plain call while disabled.
+
+    Cheaper than ``with stage(...)`` on hot paths that run with timings off.
+    """
+    if not _enabled:
+        return function(*args)
+    start = perf_counter_ns()
+    try:
+        return function(*args)
+    finally:
+        add_timing(name, perf_counter_ns() - start)
+
+
+def add_timing(name: str, elapsed_ns: int) -> None:
+    """Record an externally measured stage duration."""
+    if not _enabled:
+        return
+    _default_registry.record(name, elapsed_ns)
+    timings = _current.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0) + elapsed_ns
+
+
+class _Collector:
+    __slots__ = ("timings", "token")
+
+    def __enter__(self) -> Dict[str, int]:
+        existing = _current.get()
+        if existing is not None:
+            self.token = None
+            return existing
+        self.timings: Dict[str, int] = {}
+        self.token = _current.set(self.timings)
+        return self.timings
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self.token is not None:
+            _current.reset(self.token)
+
+
+def collect_timings() -> Any:
+    """Collect stage totals for one judgment; the block yields None while timings are disabled.
+
+    Nested blocks share the outer block's totals.
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Collector()
@@ -0,0 +1,140 @@
+"""Content-addressed parse cache for YAML inputs."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import yaml
+
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+SafeDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+DEFAULT_DISK_CACHE_DIR = Path("data/cache/yaml")
+
+
+def safe_load_text(text: str) -> Any:
+    """Parse YAML text with the C loader when libyaml is available."""
+    return yaml.load(text, Loader=SafeLoader)
+
+
+def safe_dump_text(data: Any) -> str:
+    """Emit YAML with sorted keys using the C dumper when libyaml is available."""
+    return yaml.dump(data, Dumper=SafeDumper, sort_keys=True)
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for a parse cache."""
+
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+
+
+@dataclass(frozen=True)
+class _Entry:
+    mtime_ns: int
+    size: int
+    digest: str
+    data: Any
+
+
+class YamlCache:
+    """Cache parsed YAML keyed by path, stat signature and content hash.
+
+    A stat match (mtime and size) skips reading the file. A changed stat with
+    unchanged content skips parsing. When ``disk_dir`` is set, parsed payloads
+    are also pickled there by content hash so later processes can reuse them.
+    Returned objects are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, disk_dir: Optional[Path] = None) -> None:
+        self.disk_dir = disk_dir
+        self.stats = CacheStats()
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+
+    def load(self, path: Path) -> Any:
+        """Return parsed YAML for a path, parsing only when content changed."""
+        key = os.path.abspath(path)
+        stat = os.stat(key)
+        entry = self._entries.get(key)
+        if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+            with self._lock:
+                self.stats.hits += 1
+            return entry.data
+
+        content = Path(key).read_bytes()
+        digest = hashlib.sha256(content).hexdigest()
+        if entry is not None and entry.digest == digest:
+            self._store(key, stat, digest, entry.data)
+            with self._lock:
+                self.stats.hits += 1
+            return entry.data
+
+        data, from_disk = self._load_payload(content, digest)
+        self._store(key, stat, digest, data)
+        with self._lock:
+            if from_disk:
+                self.stats.disk_hits += 1
+            else:
+                self.stats.misses += 1
+        return data
+
+    def clear(self) -> None:
+        """Drop in-memory entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.stats = CacheStats()
+
+    def _store(self, key: str, stat: os.stat_result, digest: str, data: Any) -> None:
+        with self._lock:
+            self._entries[key] = _Entry(
+                mtime_ns=stat.st_mtime_ns,
+                size=stat.st_size,
+                digest=digest,
+                data=data,
+            )
+
+    def _load_payload(self, content: bytes, digest: str) -> Tuple[Any, bool]:
+        """Load a payload from the disk tier, or parse and populate it."""
+        pickle_path = self.disk_dir / f"{digest}.pickle" if self.disk_dir is not None else None
+        if pickle_path is not None and pickle_path.exists():
+            try:
+                with pickle_path.open("rb") as handle:
+                    return pickle.load(handle), True
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass
+
+        data = safe_load_text(content.decode("utf-8"))
+        if pickle_path is not None:
+            pickle_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = pickle_path.with_suffix(f".{os.getpid()}.tmp")
+            with tmp_path.open("wb") as handle:
+                pickle.dump(data, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, pickle_path)
+        return data, False
+
+
+_default_cache = YamlCache()
+
+
+def default_yaml_cache() -> YamlCache:
+    """Return the process-wide parse cache used by the loaders."""
+    return _default_cache
+
+
+def enable_disk_cache(disk_dir: Path = DEFAULT_DISK_CACHE_DIR) -> None:
+    """Turn on the on-disk tier for the process-wide parse cache."""
+    _default_cache.disk_dir = disk_dir
+
+
+def load_yaml(path: Path) -> Any:
+    """Load a YAML file through the process-wide parse cache."""
+    return _default_cache.load(path)
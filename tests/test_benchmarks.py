@@ -0,0 +1,47 @@
+"""Tests for the offline benchmark suite."""
+
+import json
+from pathlib import Path
+
+from benchmarks import run
+from benchmarks.suite import compare, synthetic_scenarios
+
+
+def test_synthetic_scenarios_are_seeded() -> None:
+    """Ensure every run benchmarks the same synthetic scenarios."""
+    assert list(synthetic_scenarios(50)) == list(synthetic_scenarios(50))
+
+
+def test_compare_flags_slowdowns_beyond_allowance() -> None:
+    """Ensure only cases slower than their allowed fraction are reported."""
+    baseline = {"results": {"judge/1000": {"ns_per_op": 100.0}, "write_judgment_record/1000": {"ns_per_op": 100.0}}}
+    current = {
+        "results": {
+            "judge/1000": {"ns_per_op": 130.0},
+            "write_judgment_record/1000": {"ns_per_op": 140.0},
+            "publish_pages_data/1000": {"ns_per_op": 999.0},
+        }
+    }
+
+    regressions = compare(current, baseline, max_slowdown=0.25, overrides={"write_judgment_record": 0.5})
+
+    assert [regression.name for regression in regressions] == ["judge/1000"]
+    assert round(regressions[0].slowdown, 2) == 0.3
+
+
+def test_run_writes_results_and_fails_on_regression(tmp_path: Path) -> None:
+    """Ensure the CLI writes JSON results and exits non-zero against a faster baseline."""
+    out = tmp_path / "latest.json"
+    baseline = tmp_path / "baseline.json"
+    args = ["--sizes", "20", "--repeat", "1", "--load-iterations", "2", "--work-dir", str(tmp_path), "--out", str(out)]
+
+    assert run.main([*args, "--save-baseline", str(baseline)]) == 0
+    results = json.loads(out.read_text())
+    assert {"judge/20", "fingerprint/20", "publish_pages_data/20", "load_mandate/cold"} <= set(results["results"])
+
+    faster = json.loads(baseline.read_text())
+    for row in faster["results"].values():
+        row["ns_per_op"] /= 100
+    baseline.write_text(json.dumps(faster))
+    assert run.main([*args, "--baseline", str(baseline)]) == 1
+    assert not any(tmp_path.glob("buffet-bench-*"))
@@ -18,6 +18,8 @@ def test_run_skill_writes_record(tmp_path: Path) -> None:
             "judgment_loops/rate_regime_adjustment/scenarios/rising_rates_2022.yaml",
             "--out-dir",
             str(out_dir),
+            "--escalations-dir",
+            str(tmp_path / "escalations"),
         ]
     )
 
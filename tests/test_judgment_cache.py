@@ -0,0 +1,123 @@
+"""Tests for memoized judgments."""
+
+from dataclasses import replace
+from pathlib import Path
+
+from buffet.execution import run_batch
+from buffet.execution.judgment_cache import JudgmentCache
+from buffet.execution.loop_runner import judge_with_latency
+from buffet.mandates.loader import load_mandate
+from buffet.procedures.rate_regime_adjustment import RateRegimeAdjustmentProcedure, load_thresholds
+from buffet.sensing.scenario import load_scenario
+
+MANDATE = Path("mandates/liability_driven/db_pension_v1/mandate.yaml")
+SCENARIO = Path("judgment_loops/rate_regime_adjustment/scenarios/rising_rates_2022.yaml")
+THRESHOLDS = Path("judgment_loops/rate_regime_adjustment/thresholds.yaml")
+
+
+def _semantic(record: dict) -> dict:
+    data = dict(record)
+    for name in ("record_id", "timestamp", "behavior"):
+        data.pop(name)
+    return data
+
+
+def test_cache_hit_reuses_payload_with_fresh_identity() -> None:
+    """Ensure a hit matches the judged payload but has a new record_id."""
+    mandate = load_mandate(MANDATE)
+    scenario = load_scenario(SCENARIO)
+    thresholds = load_thresholds(THRESHOLDS)
+    procedure = RateRegimeAdjustmentProcedure()
+    cache = JudgmentCache()
+
+    first = judge_with_latency(procedure, mandate, scenario, thresholds, cache=cache)
+    second = judge_with_latency(procedure, mandate, scenario, thresholds, cache=cache)
+
+    assert first.behavior["cache_hit"] is False
+    assert second.behavior["cache_hit"] is True
+    assert second.record_id != first.record_id
+    assert _semantic(second.to_dict()) == _semantic(first.to_dict())
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_cache_key_tracks_input_content() -> None:
+    """Ensure changed inputs or procedure versions miss the cache."""
+    mandate = load_mandate(MANDATE)
+    scenario = load_scenario(SCENARIO)
+    thresholds = load_thresholds(THRESHOLDS)
+    procedure = RateRegimeAdjustmentProcedure()
+    cache = JudgmentCache()
+    key = cache.key(procedure, mandate, scenario, thresholds)
+
+    assert cache.key(procedure, load_mandate(MANDATE), load_scenario(SCENARIO), thresholds) == key
+    assert cache.key(procedure, mandate, replace(scenario, scenario_id="other"), thresholds) != key
+    procedure.procedure_version = "v2"
+    assert cache.key(procedure, mandate, scenario, thresholds) != key
+
+
+def test_sqlite_tier_persists_and_evicts(tmp_path: Path) -> None:
+    """Ensure entries survive reopening and the store stays within max_entries."""
+    mandate = load_mandate(MANDATE)
+    thresholds = load_thresholds(THRESHOLDS)
+    procedure = RateRegimeAdjustmentProcedure()
+    scenarios = [replace(load_scenario(SCENARIO), scenario_id=f"s{index}") for index in range(3)]
+    db_path = tmp_path / "judgments.sqlite"
+
+    with JudgmentCache(max_entries=2, db_path=db_path) as cache:
+        for scenario in scenarios:
+            cache.judge(procedure, mandate, scenario, thresholds)
+        assert cache.stats.evictions == 1
+
+    with JudgmentCache(max_entries=2, db_path=db_path) as cache:
+        assert cache.judge(procedure, mandate, scenarios[2], thresholds).behavior["cache_hit"] is True
+        assert cache.judge(procedure, mandate, scenarios[0], thresholds).behavior["cache_hit"] is False
+
+
+def test_sqlite_tier_counts_only_new_keys(tmp_path: Path) -> None:
+    """Ensure storing the same key twice neither grows the row count nor evicts other entries."""
+    mandate = load_mandate(MANDATE)
+    thresholds = load_thresholds(THRESHOLDS)
+    procedure = RateRegimeAdjustmentProcedure()
+    scenarios = [replace(load_scenario(SCENARIO), scenario_id=f"s{index}") for index in range(2)]
+
+    with JudgmentCache(max_entries=2, db_path=tmp_path / "judgments.sqlite") as cache:
+        records = [cache.judge(procedure, mandate, scenario, thresholds) for scenario in scenarios]
+        key = cache.key(procedure, mandate, scenarios[1], thresholds)
+        cache.put(key, records[1])
+        cache.put(key, records[1])
+        rows = cache._conn.execute("SELECT COUNT(*) FROM judgments").fetchone()[0]
+
+        assert (rows, cache.stats.evictions) == (2, 0)
+
+    with JudgmentCache(max_entries=2, db_path=tmp_path / "judgments.sqlite") as cache:
+        assert cache.judge(procedure, mandate, scenarios[0], thresholds).behavior["cache_hit"] is True
+
+
+def test_run_batch_cli_reuses_cached_judgments(tmp_path: Path, capsys) -> None:
+    """Ensure a second parallel batch run is served entirely from the cache."""
+    argv = [
+        "--mandates",
+        str(MANDATE),
+        "mandates/*/endowment_v1/mandate.yaml",
+        "--scenarios",
+        "judgment_loops/rate_regime_adjustment/scenarios/*.yaml",
+        "--out-dir",
+        str(tmp_path / "records"),
+        "--escalations-dir",
+        str(tmp_path / "escalations"),
+        "--judgment-cache",
+        str(tmp_path / "judgments.sqlite"),
+        "--workers",
+        "2",
+        "--chunk-size",
+        "1",
+    ]
+
+    assert run_batch.main(argv) == 0
+    assert run_batch.main(argv) == 0
+
+    output = capsys.readouterr().out.splitlines()
+    cache_lines = [line for line in output if line.startswith("Judgment cache:")]
+    # Two sample scenarios share their content, so the first run may already hit once.
+    assert " 0 misses" not in cache_lines[0]
+    assert " 0 misses" in cache_lines[1]
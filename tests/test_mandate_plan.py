@@ -0,0 +1,67 @@
+"""Tests for compiled mandate constraint plans."""
+
+from pathlib import Path
+
+import pytest
+
+from buffet.mandates.loader import Mandate, load_mandate
+from buffet.reasoning.align import evaluate_alignment
+from buffet.sensing.scenario import load_scenario
+
+
+def test_plan_resolves_limits_once() -> None:
+    """Ensure the plan exposes resolved limits and a flat tuple of checks."""
+    mandate = load_mandate(Path("mandates/liability_driven/db_pension_v1/mandate.yaml"))
+    plan = mandate.plan
+
+    assert plan.mandate_id == "db_pension_v1"
+    assert plan.max_gross_exposure == 1.2
+    assert plan.min_liquidity_buffer_months == 18
+    assert plan.max_drawdown == 0.2
+    assert plan.max_shortfall_probability == 0.05
+    assert plan.max_illiquid_allocation == 0.15
+    assert isinstance(plan.checks, tuple)
+    assert [check.portfolio_field for check in plan.checks] == [
+        "gross_exposure",
+        "liquidity_buffer_months",
+        "funding_ratio",
+        "drawdown",
+        "shortfall_probability",
+        "illiquid_allocation",
+    ]
+    assert not hasattr(plan, "__dict__")
+
+
+@pytest.mark.parametrize(
+    "raw, message",
+    [
+        ({"meta": {"version": 1.0}}, "meta.mandate_id"),
+        ({"meta": {"mandate_id": "m1"}, "leverage": {"max_gross_exposure": "high"}}, "non-numeric"),
+        ({"meta": {"mandate_id": "m1"}, "liquidity": {"minimum_buffer_months": -3}}, "negative"),
+        ({"meta": {"mandate_id": "m1"}, "liquidity": {"minimum_buffer_months": 4.5}}, "non-integer"),
+        ({"meta": {"mandate_id": "m1"}, "audit": {"rationale_retention_years": "7.5"}}, "non-integer"),
+        ({"meta": {"mandate_id": "m1"}, "confidence": {"minimum_confidence_level": 1.5}}, "above 1.0"),
+    ],
+)
+def test_plan_validates_at_load_time(raw: dict, message: str) -> None:
+    """Ensure malformed limits are rejected when the mandate is built."""
+    with pytest.raises(ValueError, match=message):
+        Mandate(raw=raw, source_path=Path("mandate.yaml"))
+
+
+def test_drawdown_breach_is_hard_constraint(tmp_path: Path) -> None:
+    """Ensure newly enforced mandate limits drive alignment results."""
+    mandate = load_mandate(Path("mandates/liability_driven/db_pension_v1/mandate.yaml"))
+    scenario_path = tmp_path / "drawdown.yaml"
+    scenario_path.write_text(
+        "portfolio:\n"
+        "  gross_exposure: 1.0\n"
+        "  liquidity_buffer_months: 24\n"
+        "  drawdown: 0.25\n"
+        "  illiquid_allocation: 0.2\n"
+    )
+
+    alignment = evaluate_alignment(mandate, load_scenario(scenario_path))
+
+    assert alignment.hard_constraints_breached is True
+    assert alignment.constraints_at_risk == ["illiquid_allocation"]
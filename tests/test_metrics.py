@@ -0,0 +1,149 @@
+"""Tests for the runtime metrics registry and its exposition."""
+
+import http.client
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from buffet.execution.judgment_cache import JudgmentCache
+from buffet.execution.loop_runner import run_judgment_loop
+from buffet.execution.memory import write_judgment_record
+from buffet.execution.run_batch import run_batch
+from buffet.utils.metrics import MetricsRegistry, default_registry, serve_metrics, write_textfile
+
+MANDATES = [
+    Path("mandates/liability_driven/db_pension_v1/mandate.yaml"),
+    Path("mandates/perpetual_capital/endowment_v1/mandate.yaml"),
+]
+SCENARIO_DIR = Path("judgment_loops/rate_regime_adjustment/scenarios")
+THRESHOLDS = Path("judgment_loops/rate_regime_adjustment/thresholds.yaml")
+PROCEDURE = "rate_regime_adjustment"
+
+
+@pytest.fixture
+def registry():
+    default_registry().clear()
+    try:
+        yield default_registry()
+    finally:
+        default_registry().clear()
+
+
+def _samples(text: str) -> dict:
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def test_render_prometheus_and_openmetrics() -> None:
+    """Ensure counters, gauges and histograms render in both exposition formats."""
+    registry = MetricsRegistry()
+    requests = registry.counter("app_requests_total", "Requests served.", ("path",))
+    depth = registry.gauge("app_queue_depth", "Queued items.")
+    latency = registry.histogram("app_latency_seconds", "Latency.", ("path",), buckets=(0.1, 1.0))
+    requests.labels('/a"b').inc()
+    requests.labels('/a"b').inc(2)
+    depth.labels().set(4)
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.labels("/x").observe(value)
+
+    text = registry.render()
+    samples = _samples(text)
+    assert "# TYPE app_requests_total counter" in text
+    assert samples['app_requests_total{path="/a\\"b"}'] == 3
+    assert samples["app_queue_depth"] == 4
+    assert samples['app_latency_seconds_bucket{path="/x",le="0.1"}'] == 2
+    assert samples['app_latency_seconds_bucket{path="/x",le="1"}'] == 3
+    assert samples['app_latency_seconds_bucket{path="/x",le="+Inf"}'] == 4
+    assert samples['app_latency_seconds_count{path="/x"}'] == 4
+    assert samples['app_latency_seconds_sum{path="/x"}'] == pytest.approx(3.65)
+
+    openmetrics = registry.render(openmetrics=True)
+    assert "# TYPE app_requests counter" in openmetrics
+    assert openmetrics.endswith("# EOF\n")
+
+    with pytest.raises(ValueError):
+        requests.labels("/a", "extra")
+    with pytest.raises(ValueError):
+        requests.labels("/a").inc(-1)
+    with pytest.raises(ValueError):
+        registry.counter("app_requests_total", "Duplicate.")
+
+
+def test_batch_updates_runtime_metrics(tmp_path: Path, registry) -> None:
+    """Ensure batch judgments, escalations and cache lookups are counted per mandate, in and out of process."""
+    scenarios = sorted(SCENARIO_DIR.glob("*.yaml"))
+    with JudgmentCache() as cache:
+        for workers, out in ((1, "serial"), (2, "parallel")):
+            run_batch(
+                MANDATES,
+                scenarios,
+                THRESHOLDS,
+                tmp_path / out,
+                tmp_path / f"{out}_escalations",
+                workers=workers,
+                chunk_size=2,
+                cache=cache,
+            )
+    path = write_textfile(tmp_path / "metrics" / "buffet.prom")
+    samples = _samples(path.read_text(encoding="utf-8"))
+
+    def sample(name: str, mandate_id: str, *labels: str) -> float:
+        extra = "".join(f",{label}" for label in labels)
+        return samples[f'{name}{{mandate_id="{mandate_id}",procedure_id="{PROCEDURE}"{extra}}}']
+
+    assert sample("buffet_judgments_total", "db_pension_v1", 'outcome="escalate"') == 4
+    assert sample("buffet_judgments_total", "db_pension_v1", 'outcome="recommend_adjustment"') == 6
+    assert sample("buffet_judgments_total", "endowment_v1", 'outcome="affirm_alignment"') == 8
+    assert sample("buffet_escalations_routed_total", "db_pension_v1") == 4
+    # Two sample scenarios share their content, so the serial run already hits once.
+    assert sample("buffet_judgment_cache_lookups_total", "endowment_v1", 'result="miss"') == 4
+    assert sample("buffet_judgment_cache_lookups_total", "endowment_v1", 'result="hit"') == 6
+    assert sample("buffet_judgment_latency_seconds_count", "endowment_v1") == 10
+    assert not list(tmp_path.joinpath("metrics").glob(".*.tmp"))
+
+
+def test_write_collisions_are_counted(tmp_path: Path, registry) -> None:
+    """Ensure a FileExistsError on an append-only write is counted as a collision."""
+    record, _ = run_judgment_loop(
+        MANDATES[0], SCENARIO_DIR / "escalation_case.yaml", THRESHOLDS, tmp_path / "records", tmp_path / "escalations"
+    )
+    with pytest.raises(FileExistsError):
+        write_judgment_record(record, tmp_path / "records")
+
+    samples = _samples(registry.render())
+    labels = f'mandate_id="db_pension_v1",procedure_id="{PROCEDURE}"'
+    assert samples[f'buffet_write_failures_total{{{labels},target="record",reason="collision"}}'] == 1
+    assert samples[f"buffet_escalations_routed_total{{{labels}}}"] == 1
+
+
+def test_scrape_endpoint_negotiates_openmetrics() -> None:
+    """Ensure the scrape endpoint serves Prometheus text by default and OpenMetrics on request."""
+    registry = MetricsRegistry()
+    registry.counter("app_events_total", "Events.").labels().inc()
+    server = serve_metrics(port=0, registry=registry)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url) as response:
+            plain = response.read().decode("utf-8")
+            plain_type = response.headers["Content-Type"]
+        request = urllib.request.Request(url, headers={"Accept": "application/openmetrics-text; version=1.0.0"})
+        with urllib.request.urlopen(request) as response:
+            openmetrics = response.read().decode("utf-8")
+            openmetrics_type = response.headers["Content-Type"]
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+        connection.request("GET", "/other")
+        missing = connection.getresponse().status
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert plain_type.startswith("text/plain; version=0.0.4")
+    assert "app_events_total 1" in plain and "# EOF" not in plain
+    assert openmetrics_type.startswith("application/openmetrics-text")
+    assert openmetrics.endswith("# EOF\n")
+    assert missing == 404
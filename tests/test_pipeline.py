@@ -0,0 +1,97 @@
+"""Tests for the asyncio judgment pipeline."""
+
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+
+from buffet.execution import pipeline as pipeline_module
+from buffet.execution.memory import YamlDirectoryStore
+from buffet.execution.pipeline import JudgmentPipeline, aiter_ndjson_scenarios, aiter_scenario_files, run_pipeline
+from buffet.mandates.loader import load_mandate
+from buffet.procedures.rate_regime_adjustment import load_thresholds
+from buffet.sensing.scenario import load_scenario
+
+MANDATES = [
+    Path("mandates/liability_driven/db_pension_v1/mandate.yaml"),
+    Path("mandates/perpetual_capital/endowment_v1/mandate.yaml"),
+]
+SCENARIOS = sorted(Path("judgment_loops/rate_regime_adjustment/scenarios").glob("*.yaml"))
+THRESHOLDS = Path("judgment_loops/rate_regime_adjustment/thresholds.yaml")
+
+
+def _pipeline(tmp_path: Path, **kwargs) -> JudgmentPipeline:
+    mandates = [load_mandate(path) for path in MANDATES]
+    store = YamlDirectoryStore(tmp_path / "records")
+    return JudgmentPipeline(mandates, load_thresholds(THRESHOLDS), store, tmp_path / "escalations", **kwargs)
+
+
+def test_pipeline_judges_full_grid_with_tiny_queues(tmp_path: Path) -> None:
+    """Ensure every pair is written and escalated despite single-slot queues."""
+    pipeline = _pipeline(tmp_path, queue_size=1, judge_workers=3)
+
+    summary = asyncio.run(pipeline.run(aiter_scenario_files(SCENARIOS)))
+
+    assert summary.scenarios == len(SCENARIOS)
+    assert summary.judgments == len(MANDATES) * len(SCENARIOS)
+    assert len(list((tmp_path / "records").glob("*.yaml"))) == summary.judgments
+    assert summary.escalations == summary.outcome_counts.get("escalate", 0) > 0
+    assert len(list((tmp_path / "escalations").glob("*"))) == summary.escalations
+
+
+def test_slow_escalations_do_not_stall_judging(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Ensure records keep being written while escalation routing is slow."""
+    written_at_route = []
+
+    def slow_route(record, escalations_dir):
+        written_at_route.append(len(list((tmp_path / "records").glob("*.yaml"))))
+        time.sleep(0.1)
+
+    monkeypatch.setattr(pipeline_module, "route_escalation", slow_route)
+    pipeline = _pipeline(tmp_path, queue_size=64)
+    source = [load_scenario(path) for _ in range(5) for path in SCENARIOS]
+
+    summary = asyncio.run(pipeline.run(source))
+
+    assert summary.escalations >= 5
+    assert len(list((tmp_path / "records").glob("*.yaml"))) == summary.judgments
+    assert written_at_route[-1] == summary.judgments
+
+
+def test_stop_drains_queued_work_from_live_source(tmp_path: Path) -> None:
+    """Ensure stop() ends an idle live stream and everything ingested is still written."""
+
+    async def scenario() -> None:
+        reader = asyncio.StreamReader()
+        pipeline = _pipeline(tmp_path)
+        task = asyncio.create_task(pipeline.run(aiter_ndjson_scenarios(reader)))
+        reader.feed_data(b'{"scenario_id": "live_1", "environment": {"rate_regime": "rising_rates"}}\n\n')
+        reader.feed_data(b'{"portfolio": {"gross_exposure": 1.5}}\n')
+        await asyncio.sleep(0.1)
+        pipeline.stop()
+        return await asyncio.wait_for(task, timeout=5)
+
+    summary = asyncio.run(scenario())
+
+    assert summary.scenarios == 2
+    assert summary.judgments == 2 * len(MANDATES)
+    assert len(list((tmp_path / "records").glob("*.yaml"))) == summary.judgments
+
+
+def test_stage_failure_propagates(tmp_path: Path) -> None:
+    """Ensure a failing source cancels the pipeline and surfaces its error."""
+
+    def broken_source():
+        yield load_scenario(SCENARIOS[0])
+        raise ValueError("feed dropped")
+
+    mandates = [load_mandate(path) for path in MANDATES]
+    with pytest.raises(ValueError, match="feed dropped"):
+        run_pipeline(
+            mandates,
+            broken_source(),
+            load_thresholds(THRESHOLDS),
+            YamlDirectoryStore(tmp_path / "records"),
+            tmp_path / "escalations",
+        )
@@ -0,0 +1,105 @@
+"""Tests for opt-in run profiling."""
+
+import pstats
+import time
+from pathlib import Path
+
+from buffet.execution import run_batch, run_example
+from buffet.utils.profiling import RunProfiler, sampled_functions
+
+MANDATE = "mandates/liability_driven/db_pension_v1/mandate.yaml"
+SCENARIO_DIR = Path("judgment_loops/rate_regime_adjustment/scenarios")
+
+
+def test_run_example_profile_writes_tagged_artifacts(tmp_path: Path, capsys) -> None:
+    """Ensure --profile writes pstats and a buffet-only hot-function report, without sampling."""
+    profile_dir = tmp_path / "profiles"
+    exit_code = run_example.main(
+        [
+            "--mandate",
+            MANDATE,
+            "--scenario",
+            str(SCENARIO_DIR / "rising_rates.yaml"),
+            "--out-dir",
+            str(tmp_path / "records"),
+            "--escalations-dir",
+            str(tmp_path / "escalations"),
+            "--profile",
+            "--profile-dir",
+            str(profile_dir),
+        ]
+    )
+
+    assert exit_code == 0
+    (stats_path,) = profile_dir.glob("*_run_example_m1_p1_s1.pstats")
+    report = stats_path.with_suffix(".txt").read_text(encoding="utf-8")
+    assert report.startswith("run_example: 1 mandates × 1 procedures × 1 scenarios")
+    functions = [line.split()[-1] for line in report.splitlines()[3:]]
+    assert functions and all(function.startswith("buffet/") for function in functions)
+    assert any("(run_judgment_loop)" in function for function in functions)
+    assert pstats.Stats(str(stats_path)).total_calls > 0
+    assert not list(profile_dir.glob("*.collapsed"))
+    assert "Wrote profile:" in capsys.readouterr().out
+
+
+def test_run_batch_profile_is_tagged_with_grid_counts(tmp_path: Path) -> None:
+    """Ensure batch profiles are tagged with the mandate and scenario counts."""
+    profile_dir = tmp_path / "profiles"
+    exit_code = run_batch.main(
+        [
+            "--mandates",
+            MANDATE,
+            "--scenarios",
+            str(SCENARIO_DIR / "*.yaml"),
+            "--out-dir",
+            str(tmp_path / "records"),
+            "--escalations-dir",
+            str(tmp_path / "escalations"),
+            "--profile",
+            "sample",
+            "--profile-dir",
+            str(profile_dir),
+        ]
+    )
+
+    assert exit_code == 0
+    assert sorted(path.suffix for path in profile_dir.glob("*_run_batch_m1_p1_s5.*")) == [".collapsed", ".txt"]
+    for line in next(profile_dir.glob("*.collapsed")).read_text(encoding="utf-8").splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert stack.startswith("buffet.execution.run_batch:main") and int(count) > 0
+
+
+def test_sampler_collapses_stacks_below_the_profiled_frame(tmp_path: Path) -> None:
+    """Ensure sampled stacks start at the profiling frame and hot functions are limited to the package."""
+
+    def spin() -> None:
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+
+    with RunProfiler("unit", tmp_path, interval=0.001, mode="sample") as profiler:
+        spin()
+    artifacts = profiler.save(mandates=0, procedures=0, scenarios=0)
+
+    stacks = profiler.sampler.counts
+    assert profiler.profile is None and artifacts.pstats_path is None
+    assert sum(stacks.values()) == profiler.sampler.samples > 0
+    assert all(stack.startswith(f"{__name__}:test_sampler_collapses") for stack in stacks)
+    assert any(stack.endswith("spin") for stack in stacks)
+    assert [line.split()[-1] for line in artifacts.report.splitlines()[3:]] == []
+
+
+def test_sampled_functions_estimate_own_and_cumulative_time() -> None:
+    """Ensure sampled reports count top-of-stack samples as own time and any-depth samples as cumulative."""
+    counts = {
+        "buffet.a:main;buffet.b:judge": 3,
+        "buffet.a:main;buffet.b:judge;yaml:load": 2,
+        "buffet.a:main;buffet.utils.profiling:save": 1,
+        "buffet.a:main": 1,
+    }
+    rows = {row.function: row for row in sampled_functions(counts, interval=0.001)}
+
+    assert list(rows) == ["buffet.b:judge", "buffet.a:main"]
+    assert rows["buffet.b:judge"].calls == 3
+    assert rows["buffet.b:judge"].cumulative_seconds == 0.005
+    assert rows["buffet.a:main"].own_seconds == 0.001
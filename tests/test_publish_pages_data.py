@@ -1,11 +1,27 @@
 """Tests for publishing pages data."""
 
+import gzip
 import json
 from pathlib import Path
 
+import pytest
 import yaml
 
-from scripts.publish_pages_data import publish_pages_data
+from scripts.publish_pages_data import _write_record_packs, publish_pages_data
+
+
+def _read_sharded_index(out_dir: Path) -> dict:
+    """Reassemble the full index from the root manifest and its shards."""
+    root = json.loads((out_dir / "index.json").read_text())
+    merged = {"records": [], "groups": []}
+    for shard in root["shards"]:
+        payload = json.loads((out_dir.parent / shard["path"]).read_text())
+        merged[shard["kind"]].extend(reversed(payload[shard["kind"]]))
+    merged["records"].sort(key=lambda entry: entry["record_id"])
+    merged["records"].sort(key=lambda entry: entry["timestamp"], reverse=True)
+    merged["groups"].sort(key=lambda group: group["fingerprint"])
+    merged["groups"].sort(key=lambda group: group["last_timestamp"], reverse=True)
+    return merged
 
 
 def test_publish_pages_data(tmp_path: Path) -> None:
@@ -50,7 +66,7 @@ def test_publish_pages_data(tmp_path: Path) -> None:
 
     index_path = out_dir / "index.json"
     assert index_path.exists()
-    parsed_index = json.loads(index_path.read_text())
+    parsed_index = _read_sharded_index(out_dir)
 
     assert "records" in parsed_index
     assert len(parsed_index["records"]) == 2
@@ -104,3 +120,242 @@ def test_publish_pages_data(tmp_path: Path) -> None:
 
     assert len(index["records"]) == 2
     assert len(index["groups"]) == 1
+
+
+def test_publish_pages_data_incremental(tmp_path: Path) -> None:
+    """Only new or changed records are converted on an incremental publish."""
+    in_dir = tmp_path / "in"
+    out_dir = tmp_path / "docs" / "data"
+    in_dir.mkdir()
+
+    def write_record(name: str, record_id: str, timestamp: str, outcome: str = "affirm_alignment") -> Path:
+        record = {key: {} for key in ["invocation", "state", "compliance", "behavior", "audit"]}
+        record.update(
+            {
+                "record_id": record_id,
+                "timestamp": timestamp,
+                "authority": {"mandate_id": "m1", "procedure_id": "p1"},
+                "outcome": {"type": outcome},
+                "confidence": {"level": 0.7},
+                "constraints": {},
+            }
+        )
+        path = in_dir / name
+        path.write_text(yaml.safe_dump(record, sort_keys=True))
+        return path
+
+    write_record("record_1.yaml", "abc", "2022-01-01T00:00:00Z")
+    write_record("record_2.yaml", "def", "2022-01-02T00:00:00Z", outcome="escalate")
+    publish_pages_data(in_dir=in_dir, out_dir=out_dir, clean=True)
+    first_json = out_dir / "records" / "record_1.json"
+    published_at = json.loads(first_json.read_text())["_published_at"]
+    assert (out_dir / "publish_manifest.json").exists()
+
+    write_record("record_2.yaml", "def", "2022-01-02T00:00:00Z")
+    write_record("record_3.yaml", "ghi", "2022-01-03T00:00:00Z")
+    index = publish_pages_data(in_dir=in_dir, out_dir=out_dir, incremental=True)
+
+    assert json.loads(first_json.read_text())["_published_at"] == published_at
+    assert [entry["record_id"] for entry in index["records"]] == ["ghi", "def", "abc"]
+    assert {entry["outcome_type"] for entry in index["records"]} == {"affirm_alignment"}
+    assert len(index["groups"]) == 1
+    assert index["groups"][0]["count"] == 3
+    assert _read_sharded_index(out_dir)["groups"] == index["groups"]
+
+
+def test_publish_pages_data_shards_index(tmp_path: Path) -> None:
+    """The root index lists bounded month/mandate shards, newest period first."""
+    in_dir = tmp_path / "in"
+    out_dir = tmp_path / "docs" / "data"
+    in_dir.mkdir()
+
+    def write_record(number: int, mandate_id: str, timestamp: str) -> None:
+        record = {key: {} for key in ["invocation", "state", "compliance", "behavior", "audit", "constraints"]}
+        record.update(
+            {
+                "record_id": f"r{number}",
+                "timestamp": timestamp,
+                "authority": {"mandate_id": mandate_id, "procedure_id": "p1"},
+                "outcome": {"type": "affirm_alignment"},
+                "confidence": {"level": 0.7},
+            }
+        )
+        (in_dir / f"record_{number}.yaml").write_text(yaml.safe_dump(record, sort_keys=True))
+
+    for number, (mandate_id, timestamp) in enumerate(
+        [
+            ("m1", "2022-01-01T00:00:00Z"),
+            ("m1", "2022-01-02T00:00:00Z"),
+            ("m1", "2022-01-03T00:00:00Z"),
+            ("m2", "2022-01-04T00:00:00Z"),
+            ("m1", "2022-02-01T00:00:00Z"),
+        ]
+    ):
+        write_record(number, mandate_id, timestamp)
+
+    index = publish_pages_data(in_dir=in_dir, out_dir=out_dir, clean=True, shard_size=2)
+    root = json.loads((out_dir / "index.json").read_text())
+
+    assert "records" not in root
+    assert root["record_count"] == 5
+    assert root["periods"] == ["2022-02", "2022-01"]
+    assert root["mandates"] == ["m1", "m2"]
+    record_shards = [shard for shard in root["shards"] if shard["kind"] == "records"]
+    assert all(shard["count"] <= 2 for shard in record_shards)
+    assert [(s["period"], s["mandate_id"], s["count"]) for s in record_shards] == [
+        ("2022-02", "m1", 1),
+        ("2022-01", "m1", 2),
+        ("2022-01", "m1", 1),
+        ("2022-01", "m2", 1),
+    ]
+    assert sorted(e["record_id"] for e in _read_sharded_index(out_dir)["records"]) == sorted(
+        e["record_id"] for e in index["records"]
+    )
+
+    first_shard = out_dir / "index" / "2022-01" / "m1" / "records-000.json"
+    assert [e["record_id"] for e in json.loads(first_shard.read_text())["records"]] == ["r0", "r1"]
+    before = first_shard.stat().st_mtime_ns
+    write_record(5, "m1", "2022-01-05T00:00:00Z")
+    publish_pages_data(in_dir=in_dir, out_dir=out_dir, incremental=True, shard_size=2)
+    assert first_shard.stat().st_mtime_ns == before
+    last_shard = out_dir / "index" / "2022-01" / "m1" / "records-001.json"
+    assert [e["record_id"] for e in json.loads(last_shard.read_text())["records"]] == ["r2", "r5"]
+
+    (in_dir / "record_4.yaml").unlink()
+    (in_dir / "record_5.yaml").unlink()
+    publish_pages_data(in_dir=in_dir, out_dir=out_dir, incremental=True, shard_size=2)
+    root = json.loads((out_dir / "index.json").read_text())
+    assert root["periods"] == ["2022-01"]
+    assert not (out_dir / "index" / "2022-02").exists()
+
+
+def test_publish_pages_data_writes_record_packs(tmp_path: Path) -> None:
+    """Record packs hold every published record and support block range reads."""
+    in_dir = tmp_path / "in"
+    out_dir = tmp_path / "docs" / "data"
+    in_dir.mkdir()
+    for number in range(5):
+        record = {key: {} for key in ["invocation", "state", "compliance", "behavior", "audit", "constraints"]}
+        record.update(
+            {
+                "record_id": f"r{number}",
+                "timestamp": f"2022-0{1 + number % 2}-0{1 + number}T00:00:00Z",
+                "authority": {"mandate_id": "m1", "procedure_id": "p1"},
+                "outcome": {"type": "affirm_alignment"},
+                "confidence": {"level": 0.7},
+            }
+        )
+        (in_dir / f"record_{number}.yaml").write_text(yaml.safe_dump(record, sort_keys=True))
+
+    index = publish_pages_data(in_dir=in_dir, out_dir=out_dir, clean=True, pack_size=2)
+    root = json.loads((out_dir / "index.json").read_text())
+
+    assert [(pack["period"], pack["count"]) for pack in root["packs"]] == [
+        ("2022-02", 2),
+        ("2022-01", 2),
+        ("2022-01", 1),
+    ]
+    published = {}
+    for pack in root["packs"]:
+        raw = (out_dir.parent / pack["path"]).read_bytes()
+        assert len(raw) == pack["bytes"]
+        table = json.loads((out_dir.parent / pack["offsets_path"]).read_text())
+        lines = gzip.decompress(raw).decode("utf-8").splitlines()
+        assert [json.loads(line)["record_id"] for line in lines] == table["record_ids"]
+        block = table["blocks"][0]
+        first = gzip.decompress(raw[block["offset"] : block["offset"] + block["length"]]).decode("utf-8")
+        assert json.loads(first.splitlines()[0])["record_id"] == table["record_ids"][0]
+        published.update({json.loads(line)["record_id"]: json.loads(line) for line in lines})
+
+    for entry in index["records"]:
+        assert published[entry["record_id"]] == json.loads((out_dir.parent / entry["path"]).read_text())
+
+    table_path = out_dir.parent / root["packs"][0]["offsets_path"]
+    before = table_path.stat().st_mtime_ns
+    publish_pages_data(in_dir=in_dir, out_dir=out_dir, incremental=True, pack_size=2)
+    assert table_path.stat().st_mtime_ns == before
+
+    january = [entry for entry in index["records"] if entry["timestamp"].startswith("2022-01")]
+    older, newest = january[1:], january[0]
+    (first,) = _write_record_packs(out_dir, older, pack_size=10, block_records=1)
+    first_bytes = (out_dir.parent / first["path"]).read_bytes()
+    first_table = json.loads((out_dir.parent / first["offsets_path"]).read_text())
+    (second,) = _write_record_packs(out_dir, [newest] + older, pack_size=10, block_records=1)
+    second_bytes = (out_dir.parent / second["path"]).read_bytes()
+    second_table = json.loads((out_dir.parent / second["offsets_path"]).read_text())
+    assert second_table["record_ids"] == first_table["record_ids"] + [newest["record_id"]]
+    assert second_table["blocks"][: len(first_table["blocks"])] == first_table["blocks"]
+    assert second_bytes.startswith(first_bytes)
+
+
+def test_publish_pages_data_writes_aggregates(tmp_path: Path) -> None:
+    """Rollups cover emissions and distinct judgments without the browser reading records."""
+    in_dir = tmp_path / "in"
+    out_dir = tmp_path / "docs" / "data"
+    in_dir.mkdir()
+    rows = [
+        ("m1", "2022-01-03T10:00:00Z", "escalate", 0.35, 10, ["hard_breach"]),
+        ("m1", "2022-01-04T10:00:00Z", "escalate", 0.35, 30, ["hard_breach"]),
+        ("m2", "2022-01-12T10:00:00Z", "affirm_alignment", 0.95, 20, []),
+    ]
+    for number, (mandate_id, timestamp, outcome, level, latency, branches) in enumerate(rows):
+        record = {key: {} for key in ["invocation", "state", "compliance", "audit", "constraints"]}
+        record.update(
+            {
+                "record_id": f"r{number}",
+                "timestamp": timestamp,
+                "authority": {"mandate_id": mandate_id, "procedure_id": "p1", "procedure_version": "1.0.0"},
+                "outcome": {"type": outcome},
+                "confidence": {"level": level},
+                "behavior": {"decision_latency_ms": latency, "procedure_branches_taken": branches},
+            }
+        )
+        (in_dir / f"record_{number}.yaml").write_text(yaml.safe_dump(record, sort_keys=True))
+
+    publish_pages_data(in_dir=in_dir, out_dir=out_dir, clean=True)
+    emissions = json.loads((out_dir / "aggregates" / "emissions.json").read_text())
+    judgments = json.loads((out_dir / "aggregates" / "judgments.json").read_text())
+
+    overall = emissions["overall"]
+    assert overall["count"] == 3
+    assert overall["outcomes"] == {"affirm_alignment": 1, "escalate": 2}
+    assert overall["escalation_rate"] == 2 / 3
+    assert overall["confidence_histogram"][3] == 2
+    assert overall["confidence_histogram"][9] == 1
+    assert overall["branches"] == {"hard_breach": 2}
+    assert overall["latency_ms"] == {"p50": 20.0, "p90": 30.0, "p99": 30.0, "max": 30.0}
+    assert emissions["by_mandate"]["m1"]["escalations"] == 2
+    assert list(emissions["by_procedure_version"]) == ["p1@1.0.0"]
+    assert list(emissions["by_week"]) == ["2022-01-03", "2022-01-10"]
+    assert len(emissions["by_day"]) == 3
+
+    assert judgments["overall"]["count"] == 2
+    assert judgments["by_mandate"]["m1"]["count"] == 1
+    assert list(judgments["by_day"]) == ["2022-01-04", "2022-01-12"]
+
+
+def test_publish_pages_data_leaves_snapshot_untouched_on_invalid_record(tmp_path: Path) -> None:
+    """A malformed record aborts the publish before any published file changes."""
+    in_dir = tmp_path / "in"
+    out_dir = tmp_path / "docs" / "data"
+    in_dir.mkdir()
+    record = {key: {} for key in ["invocation", "state", "compliance", "behavior", "audit", "constraints"]}
+    record.update(
+        {
+            "record_id": "r0",
+            "timestamp": "2022-01-01T00:00:00Z",
+            "authority": {"mandate_id": "m1", "procedure_id": "p1"},
+            "outcome": {"type": "affirm_alignment"},
+            "confidence": {"level": 0.7},
+        }
+    )
+    (in_dir / "record_0.yaml").write_text(yaml.safe_dump(record, sort_keys=True))
+    publish_pages_data(in_dir=in_dir, out_dir=out_dir, clean=True)
+    before = {path: path.read_bytes() for path in out_dir.rglob("*") if path.is_file()}
+
+    (in_dir / "record_0.yaml").write_text(yaml.safe_dump(dict(record, record_id="changed"), sort_keys=True))
+    (in_dir / "record_1.yaml").write_text(yaml.safe_dump({"record_id": "broken"}, sort_keys=True))
+    for clean in (False, True):
+        with pytest.raises(ValueError, match="missing keys"):
+            publish_pages_data(in_dir=in_dir, out_dir=out_dir, clean=clean)
+        assert {path: path.read_bytes() for path in out_dir.rglob("*") if path.is_file()} == before
@@ -0,0 +1,98 @@
+"""Tests for the SQLite judgment record index."""
+
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from buffet.contracts.fingerprint import judgment_fingerprint
+from buffet.execution import record_index, run_example
+from buffet.execution.memory import YamlDirectoryStore
+from buffet.execution.record_index import IndexedRecordStore, RecordIndex, rebuild_index
+from buffet.mandates.loader import load_mandate
+from buffet.procedures.rate_regime_adjustment import RateRegimeAdjustmentProcedure, load_thresholds
+from buffet.sensing.scenario import load_scenario
+
+
+def _judge(mandate_path: str, scenario_name: str):
+    return RateRegimeAdjustmentProcedure().judge(
+        load_mandate(Path(mandate_path)),
+        load_scenario(Path(f"judgment_loops/rate_regime_adjustment/scenarios/{scenario_name}.yaml")),
+        load_thresholds(Path("judgment_loops/rate_regime_adjustment/thresholds.yaml")),
+        decision_latency_ms=0,
+    )
+
+
+def test_index_is_maintained_on_write(tmp_path: Path) -> None:
+    """Ensure appended records are queryable by mandate, outcome and escalation."""
+    store = IndexedRecordStore(YamlDirectoryStore(tmp_path / "records"), RecordIndex(tmp_path / "index.sqlite"))
+    store.append(_judge("mandates/liability_driven/db_pension_v1/mandate.yaml", "escalation_case"))
+    store.append(_judge("mandates/liability_driven/db_pension_v1/mandate.yaml", "rising_rates_2022"))
+    store.append(_judge("mandates/perpetual_capital/endowment_v1/mandate.yaml", "rising_rates_2022"))
+    store.close()
+
+    with RecordIndex(tmp_path / "index.sqlite") as index:
+        assert index.count() == 3
+        escalations = index.query(mandate_id="db_pension_v1", escalated=True, since="2000-01-01", limit=5)
+        assert len(escalations) == 1
+        assert escalations[0].outcome_type == "escalate"
+        assert escalations[0].fingerprint
+        assert Path(escalations[0].location).exists()
+        assert index.query(mandate_id="endowment_v1", outcome_type="affirm_alignment")
+        assert index.query(until="2000-01-01") == []
+
+
+def test_index_rejects_duplicate_record_ids(tmp_path: Path) -> None:
+    """Ensure the index preserves append-only identity."""
+    record = _judge("mandates/perpetual_capital/endowment_v1/mandate.yaml", "rising_rates_2022")
+    with RecordIndex(tmp_path / "index.sqlite") as index:
+        index.add(record)
+        with pytest.raises(FileExistsError):
+            index.add(record)
+
+
+def test_rebuild_and_cli_query(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    """Ensure an index can be backfilled from YAML records and queried via the CLI."""
+    records_dir = tmp_path / "records"
+    db_path = tmp_path / "index.sqlite"
+    run_example.main(
+        [
+            "--mandate",
+            "mandates/liability_driven/db_pension_v1/mandate.yaml",
+            "--scenario",
+            "judgment_loops/rate_regime_adjustment/scenarios/rising_rates_2022.yaml",
+            "--out-dir",
+            str(records_dir),
+            "--escalations-dir",
+            str(tmp_path / "escalations"),
+        ]
+    )
+
+    with RecordIndex(db_path) as index:
+        assert rebuild_index(index, records_dir=records_dir) == 1
+
+    capsys.readouterr()
+    exit_code = record_index.main(["--db", str(db_path), "query", "--mandate", "db_pension_v1", "--limit", "1"])
+    assert exit_code == 0
+    assert "outcome=recommend_adjustment" in capsys.readouterr().out
+
+
+def test_fingerprint_emissions_tracked_on_write(tmp_path: Path) -> None:
+    """Ensure repeated judgments share a judge-time fingerprint with first/last emission tracking."""
+    base = _judge("mandates/liability_driven/db_pension_v1/mandate.yaml", "rising_rates_2022")
+    assert base.judgment_fingerprint == judgment_fingerprint(base.to_dict())
+
+    with RecordIndex(tmp_path / "index.sqlite") as index:
+        for record_id, day in [("b", "02"), ("a", "01"), ("c", "03")]:
+            timestamp = f"2026-01-{day}T00:00:00Z"
+            index.add(replace(base, record_id=record_id, timestamp=timestamp))
+        other = _judge("mandates/perpetual_capital/endowment_v1/mandate.yaml", "rising_rates_2022")
+        index.add(replace(other, record_id="d", timestamp="2026-01-03T12:00:00Z"))
+
+        emissions = index.fingerprint_emissions(base.judgment_fingerprint)
+        assert (emissions.first_record_id, emissions.last_record_id, emissions.emissions) == ("a", "c", 3)
+        assert [item.first_record_id for item in index.new_fingerprints("2026-01-02")] == ["d"]
+        assert index.fingerprint_emissions("0" * 64) is None
+
+        index.rebuild_fingerprints()
+        assert index.fingerprint_emissions(base.judgment_fingerprint) == emissions
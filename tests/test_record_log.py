@@ -0,0 +1,169 @@
+"""Tests for the segmented append-only record log."""
+
+from pathlib import Path
+
+import pytest
+import yaml
+
+from buffet.execution import run_batch
+from buffet.execution.record_log import (
+    FsyncPolicy,
+    SegmentedRecordLog,
+    export_yaml_layout,
+    iter_log_records,
+    list_segments,
+)
+from buffet.mandates.loader import load_mandate
+from buffet.procedures.rate_regime_adjustment import RateRegimeAdjustmentProcedure, load_thresholds
+from buffet.sensing.scenario import load_scenario
+
+
+def _records(count: int) -> list:
+    mandate = load_mandate(Path("mandates/liability_driven/db_pension_v1/mandate.yaml"))
+    scenario = load_scenario(Path("judgment_loops/rate_regime_adjustment/scenarios/rising_rates_2022.yaml"))
+    thresholds = load_thresholds(Path("judgment_loops/rate_regime_adjustment/thresholds.yaml"))
+    procedure = RateRegimeAdjustmentProcedure()
+    return [procedure.judge(mandate, scenario, thresholds, decision_latency_ms=0) for _ in range(count)]
+
+
+def test_log_rotates_and_reads_back_in_order(tmp_path: Path) -> None:
+    """Ensure records round-trip across rotated segments."""
+    records = _records(6)
+    with SegmentedRecordLog(tmp_path, segment_max_bytes=4096, fsync_policy=FsyncPolicy(max_records=2)) as log:
+        for record in records:
+            log.append(record)
+
+    assert len(list_segments(tmp_path)) > 1
+    assert [data["record_id"] for data in iter_log_records(tmp_path)] == [r.record_id for r in records]
+
+
+def test_log_rejects_duplicate_record_ids(tmp_path: Path) -> None:
+    """Ensure a record cannot be appended twice."""
+    record = _records(1)[0]
+    with SegmentedRecordLog(tmp_path) as log:
+        log.append(record)
+        with pytest.raises(FileExistsError):
+            log.append(record)
+
+
+def test_log_rejects_duplicate_record_ids_after_reopen(tmp_path: Path) -> None:
+    """Ensure record ids stay unique when a log directory is reopened."""
+    record, other = _records(2)
+    with SegmentedRecordLog(tmp_path) as log:
+        log.append(record)
+
+    with SegmentedRecordLog(tmp_path) as log:
+        with pytest.raises(FileExistsError):
+            log.append(record)
+        log.append(other)
+
+    assert [data["record_id"] for data in iter_log_records(tmp_path)] == [record.record_id, other.record_id]
+
+
+def test_corrupt_length_mid_segment_raises(tmp_path: Path) -> None:
+    """Ensure a corrupt length field followed by intact frames is reported, not treated as a torn tail."""
+    records = _records(3)
+    with SegmentedRecordLog(tmp_path) as log:
+        for record in records:
+            log.append(record)
+    segment = list_segments(tmp_path)[0]
+    data = bytearray(segment.read_bytes())
+    data[0:4] = (len(data) * 2).to_bytes(4, "big")
+    segment.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError, match="Corrupt record frame"):
+        list(iter_log_records(tmp_path))
+
+
+def test_torn_tail_is_truncated_on_reopen(tmp_path: Path) -> None:
+    """Ensure a partial frame is cut off on reopen and appends resume in the same segment."""
+    first, second = _records(2)
+    with SegmentedRecordLog(tmp_path) as log:
+        log.append(first)
+    segment = list_segments(tmp_path)[0]
+    intact_size = segment.stat().st_size
+    with segment.open("ab") as handle:
+        handle.write(b"\x00\x00\x10\x00partial")
+
+    with SegmentedRecordLog(tmp_path) as log:
+        assert segment.stat().st_size == intact_size
+        log.append(second)
+
+    assert list_segments(tmp_path) == [segment]
+    assert [data["record_id"] for data in iter_log_records(tmp_path)] == [first.record_id, second.record_id]
+
+
+def test_zero_padded_torn_tail_reopens(tmp_path: Path) -> None:
+    """Ensure zero padding after a partial frame reads as a torn tail, not as intact empty frames."""
+    first, second = _records(2)
+    with SegmentedRecordLog(tmp_path) as log:
+        log.append(first)
+    segment = list_segments(tmp_path)[0]
+    intact_size = segment.stat().st_size
+    with segment.open("ab") as handle:
+        handle.write(b"\x00\x00\x10\x00\x12\x34\x56\x78partial" + bytes(4096))
+
+    assert [data["record_id"] for data in iter_log_records(tmp_path)] == [first.record_id]
+    with SegmentedRecordLog(tmp_path) as log:
+        log.append(second)
+
+    assert segment.stat().st_size > intact_size
+    assert [data["record_id"] for data in iter_log_records(tmp_path)] == [first.record_id, second.record_id]
+
+
+def test_sealed_segments_keep_id_sidecars(tmp_path: Path) -> None:
+    """Ensure rotation writes an id sidecar that reopening uses, and a stale sidecar is rebuilt."""
+    records = _records(4)
+    with SegmentedRecordLog(tmp_path, segment_max_bytes=4096) as log:
+        for record in records[:3]:
+            log.append(record)
+    segments = list_segments(tmp_path)
+    sidecars = sorted(tmp_path.glob("*.ids"))
+    assert len(segments) > 1 and [path.stem for path in sidecars] == [path.stem for path in segments[:-1]]
+    sidecars[0].write_text('{"size": 1, "record_ids": []}')
+
+    with SegmentedRecordLog(tmp_path, segment_max_bytes=4096) as log:
+        with pytest.raises(FileExistsError):
+            log.append(records[0])
+        log.append(records[3])
+
+    assert records[0].record_id in sidecars[0].read_text()
+
+
+def test_export_reproduces_yaml_layout(tmp_path: Path) -> None:
+    """Ensure the exporter writes one validated YAML file per record."""
+    records = _records(3)
+    log_dir = tmp_path / "log"
+    with SegmentedRecordLog(log_dir) as log:
+        for record in records:
+            log.append(record)
+
+    paths = export_yaml_layout(log_dir, tmp_path / "yaml")
+
+    assert len(paths) == 3
+    for record, path in zip(records, paths):
+        assert record.record_id in path.name
+        assert yaml.safe_load(path.read_text()) == record.to_dict()
+
+
+def test_run_batch_cli_writes_segments(tmp_path: Path) -> None:
+    """Ensure the batch CLI can target the segmented store."""
+    out_dir = tmp_path / "log"
+    exit_code = run_batch.main(
+        [
+            "--mandates",
+            "mandates/*/endowment_v1/mandate.yaml",
+            "--scenarios",
+            "judgment_loops/rate_regime_adjustment/scenarios/rising_rates*.yaml",
+            "--out-dir",
+            str(out_dir),
+            "--escalations-dir",
+            str(tmp_path / "escalations"),
+            "--store",
+            "segments",
+        ]
+    )
+
+    assert exit_code == 0
+    assert not list(out_dir.glob("*.yaml"))
+    assert len(list(iter_log_records(out_dir))) == 2
@@ -0,0 +1,96 @@
+"""Tests for the streaming judgment record reader."""
+
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+import yaml
+
+from buffet.contracts.serialization import get_serializer
+from buffet.execution.memory import iter_record_views, load_record_view, write_judgment_record
+from buffet.execution.record_log import SegmentedRecordLog
+from buffet.mandates.loader import load_mandate
+from buffet.procedures.rate_regime_adjustment import RateRegimeAdjustmentProcedure, load_thresholds
+from buffet.sensing.scenario import load_scenario
+
+SCENARIOS = Path("judgment_loops/rate_regime_adjustment/scenarios")
+
+
+def _write_records(output_dir: Path) -> list:
+    thresholds = load_thresholds(Path("judgment_loops/rate_regime_adjustment/thresholds.yaml"))
+    procedure = RateRegimeAdjustmentProcedure()
+    paths = []
+    for mandate_path, scenario_name in [
+        ("mandates/liability_driven/db_pension_v1/mandate.yaml", "rising_rates_2022.yaml"),
+        ("mandates/perpetual_capital/endowment_v1/mandate.yaml", "rising_rates_2022.yaml"),
+        ("mandates/liability_driven/db_pension_v1/mandate.yaml", "escalation_case.yaml"),
+    ]:
+        mandate = load_mandate(Path(mandate_path))
+        scenario = load_scenario(SCENARIOS / scenario_name)
+        record = procedure.judge(mandate, scenario, thresholds, decision_latency_ms=0)
+        paths.append(write_judgment_record(record, output_dir))
+    return paths
+
+
+def test_view_decodes_sections_lazily(tmp_path: Path) -> None:
+    """Header lookups leave heavy sections undecoded and full decode matches YAML."""
+    path = _write_records(tmp_path)[0]
+    view = load_record_view(path)
+
+    assert view.mandate_id == "db_pension_v1"
+    assert view.outcome_type == "recommend_adjustment"
+    assert "state" not in view._decoded and "behavior" not in view._decoded
+    assert view["state"] == yaml.safe_load(path.read_text())["state"]
+    assert view.to_dict() == yaml.safe_load(path.read_text())
+
+
+def test_iter_record_views_pushes_down_predicates(tmp_path: Path) -> None:
+    """Mandate, outcome and time filters select records; out-of-range files are never opened."""
+    paths = _write_records(tmp_path)
+    (tmp_path / "19990101T000000Z_unreadable.yaml").write_text("{not: [valid")
+
+    by_mandate = list(iter_record_views(tmp_path, mandate_id="db_pension_v1"))
+    escalations = list(iter_record_views(tmp_path, outcome_type="escalate", since="2000-01-01"))
+    newest = next(iter_record_views(tmp_path, since="2000-01-01", newest_first=True))
+
+    assert {view.outcome_type for view in by_mandate} == {"recommend_adjustment", "escalate"}
+    assert [view.mandate_id for view in escalations] == ["db_pension_v1"]
+    assert newest.path == max(paths)
+    assert not list(iter_record_views(tmp_path, since="2000-01-01", until="2000-01-02"))
+
+
+def test_iter_record_views_compares_bounds_as_instants(tmp_path: Path) -> None:
+    """Bounds and record timestamps with UTC offsets are compared as instants, not strings."""
+    mandate = load_mandate(Path("mandates/liability_driven/db_pension_v1/mandate.yaml"))
+    scenario = load_scenario(SCENARIOS / "rising_rates_2022.yaml")
+    thresholds = load_thresholds(Path("judgment_loops/rate_regime_adjustment/thresholds.yaml"))
+    record = RateRegimeAdjustmentProcedure().judge(mandate, scenario, thresholds, decision_latency_ms=0)
+    for index, timestamp in enumerate(["2024-03-01T10:00:00Z", "2024-03-01T12:30:00+02:00"]):
+        write_judgment_record(replace(record, record_id=f"r{index}", timestamp=timestamp), tmp_path)
+
+    def ids(**bounds: str) -> list:
+        return [view.record_id for view in iter_record_views(tmp_path, **bounds)]
+
+    assert ids(since="2024-03-01T11:00:00+01:00") == ["r0", "r1"]
+    assert ids(since="2024-03-01T10:00:01Z") == ["r1"]
+    assert ids(until="2024-03-01T09:45:00-01:00") == ["r0", "r1"]
+    assert ids(until="2024-03-01T10:30:00Z") == ["r0"]
+    assert ids(since="2024-03-01", until="2024-03-02") == ["r0", "r1"]
+    with pytest.raises(ValueError, match="since"):
+        ids(since="last tuesday")
+
+
+def test_iter_record_views_rejects_other_layouts(tmp_path: Path) -> None:
+    """JSON and segmented-log record directories raise instead of yielding nothing."""
+    mandate = load_mandate(Path("mandates/liability_driven/db_pension_v1/mandate.yaml"))
+    scenario = load_scenario(SCENARIOS / "rising_rates_2022.yaml")
+    thresholds = load_thresholds(Path("judgment_loops/rate_regime_adjustment/thresholds.yaml"))
+    record = RateRegimeAdjustmentProcedure().judge(mandate, scenario, thresholds, decision_latency_ms=0)
+    write_judgment_record(record, tmp_path / "json", get_serializer("json"))
+    with SegmentedRecordLog(tmp_path / "segments") as log:
+        log.append(record)
+
+    with pytest.raises(ValueError, match=".json records"):
+        list(iter_record_views(tmp_path / "json"))
+    with pytest.raises(ValueError, match="segmented record log"):
+        list(iter_record_views(tmp_path / "segments"))
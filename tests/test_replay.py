@@ -0,0 +1,108 @@
+"""Tests for the deterministic time-series replay engine."""
+
+import json
+from dataclasses import asdict, replace
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+from buffet.mandates.loader import load_mandate
+from buffet.procedures.rate_regime_adjustment import load_thresholds
+from buffet.sensing.scenario import load_scenario
+from buffet.simulation import replay
+from buffet.simulation.replay import MandateReplayState, ReplayEngine
+
+THRESHOLDS = load_thresholds(Path("judgment_loops/rate_regime_adjustment/thresholds.yaml"))
+PENSION = Path("mandates/liability_driven/db_pension_v1/mandate.yaml")
+ENDOWMENT = Path("mandates/perpetual_capital/endowment_v1/mandate.yaml")
+SCENARIO_DIR = Path("judgment_loops/rate_regime_adjustment/scenarios")
+
+
+def _series(scenarios, start: date = date(2015, 1, 1)):
+    for offset, scenario in enumerate(scenarios):
+        yield replace(scenario, scenario_id=f"day_{offset}", as_of=(start + timedelta(days=offset)).isoformat())
+
+
+def test_transitions_require_confirmations() -> None:
+    """Ensure a single deviating observation does not move the confirmed outcome."""
+    calm = load_scenario(SCENARIO_DIR / "rising_rates.yaml")
+    stressed = load_scenario(SCENARIO_DIR / "liquidity_stress.yaml")
+    confirmations = THRESHOLDS.minimum_confirmations
+
+    engine = ReplayEngine([load_mandate(ENDOWMENT)], THRESHOLDS)
+    blip = [calm] * confirmations + [stressed] + [calm] * confirmations
+    assert [t.outcome for t in engine.replay(_series(blip))] == ["affirm_alignment"]
+
+    engine = ReplayEngine([load_mandate(ENDOWMENT)], THRESHOLDS)
+    shift = [calm] * confirmations + [stressed] * confirmations
+    transitions = list(engine.replay(_series(shift)))
+    assert [(t.previous, t.outcome) for t in transitions] == [
+        (None, "affirm_alignment"),
+        ("affirm_alignment", "recommend_adjustment"),
+    ]
+    assert transitions[1].step == 2 * confirmations - 1
+
+
+def test_escalations_confirm_immediately_with_observed_trend() -> None:
+    """Ensure escalations transition on first sight and records carry the observed trend."""
+    calm = load_scenario(SCENARIO_DIR / "rising_rates.yaml")
+    breach = load_scenario(SCENARIO_DIR / "inflation_shock.yaml")
+    engine = ReplayEngine([load_mandate(PENSION)], THRESHOLDS)
+    series = [calm] * THRESHOLDS.minimum_confirmations + [breach]
+
+    transitions = list(engine.replay(_series(series)))
+
+    assert [t.outcome for t in transitions] == ["recommend_adjustment", "escalate"]
+    assert transitions[-1].step == len(series) - 1
+    assert transitions[-1].record.escalation is not None
+    assert transitions[0].record.confidence["trend"] == "stable"
+    assert transitions[-1].record.confidence["trend"] == "degrading"
+
+
+def test_escalation_restarts_the_confirmation_window() -> None:
+    """Ensure observations from before an escalation do not confirm the outcome that follows it."""
+    state = MandateReplayState(window_size=5, minimum_confirmations=2)
+    changes = [state.observe(outcome) for outcome in ["affirm", "affirm", "escalate", "affirm", "affirm"]]
+
+    assert changes == [False, True, True, False, True]
+    assert state.confirmed == "affirm"
+
+
+def test_replay_rejects_out_of_order_series() -> None:
+    """Ensure observations must arrive in non-decreasing as_of order."""
+    scenario = load_scenario(SCENARIO_DIR / "rising_rates.yaml")
+    engine = ReplayEngine([load_mandate(PENSION)], THRESHOLDS)
+    engine.step(replace(scenario, as_of="2020-01-02"))
+
+    with pytest.raises(ValueError, match="out of order"):
+        engine.step(replace(scenario, as_of="2020-01-01"))
+
+
+def test_ten_years_of_daily_observations_replay_via_cli(tmp_path: Path, capsys) -> None:
+    """Ensure a decade of daily observations across all valid mandates replays via the CLI, writing only transitions."""
+    scenarios = [load_scenario(path) for path in sorted(SCENARIO_DIR.glob("*.yaml"))]
+    days = 3_653
+    series = tmp_path / "decade.ndjson"
+    daily = _series(scenarios[(day // 30) % len(scenarios)] for day in range(days))
+    series.write_text("\n".join(json.dumps(asdict(scenario)) for scenario in daily))
+    out_dir = tmp_path / "records"
+
+    exit_code = replay.main(
+        [
+            "--mandates",
+            "mandates/**/mandate.yaml",
+            "--series",
+            str(series),
+            "--out-dir",
+            str(out_dir),
+            "--escalations-dir",
+            str(tmp_path / "escalations"),
+        ]
+    )
+
+    assert exit_code == 0
+    assert 0 < len(list(out_dir.glob("*.yaml"))) < days
+    output = capsys.readouterr().out
+    assert output.count("Skipping invalid mandate") == 3
+    assert f"Replayed {days} observations across 2 mandates" in output
@@ -0,0 +1,147 @@
+"""Tests for the batch judgment runner."""
+
+from pathlib import Path
+
+import yaml
+
+from buffet.execution import run_batch
+
+
+def test_run_batch_judges_cross_product(tmp_path: Path) -> None:
+    """Ensure every mandate × scenario pair produces one record."""
+    records_dir = tmp_path / "records"
+    escalations_dir = tmp_path / "escalations"
+
+    summary = run_batch.run_batch(
+        mandate_paths=[
+            Path("mandates/liability_driven/db_pension_v1/mandate.yaml"),
+            Path("mandates/perpetual_capital/endowment_v1/mandate.yaml"),
+        ],
+        scenario_paths=[
+            Path("judgment_loops/rate_regime_adjustment/scenarios/rising_rates_2022.yaml"),
+            Path("judgment_loops/rate_regime_adjustment/scenarios/escalation_case.yaml"),
+        ],
+        thresholds_path=Path("judgment_loops/rate_regime_adjustment/thresholds.yaml"),
+        records_dir=records_dir,
+        escalations_dir=escalations_dir,
+    )
+
+    assert summary.judgments == 4
+    assert sum(summary.outcome_counts.values()) == 4
+    assert summary.judgments_per_second > 0
+    assert len(list(records_dir.glob("*.yaml"))) == 4
+    assert len(list(escalations_dir.glob("*.yaml"))) == summary.escalations
+
+
+def test_run_batch_cli_expands_globs(tmp_path: Path) -> None:
+    """Run the CLI main with glob patterns and verify records are written."""
+    out_dir = tmp_path / "records"
+    exit_code = run_batch.main(
+        [
+            "--mandates",
+            "mandates/*/endowment_v1/mandate.yaml",
+            "--scenarios",
+            "judgment_loops/rate_regime_adjustment/scenarios/rising_rates*.yaml",
+            "--out-dir",
+            str(out_dir),
+            "--escalations-dir",
+            str(tmp_path / "escalations"),
+        ]
+    )
+
+    assert exit_code == 0
+    files = sorted(out_dir.glob("*.yaml"))
+    assert len(files) == 2
+    for path in files:
+        record = yaml.safe_load(path.read_text())
+        assert record["authority"]["mandate_id"] == "endowment_v1"
+
+
+def test_run_batch_cli_no_matches(tmp_path: Path) -> None:
+    """Ensure the CLI fails cleanly when a glob matches nothing."""
+    exit_code = run_batch.main(
+        [
+            "--mandates",
+            str(tmp_path / "missing/*.yaml"),
+            "--scenarios",
+            "judgment_loops/rate_regime_adjustment/scenarios/*.yaml",
+            "--out-dir",
+            str(tmp_path / "records"),
+            "--escalations-dir",
+            str(tmp_path / "escalations"),
+        ]
+    )
+
+    assert exit_code == 1
+
+
+def test_run_batch_parallel_matches_serial(tmp_path: Path) -> None:
+    """Ensure the process pool produces the same outcomes as the serial path."""
+    kwargs = dict(
+        mandate_paths=[
+            Path("mandates/liability_driven/db_pension_v1/mandate.yaml"),
+            Path("mandates/perpetual_capital/endowment_v1/mandate.yaml"),
+        ],
+        scenario_paths=sorted(Path("judgment_loops/rate_regime_adjustment/scenarios").glob("*.yaml")),
+        thresholds_path=Path("judgment_loops/rate_regime_adjustment/thresholds.yaml"),
+    )
+
+    serial = run_batch.run_batch(
+        records_dir=tmp_path / "serial",
+        escalations_dir=tmp_path / "serial_escalations",
+        **kwargs,
+    )
+    parallel = run_batch.run_batch(
+        records_dir=tmp_path / "parallel",
+        escalations_dir=tmp_path / "parallel_escalations",
+        workers=2,
+        chunk_size=3,
+        **kwargs,
+    )
+
+    assert parallel.judgments == serial.judgments == 10
+    assert parallel.outcome_counts == serial.outcome_counts
+    assert parallel.escalations == serial.escalations
+    assert len(list((tmp_path / "parallel").glob("*.yaml"))) == 10
+
+
+def test_run_batch_cli_skips_invalid_mandates(tmp_path: Path, capsys) -> None:
+    """Ensure empty or invalid mandates are reported and skipped instead of aborting the batch."""
+    exit_code = run_batch.main(
+        [
+            "--mandates",
+            "mandates/**/mandate.yaml",
+            "--scenarios",
+            "judgment_loops/rate_regime_adjustment/scenarios/rising_rates.yaml",
+            "--out-dir",
+            str(tmp_path / "records"),
+            "--escalations-dir",
+            str(tmp_path / "escalations"),
+        ]
+    )
+
+    output = capsys.readouterr().out
+    assert exit_code == 0
+    assert "Skipping invalid mandate mandates/liability_driven/insurer_general_account_v1/mandate.yaml" in output
+    assert "(2 mandates × 1 scenarios)" in output
+    assert len(list((tmp_path / "records").glob("*.yaml"))) == 2
+
+
+def test_run_batch_cli_fails_when_no_mandate_is_valid(tmp_path: Path) -> None:
+    """Ensure the CLI exits 1 when every matched mandate is invalid."""
+    empty = tmp_path / "mandate.yaml"
+    empty.write_text("")
+    exit_code = run_batch.main(
+        [
+            "--mandates",
+            str(empty),
+            "--scenarios",
+            "judgment_loops/rate_regime_adjustment/scenarios/rising_rates.yaml",
+            "--out-dir",
+            str(tmp_path / "records"),
+            "--escalations-dir",
+            str(tmp_path / "escalations"),
+        ]
+    )
+
+    assert exit_code == 1
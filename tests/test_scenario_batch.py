@@ -0,0 +1,97 @@
+"""Tests for the columnar scenario batch and its row views."""
+
+import pickle
+import tracemalloc
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from buffet.mandates.loader import load_mandate
+from buffet.procedures.rate_regime_adjustment import RateRegimeAdjustmentProcedure, load_thresholds
+from buffet.sensing.batch import ScenarioBatch
+from buffet.sensing.scenario import load_scenario, parse_scenario
+
+SCENARIO_PATHS = sorted(Path("judgment_loops/rate_regime_adjustment/scenarios").glob("*.yaml"))
+
+
+def _scenarios() -> list:
+    scenarios = [load_scenario(path) for path in SCENARIO_PATHS]
+    return scenarios + [replace(scenarios[0], scenario_id="naïve_ünicode")]
+
+
+def test_rows_round_trip_and_index_like_a_sequence() -> None:
+    """Ensure rows materialize back to the original scenarios, optional None values included."""
+    scenarios = _scenarios()
+    batch = ScenarioBatch.from_scenarios(scenarios)
+
+    assert len(batch) == len(scenarios)
+    assert [row.to_scenario() for row in batch] == scenarios
+    assert batch[-1].scenario_id == "naïve_ünicode"
+    assert batch[0].portfolio.shortfall_probability == scenarios[0].portfolio.shortfall_probability
+    assert pickle.loads(pickle.dumps(batch))[2] == scenarios[2]
+    with pytest.raises(IndexError):
+        batch[len(scenarios)]
+
+
+def test_procedure_consumes_row_views() -> None:
+    """Ensure judging a row view yields the same record as judging the scenario."""
+    thresholds = load_thresholds(Path("judgment_loops/rate_regime_adjustment/thresholds.yaml"))
+    procedure = RateRegimeAdjustmentProcedure()
+    scenarios = _scenarios()
+    batch = ScenarioBatch.from_scenarios(scenarios)
+    volatile = ("record_id", "timestamp")
+
+    for mandate_path in ("liability_driven/db_pension_v1", "perpetual_capital/endowment_v1"):
+        mandate = load_mandate(Path(f"mandates/{mandate_path}/mandate.yaml"))
+        for scenario, row in zip(scenarios, batch):
+            expected = procedure.judge(mandate, scenario, thresholds, decision_latency_ms=0).to_dict()
+            actual = procedure.judge(mandate, row, thresholds, decision_latency_ms=0).to_dict()
+            for name in volatile:
+                expected.pop(name)
+                actual.pop(name)
+            assert actual == expected
+
+
+def test_batch_columns_share_memory() -> None:
+    """Ensure the vectorized engine can wrap batch columns without copying."""
+    np = pytest.importorskip("numpy")
+    from buffet.reasoning.vectorized import batch_columns, scenario_columns
+
+    scenarios = _scenarios()
+    batch = ScenarioBatch.from_scenarios(scenarios)
+    columns = batch_columns(batch)
+    reference = scenario_columns(scenarios)
+
+    np.testing.assert_array_equal(columns.funding_ratio, reference.funding_ratio)
+    np.testing.assert_array_equal(columns.liquidity_buffer_months, reference.liquidity_buffer_months)
+    np.testing.assert_array_equal(columns.rate_regime, reference.rate_regime)
+    assert np.shares_memory(columns.gross_exposure, np.frombuffer(batch.floats["gross_exposure"]))
+
+
+def test_batch_uses_several_fold_less_memory() -> None:
+    """Ensure a batch holds many scenarios in a fraction of the memory of scenario objects."""
+
+    def generate():
+        for index in range(5_000):
+            yield parse_scenario(
+                {
+                    "scenario_id": f"sweep_{index}",
+                    "environment": {"rate_regime": "rising_rates", "uncertainty": index / 5_000},
+                    "portfolio": {"gross_exposure": 1 + index / 5_000, "funding_ratio": 0.9},
+                }
+            )
+
+    tracemalloc.start()
+    try:
+        scenarios = list(generate())
+        objects_bytes = tracemalloc.get_traced_memory()[0]
+        del scenarios
+        baseline = tracemalloc.get_traced_memory()[0]
+        batch = ScenarioBatch.from_scenarios(generate())
+        batch_bytes = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+
+    assert len(batch) == 5_000
+    assert batch_bytes * 3 < objects_bytes
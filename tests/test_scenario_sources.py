@@ -0,0 +1,98 @@
+"""Tests for streaming scenario sources."""
+
+import json
+from dataclasses import asdict, fields
+from pathlib import Path
+
+import pytest
+
+from buffet.execution import run_batch
+from buffet.sensing.scenario import load_scenario
+from buffet.sensing.sources import iter_scenarios
+
+SCENARIO_PATHS = sorted(Path("judgment_loops/rate_regime_adjustment/scenarios").glob("*.yaml"))
+
+
+def _yaml_as_mapping(path: Path) -> dict:
+    scenario = load_scenario(path)
+    return {
+        "scenario_id": scenario.scenario_id,
+        "as_of": scenario.as_of,
+        "environment": asdict(scenario.environment),
+        "portfolio": asdict(scenario.portfolio),
+    }
+
+
+def test_ndjson_and_csv_match_yaml_scenarios(tmp_path: Path) -> None:
+    """Ensure NDJSON and CSV rows parse to the same scenarios as the YAML files."""
+    expected = [load_scenario(path) for path in SCENARIO_PATHS]
+    ndjson = tmp_path / "grid.ndjson"
+    ndjson.write_text("\n".join(json.dumps(_yaml_as_mapping(path)) for path in SCENARIO_PATHS) + "\n\n")
+    csv_path = tmp_path / "grid.csv"
+    header = ["scenario_id", "as_of", "environment.rate_regime", "inflation_regime", "uncertainty"]
+    header += ["gross_exposure", "liquidity_buffer_months", "funding_ratio", "drawdown"]
+    header += ["shortfall_probability", "illiquid_allocation"]
+    lines = [",".join(header)]
+    for scenario in expected:
+        values = [scenario.scenario_id, scenario.as_of, *asdict(scenario.environment).values()]
+        values += list(asdict(scenario.portfolio).values())
+        lines.append(",".join("" if value is None else str(value) for value in values))
+    csv_path.write_text("\n".join(lines) + "\n")
+
+    assert list(iter_scenarios(ndjson)) == expected
+    assert list(iter_scenarios(csv_path)) == expected
+
+
+def test_rows_fall_back_to_scenario_defaults(tmp_path: Path) -> None:
+    """Ensure missing fields use the same defaults as an empty YAML file."""
+    csv_path = tmp_path / "sparse.csv"
+    csv_path.write_text("gross_exposure,funding_ratio\n1.3,\n")
+
+    (scenario,) = iter_scenarios(csv_path)
+    defaults = load_scenario(tmp_path / "missing.yaml")
+
+    assert scenario.scenario_id == "sparse_1"
+    assert scenario.portfolio.gross_exposure == 1.3
+    assert scenario.portfolio.funding_ratio is None
+    assert scenario.environment == defaults.environment
+
+
+def test_npz_rows_and_columns_round_trip(tmp_path: Path) -> None:
+    """Ensure .npz files stream rows and chunked columns identical to the source scenarios."""
+    np = pytest.importorskip("numpy")
+    from buffet.reasoning.vectorized import scenario_columns
+    from buffet.sensing.sources import iter_npz_columns, save_scenarios_npz
+
+    expected = [load_scenario(path) for path in SCENARIO_PATHS] * 3
+    path = tmp_path / "grid.npz"
+    assert save_scenarios_npz(path, expected) == len(expected)
+
+    assert list(iter_scenarios(path)) == expected
+    chunks = list(iter_npz_columns(path, chunk_size=4))
+    assert [len(chunk.gross_exposure) for chunk in chunks] == [4, 4, 4, 3]
+    reference = scenario_columns(expected[:4])
+    for field in fields(reference):
+        np.testing.assert_array_equal(getattr(chunks[0], field.name), getattr(reference, field.name))
+
+
+def test_run_batch_reads_scenario_files(tmp_path: Path) -> None:
+    """Ensure the batch CLI judges every row of a multi-scenario file."""
+    ndjson = tmp_path / "grid.ndjson"
+    ndjson.write_text("\n".join(json.dumps(_yaml_as_mapping(path)) for path in SCENARIO_PATHS))
+    out_dir = tmp_path / "records"
+
+    exit_code = run_batch.main(
+        [
+            "--mandates",
+            "mandates/*/endowment_v1/mandate.yaml",
+            "--scenarios",
+            str(ndjson),
+            "--out-dir",
+            str(out_dir),
+            "--escalations-dir",
+            str(tmp_path / "escalations"),
+        ]
+    )
+
+    assert exit_code == 0
+    assert len(list(out_dir.glob("*.yaml"))) == len(SCENARIO_PATHS)
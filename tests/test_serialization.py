@@ -0,0 +1,58 @@
+"""Tests for pluggable judgment record serializers."""
+
+from pathlib import Path
+
+import pytest
+import yaml
+
+from buffet.contracts.serialization import RECORD_FORMATS, get_serializer, serializer_for_path
+from buffet.execution.memory import open_record_store
+from buffet.execution.record_index import RecordIndex, rebuild_index
+from buffet.mandates.loader import load_mandate
+from buffet.procedures.rate_regime_adjustment import RateRegimeAdjustmentProcedure, load_thresholds
+from buffet.sensing.scenario import load_scenario
+
+
+def _record():
+    mandate = load_mandate(Path("mandates/liability_driven/db_pension_v1/mandate.yaml"))
+    scenario = load_scenario(Path("judgment_loops/rate_regime_adjustment/scenarios/escalation_case.yaml"))
+    thresholds = load_thresholds(Path("judgment_loops/rate_regime_adjustment/thresholds.yaml"))
+    return RateRegimeAdjustmentProcedure().judge(mandate, scenario, thresholds, decision_latency_ms=5)
+
+
+@pytest.mark.parametrize("name", RECORD_FORMATS)
+def test_formats_round_trip_through_validation(name: str) -> None:
+    """Ensure every format decodes back to an equal, validated record."""
+    if name == "msgpack":
+        pytest.importorskip("msgpack")
+    serializer = get_serializer(name)
+    record = _record()
+
+    assert serializer.loads(serializer.dumps(record)) == record
+
+
+def test_yaml_format_matches_existing_layout() -> None:
+    """Ensure the libyaml fast path emits the same bytes as the original writer."""
+    record = _record()
+
+    assert get_serializer("yaml").dumps(record) == yaml.safe_dump(record.to_dict(), sort_keys=True).encode("utf-8")
+
+
+def test_loads_rejects_invalid_records() -> None:
+    """Ensure decoding enforces the Judgment Record contract."""
+    with pytest.raises(ValueError):
+        get_serializer("json").loads(b'{"record_id": "x"}')
+    with pytest.raises(ValueError):
+        get_serializer("xml")
+
+
+def test_json_store_is_indexable(tmp_path: Path) -> None:
+    """Ensure a JSON record directory is written by suffix and readable by the index."""
+    with open_record_store("json", tmp_path / "records") as store:
+        location = Path(store.append(_record()))
+
+    assert location.suffix == ".json"
+    assert serializer_for_path(location).name == "json"
+    with RecordIndex(tmp_path / "index.sqlite") as index:
+        assert rebuild_index(index, records_dir=tmp_path / "records") == 1
+        assert index.query(outcome_type="escalate")[0].location == str(location)
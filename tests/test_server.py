@@ -0,0 +1,209 @@
+"""Tests for the long-running judgment service."""
+
+import http.client
+import json
+import os
+import signal
+import socket
+import sqlite3
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+from buffet.execution.memory import open_record_store
+from buffet.execution.record_index import RecordIndex
+from buffet.execution.record_log import iter_log_records
+from buffet.execution.server import JudgmentHTTPServer, JudgmentUnixServer, build_service
+
+MANDATE = Path("mandates/liability_driven/db_pension_v1/mandate.yaml")
+THRESHOLDS = Path("judgment_loops/rate_regime_adjustment/thresholds.yaml")
+SCENARIO = {
+    "scenario_id": "inline_rising",
+    "environment": {"rate_regime": "rising_rates", "inflation_regime": "elevated", "uncertainty": 0.3},
+    "portfolio": {"gross_exposure": 1.1, "liquidity_buffer_months": 18, "funding_ratio": 0.9},
+}
+
+
+def _service(tmp_path: Path):
+    store = open_record_store("segments", tmp_path / "log")
+    return build_service([MANDATE], THRESHOLDS, store, tmp_path / "escalations")
+
+
+class _FailingStore:
+    """Store that fails on its second append."""
+
+    def __init__(self, store) -> None:
+        self.store = store
+        self.appended = 0
+
+    def append(self, record) -> str:
+        if self.appended == 1:
+            raise OSError("disk full")
+        self.appended += 1
+        return self.store.append(record)
+
+    def close(self) -> None:
+        self.store.close()
+
+
+def _serve(server) -> None:
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+
+def test_http_judge_streams_and_persists_batch(tmp_path: Path) -> None:
+    """Ensure a batch request streams one NDJSON record per scenario and persists them."""
+    service = _service(tmp_path)
+    server = JudgmentHTTPServer(("127.0.0.1", 0), service)
+    _serve(server)
+    try:
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+        body = {"mandate_id": "db_pension_v1", "scenarios": [SCENARIO, dict(SCENARIO, scenario_id="second")]}
+        connection.request("POST", "/judge", json.dumps(body))
+        response = connection.getresponse()
+        lines = response.read().decode("utf-8").splitlines()
+        connection.request("GET", "/health")
+        health = json.loads(connection.getresponse().read())
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+    assert response.status == 200
+    records = [json.loads(line) for line in lines]
+    descriptions = [record["invocation"]["trigger_description"] for record in records]
+    assert descriptions == ["Scenario inline_rising", "Scenario second"]
+    assert [data["record_id"] for data in iter_log_records(tmp_path / "log")] == [r["record_id"] for r in records]
+    assert health == {"status": "ok", "mandates": ["db_pension_v1"]}
+
+
+def test_http_judge_rejects_unknown_mandate(tmp_path: Path) -> None:
+    """Ensure invalid requests get a 400 and nothing is written."""
+    service = _service(tmp_path)
+    server = JudgmentHTTPServer(("127.0.0.1", 0), service)
+    _serve(server)
+    try:
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+        connection.request("POST", "/judge", json.dumps({"mandate_id": "missing", "scenario": SCENARIO}))
+        response = connection.getresponse()
+        error = json.loads(response.read())
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+    assert response.status == 400
+    assert "missing" in error["error"]
+    assert list(iter_log_records(tmp_path / "log")) == []
+
+
+def test_unix_socket_serves_same_protocol(tmp_path: Path) -> None:
+    """Ensure the Unix-socket server answers judge requests."""
+    service = _service(tmp_path)
+    socket_path = tmp_path / "buffet.sock"
+    server = JudgmentUnixServer(socket_path, service)
+    _serve(server)
+    body = json.dumps({"mandate_id": "db_pension_v1", "scenario": SCENARIO}).encode("utf-8")
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(socket_path))
+            client.sendall(b"POST /judge HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+            reply = b""
+            while not reply.endswith(b"0\r\n\r\n"):
+                reply += client.recv(65536)
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+    assert reply.startswith(b"HTTP/1.1 200")
+    assert b'"outcome"' in reply
+    assert not socket_path.exists()
+
+
+def test_failure_mid_stream_ends_with_error_line(tmp_path: Path) -> None:
+    """Ensure a failure after streaming starts ends the response with an error line and a terminating chunk."""
+    store = _FailingStore(open_record_store("segments", tmp_path / "log"))
+    service = build_service([MANDATE], THRESHOLDS, store, tmp_path / "escalations")
+    server = JudgmentHTTPServer(("127.0.0.1", 0), service)
+    _serve(server)
+    try:
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+        body = {"mandate_id": "db_pension_v1", "scenarios": [SCENARIO, dict(SCENARIO, scenario_id="second")]}
+        connection.request("POST", "/judge", json.dumps(body))
+        response = connection.getresponse()
+        lines = [json.loads(line) for line in response.read().decode("utf-8").splitlines()]
+        connection.request("GET", "/health")
+        health = connection.getresponse()
+        health.read()
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+    assert response.status == 200
+    assert lines[0]["invocation"]["trigger_description"] == "Scenario inline_rising"
+    assert lines[1] == {"error": "disk full"}
+    assert health.status == 200
+
+
+def test_http_judge_updates_index_from_handler_threads(tmp_path: Path) -> None:
+    """Ensure judge requests on separate connections index and commit their records."""
+    index_path = tmp_path / "index.sqlite"
+    store = open_record_store("segments", tmp_path / "log")
+    index = RecordIndex(index_path, check_same_thread=False)
+    service = build_service([MANDATE], THRESHOLDS, store, tmp_path / "escalations", index=index)
+    server = JudgmentHTTPServer(("127.0.0.1", 0), service)
+    _serve(server)
+    streamed = []
+    try:
+        for body in (
+            {"mandate_id": "db_pension_v1", "scenarios": [SCENARIO, dict(SCENARIO, scenario_id="second")]},
+            {"mandate_id": "db_pension_v1", "scenario": SCENARIO},
+        ):
+            connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+            connection.request("POST", "/judge", json.dumps(body))
+            response = connection.getresponse()
+            assert response.status == 200
+            streamed.extend(json.loads(line)["record_id"] for line in response.read().decode("utf-8").splitlines())
+            connection.close()
+        with sqlite3.connect(str(index_path)) as reader:
+            committed = {row[0] for row in reader.execute("SELECT record_id FROM records")}
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+    assert len(streamed) == 3
+    assert committed == set(streamed)
+
+
+def test_cli_skips_invalid_mandates(tmp_path: Path) -> None:
+    """Ensure the daemon starts from a glob that also matches empty mandate files, reporting them."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, ["src", os.environ.get("PYTHONPATH")])))
+    command = [
+        sys.executable,
+        "-m",
+        "buffet.execution.server",
+        "--mandates",
+        "mandates/**/mandate.yaml",
+        "--port",
+        "0",
+        "--out-dir",
+        str(tmp_path / "log"),
+        "--escalations-dir",
+        str(tmp_path / "escalations"),
+    ]
+    with subprocess.Popen(command, stdout=subprocess.PIPE, text=True, env=env) as process:
+        try:
+            lines = []
+            for line in process.stdout:
+                lines.append(line)
+                if line.startswith("Serving"):
+                    break
+        finally:
+            process.send_signal(signal.SIGTERM)
+            process.wait(timeout=10)
+
+    assert lines[-1].startswith("Serving 2 mandates")
+    assert sum(line.startswith("Skipping invalid mandate") for line in lines) == 3
@@ -0,0 +1,82 @@
+"""Tests for opt-in stage timings and latency histograms."""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from buffet.execution.loop_runner import judge_with_latency, run_judgment_loop
+from buffet.mandates.loader import load_mandate
+from buffet.procedures.rate_regime_adjustment import RateRegimeAdjustmentProcedure, load_thresholds
+from buffet.sensing.scenario import load_scenario
+from buffet.utils.timing import LatencyHistogram, default_histograms, enable_timings, stage
+
+MANDATE = Path("mandates/liability_driven/db_pension_v1/mandate.yaml")
+SCENARIO_DIR = Path("judgment_loops/rate_regime_adjustment/scenarios")
+THRESHOLDS = Path("judgment_loops/rate_regime_adjustment/thresholds.yaml")
+
+
+@pytest.fixture
+def timings():
+    default_histograms().clear()
+    enable_timings()
+    try:
+        yield default_histograms()
+    finally:
+        enable_timings(False)
+        default_histograms().clear()
+
+
+def test_histogram_percentiles_stay_within_bucket_precision() -> None:
+    """Ensure percentiles match exact order statistics within the bucket resolution."""
+    rng = random.Random(7)
+    values = [int(rng.lognormvariate(11, 2)) for _ in range(20_000)]
+    left, right = LatencyHistogram(), LatencyHistogram()
+    for index, value in enumerate(values):
+        (left if index % 2 else right).record(value)
+    left.merge(right)
+    ordered = sorted(values)
+
+    assert left.count == len(values)
+    assert left.max_ns == ordered[-1] and left.min_ns == ordered[0]
+    for percent in (50, 90, 99, 99.9):
+        exact = ordered[int(-(-len(values) * percent // 100)) - 1]
+        assert exact <= left.percentile(percent) <= exact * 1.016 + 1
+    assert len(left.counts) < 2_000
+
+
+def test_disabled_timings_leave_records_unchanged() -> None:
+    """Ensure records carry no timings block and spans are shared no-ops by default."""
+    procedure = RateRegimeAdjustmentProcedure()
+    record = judge_with_latency(
+        procedure, load_mandate(MANDATE), load_scenario(SCENARIO_DIR / "rising_rates.yaml"), load_thresholds(THRESHOLDS)
+    )
+
+    assert "timings_ns" not in record.behavior
+    assert stage("judge") is stage("write")
+
+
+def test_enabled_timings_cover_every_stage(tmp_path: Path, timings) -> None:
+    """Ensure records carry pre-write stage spans and histograms cover every stage."""
+    record, _ = run_judgment_loop(
+        mandate_path=MANDATE,
+        scenario_path=SCENARIO_DIR / "escalation_case.yaml",
+        thresholds_path=THRESHOLDS,
+        records_dir=tmp_path / "records",
+        escalations_dir=tmp_path / "escalations",
+    )
+
+    recorded = record.behavior["timings_ns"]
+    assert set(recorded) == {
+        "load_mandate",
+        "load_scenario",
+        "evaluate_alignment",
+        "compute_confidence",
+        "outcome_rationale",
+        "judge",
+    }
+    assert all(isinstance(value, int) and value > 0 for value in recorded.values())
+    assert recorded["judge"] >= recorded["evaluate_alignment"] + recorded["outcome_rationale"]
+    summary = timings.summary()
+    assert {"serialization", "write", "escalation_routing"} <= set(summary)
+    assert summary["judge"]["count"] == 1
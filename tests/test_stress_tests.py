@@ -0,0 +1,131 @@
+"""Tests for stress grid specs, runs and breakpoint bisection."""
+
+from itertools import product
+from pathlib import Path
+
+import pytest
+import yaml
+
+from buffet.mandates.loader import load_mandate
+from buffet.procedures.rate_regime_adjustment import RateRegimeAdjustmentProcedure
+from buffet.simulation import stress_tests
+from buffet.simulation.stress_tests import load_stress_spec, parse_stress_spec, run_stress_test
+
+SPEC_PATH = Path("judgment_loops/rate_regime_adjustment/stress/rate_shock_grid.yaml")
+MANDATE_PATHS = [
+    Path("mandates/liability_driven/db_pension_v1/mandate.yaml"),
+    Path("mandates/perpetual_capital/endowment_v1/mandate.yaml"),
+]
+
+
+def test_grid_points_decode_lazily_in_product_order() -> None:
+    """Ensure flat indices decode to the same points as the Cartesian product."""
+    spec = load_stress_spec(SPEC_PATH)
+    expected = list(product(*(axis.shocks for axis in spec.axes)))
+
+    assert spec.grid_size == len(expected)
+    for index in (0, 1, 7, len(expected) // 2, len(expected) - 1):
+        point = spec.point(index)
+        assert tuple(point[position] for position in range(len(spec.axes))) == expected[index]
+    shocked = spec.scenario(spec.point(len(expected) - 1))
+    assert shocked.portfolio.liquidity_buffer_months == spec.base.portfolio.liquidity_buffer_months + 4
+    assert shocked.portfolio.funding_ratio == pytest.approx(spec.base.portfolio.funding_ratio * 1.3)
+
+
+def test_bisection_brackets_every_flip_found_by_brute_force() -> None:
+    """Ensure bisected breakpoints bracket each outcome change seen on a fine grid."""
+    spec = parse_stress_spec(
+        {
+            "stress_test_id": "funding_line",
+            "base": {"portfolio": {"funding_ratio": 1.0}, "environment": {"uncertainty": 0.2}},
+            "tolerance": 1e-4,
+            "shocks": {"funding_ratio": {"bumps": {"start": -0.5, "stop": 0.5, "steps": 3}}},
+        }
+    )
+    procedure = RateRegimeAdjustmentProcedure()
+    found = 0
+    for path in MANDATE_PATHS:
+        mandate = load_mandate(path)
+        (surface,) = run_stress_test(spec, [mandate]).surfaces
+        fine = [round(-0.5 + step / 1000, 6) for step in range(1001)]
+        outcomes = [procedure.evaluate(mandate, spec.scenario({0: bump}))[2] for bump in fine]
+        flips = [(fine[i], fine[i + 1]) for i in range(1000) if outcomes[i] != outcomes[i + 1]]
+
+        assert len(surface.breakpoints) == len(flips)
+        for breakpoint, (low, high) in zip(surface.breakpoints, flips):
+            assert breakpoint.upper - breakpoint.lower <= 1e-4
+            assert low - 1e-4 <= breakpoint.lower and breakpoint.upper <= high + 1e-4
+        found += len(flips)
+    assert found
+
+
+def test_scaled_integer_axis_bisects_in_field_units() -> None:
+    """Ensure a scaled whole-number field reports the same adjacent-month bracket as explicit values."""
+    base = {"portfolio": {"liquidity_buffer_months": 12}, "environment": {"uncertainty": 0.2}}
+    mandate = load_mandate(MANDATE_PATHS[0])
+    brackets = []
+    for shock in ({"scale": [0.5, 2.0]}, {"values": [6, 24]}):
+        spec = parse_stress_spec({"base": base, "shocks": {"liquidity_buffer_months": shock}})
+        (surface,) = run_stress_test(spec, [mandate]).surfaces
+        brackets.append([breakpoint.to_dict()["between"] for breakpoint in surface.breakpoints])
+
+    assert brackets[0] == brackets[1] == [[17, 18]]
+
+
+def test_parallel_run_matches_in_process_run() -> None:
+    """Ensure worker processes produce the same surfaces as an in-process run."""
+    spec = load_stress_spec(SPEC_PATH)
+    mandates = [load_mandate(path) for path in MANDATE_PATHS]
+
+    serial = run_stress_test(spec, mandates, chunk_size=512).to_dict()
+    parallel = run_stress_test(spec, mandates, workers=2, chunk_size=512).to_dict()
+
+    for report in (serial, parallel):
+        report.pop("elapsed_seconds")
+    assert parallel == serial
+    assert sum(serial["surfaces"][0]["outcome_counts"].values()) == spec.grid_size
+
+
+@pytest.mark.parametrize(
+    ("shocks", "message"),
+    [
+        ({}, "at least one shock axis"),
+        ({"leverage": {"values": [1]}}, "Unknown shock field"),
+        ({"rate_regime": {"bumps": [1]}}, "categorical"),
+        ({"funding_ratio": {"bumps": [0.1]}}, "base scenario has no funding_ratio"),
+        ({"uncertainty": {"bumps": [0.1], "scale": [2]}}, "exactly one of"),
+    ],
+)
+def test_invalid_specs_are_rejected(shocks: dict, message: str) -> None:
+    """Ensure malformed shock definitions raise a clear error."""
+    with pytest.raises(ValueError, match=message):
+        parse_stress_spec({"shocks": shocks})
+
+
+def test_cli_writes_report(tmp_path: Path) -> None:
+    """Ensure the CLI writes one report with a surface per valid mandate, skipping invalid ones."""
+    spec_path = tmp_path / "exposure.yaml"
+    spec_path.write_text(
+        "stress_test_id: exposure_sweep\n"
+        f"base_scenario: {Path.cwd() / 'judgment_loops/rate_regime_adjustment/scenarios/rising_rates_2022.yaml'}\n"
+        "shocks:\n"
+        "  gross_exposure: {bumps: {start: -0.5, stop: 1.0, steps: 4}}\n"
+        "  funding_ratio: {scale: [0.8, 1.0, 1.2]}\n"
+    )
+    exit_code = stress_tests.main(
+        [
+            "--spec",
+            str(spec_path),
+            "--mandates",
+            "mandates/*/*/mandate.yaml",
+            "--out-dir",
+            str(tmp_path),
+            "--breakpoints-only",
+        ]
+    )
+
+    assert exit_code == 0
+    report = yaml.safe_load((tmp_path / "exposure_sweep.yaml").read_text())
+    assert [surface["mandate_id"] for surface in report["surfaces"]] == ["db_pension_v1", "endowment_v1"]
+    assert all(sum(surface["outcome_counts"].values()) == 0 for surface in report["surfaces"])
+    assert report["surfaces"][0]["breakpoints"]
@@ -0,0 +1,86 @@
+"""Tests that the columnar sweep engine matches the scalar reasoning path."""
+
+from itertools import product
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from buffet.mandates.loader import load_mandate
+from buffet.procedures.rate_regime_adjustment import RateRegimeAdjustmentProcedure
+from buffet.reasoning.align import evaluate_alignment
+from buffet.reasoning.confidence import compute_confidence
+from buffet.reasoning.vectorized import OUTCOME_LABELS, TREND_LABELS, evaluate_columns, evaluate_sweep, scenario_columns
+from buffet.sensing.scenario import EnvironmentState, PortfolioState, ScenarioInput
+
+
+def _grid() -> list:
+    scenarios = []
+    for index, (gross, buffer_months, funding, drawdown, uncertainty, regime) in enumerate(
+        product(
+            [0.9, 1.2, 1.2000001, 1.4, 1.5],
+            [6, 12, 18, 24],
+            [None, 0.8, 0.85, 0.95],
+            [None, 0.1, 0.25],
+            [-0.1, 0.0, 0.2, 0.25, 0.3, 0.6, 0.7, 1.2],
+            ["stable", "rising_rates"],
+        )
+    ):
+        scenarios.append(
+            ScenarioInput(
+                scenario_id=f"grid_{index}",
+                as_of="2022-01-01T00:00:00Z",
+                environment=EnvironmentState(
+                    rate_regime=regime, inflation_regime="elevated", uncertainty=uncertainty
+                ),
+                portfolio=PortfolioState(
+                    gross_exposure=gross,
+                    liquidity_buffer_months=buffer_months,
+                    funding_ratio=funding,
+                    drawdown=drawdown,
+                ),
+            )
+        )
+    return scenarios
+
+
+@pytest.mark.parametrize(
+    "mandate_path",
+    [
+        "mandates/liability_driven/db_pension_v1/mandate.yaml",
+        "mandates/perpetual_capital/endowment_v1/mandate.yaml",
+    ],
+)
+def test_sweep_matches_scalar_path(mandate_path: str) -> None:
+    """Ensure flags, levels, trends and outcomes are identical to the scalar functions."""
+    mandate = load_mandate(Path(mandate_path))
+    procedure = RateRegimeAdjustmentProcedure()
+    scenarios = _grid()
+    result = evaluate_columns(mandate, scenario_columns(scenarios))
+
+    for index, scenario in enumerate(scenarios):
+        alignment = evaluate_alignment(mandate, scenario)
+        confidence = compute_confidence(scenario)
+        outcome = procedure._determine_outcome(mandate, alignment, confidence)
+
+        assert bool(result.alignment.hard_constraints_breached[index]) == alignment.hard_constraints_breached
+        assert bool(result.alignment.violations["liquidity_buffer_months"][index]) == (
+            "liquidity_buffer_months" in alignment.constraints_at_risk
+        )
+        assert float(result.confidence.level[index]) == confidence.level
+        assert TREND_LABELS[result.confidence.trend_code[index]] == confidence.trend
+        assert OUTCOME_LABELS[result.outcome_code[index]] == outcome
+
+
+def test_sweep_broadcasts_grid_axes() -> None:
+    """Ensure independent sweep axes broadcast into a full outcome surface."""
+    mandate = load_mandate(Path("mandates/liability_driven/db_pension_v1/mandate.yaml"))
+    gross = np.linspace(0.8, 1.6, 50)[:, None]
+    uncertainty = np.linspace(0.0, 1.0, 40)[None, :]
+
+    result = evaluate_sweep(mandate, gross, 24, 0.9, uncertainty, "rising_rates")
+
+    assert result.outcome_code.shape == (50, 40)
+    assert set(result.outcomes().ravel()) <= set(OUTCOME_LABELS)
+    assert result.outcomes()[-1, 0] == "escalate"
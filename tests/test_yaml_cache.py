@@ -0,0 +1,42 @@
+"""Tests for the content-addressed YAML parse cache."""
+
+import os
+from pathlib import Path
+
+from buffet.utils.yaml_cache import YamlCache
+
+
+def test_cache_hits_until_content_changes(tmp_path: Path) -> None:
+    """Ensure unchanged files are served from memory and edits are re-parsed."""
+    path = tmp_path / "scenario.yaml"
+    path.write_text("portfolio:\n  gross_exposure: 1.1\n")
+    cache = YamlCache()
+
+    first = cache.load(path)
+    second = cache.load(path)
+    assert first == {"portfolio": {"gross_exposure": 1.1}}
+    assert second is first
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.load(path) is first
+    assert cache.stats.hits == 2
+
+    path.write_text("portfolio:\n  gross_exposure: 1.3\n")
+    assert cache.load(path) == {"portfolio": {"gross_exposure": 1.3}}
+    assert cache.stats.misses == 2
+
+
+def test_disk_tier_is_shared_across_instances(tmp_path: Path) -> None:
+    """Ensure a fresh cache reuses payloads pickled by an earlier one."""
+    path = tmp_path / "thresholds.yaml"
+    path.write_text("persistence:\n  minimum_confirmations: 3\n")
+    disk_dir = tmp_path / "cache"
+
+    YamlCache(disk_dir=disk_dir).load(path)
+    assert len(list(disk_dir.glob("*.pickle"))) == 1
+
+    warm = YamlCache(disk_dir=disk_dir)
+    assert warm.load(path) == {"persistence": {"minimum_confirmations": 3}}
+    assert (warm.stats.disk_hits, warm.stats.misses) == (1, 0)